@@ -0,0 +1,94 @@
+"""
+Compare running programs one after the other with QuantumComputer.run and concurrently with
+QuantumComputer.run_async, against a local stub QVM server which answers after a fixed latency.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import asyncio
+from http.server import BaseHTTPRequestHandler, HTTPServer
+import json
+from socketserver import ThreadingMixIn
+import threading
+import time
+
+import networkx as nx
+
+from pyquil import Program
+from pyquil.api import AsyncForestConnection, ForestConnection, QVM, QuantumComputer
+from pyquil.api._qac import AbstractCompiler
+from pyquil.device import NxDevice
+from pyquil.gates import CNOT, H, MEASURE
+
+
+class StubQVMHandler(BaseHTTPRequestHandler):
+    """
+    Answers QVM ``multishot`` requests with all-zero bitstrings after ``server.latency`` seconds.
+    """
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(self.server.latency)
+        body = {name: [[0] * len(addresses) for _ in range(payload['trials'])]
+                for name, addresses in payload['addresses'].items()}
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubQVMServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class DummyCompiler(AbstractCompiler):
+    def quil_to_native_quil(self, program):
+        return program
+
+    def native_quil_to_executable(self, nq_program):
+        return nq_program
+
+
+def _quantum_computer(connection):
+    return QuantumComputer(name='stub', qam=QVM(connection=connection),
+                           device=NxDevice(nx.complete_graph(2)), compiler=DummyCompiler())
+
+
+def main(n_requests, latency):
+    server = StubQVMServer(('127.0.0.1', 0), StubQVMHandler)
+    server.latency = latency
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    endpoint = 'http://127.0.0.1:{}'.format(server.server_address[1])
+    program = Program(H(0), CNOT(0, 1), MEASURE(0, 0), MEASURE(1, 1)).wrap_in_numshots_loop(5)
+
+    qc = _quantum_computer(ForestConnection(endpoint))
+    start = time.perf_counter()
+    for _ in range(n_requests):
+        qc.run(program)
+    sync_time = time.perf_counter() - start
+
+    connection = AsyncForestConnection(sync_endpoint=endpoint)
+    qc = _quantum_computer(connection)
+    start = time.perf_counter()
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(asyncio.gather(*[qc.run_async(program) for _ in range(n_requests)]))
+    async_time = time.perf_counter() - start
+    connection.close()
+    server.shutdown()
+
+    print("{} requests with a server latency of {} s".format(n_requests, latency))
+    print("{:>16} {:>10.3f}".format("run (s)", sync_time))
+    print("{:>16} {:>10.3f}".format("run_async (s)", async_time))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--requests', '-n', default=50, type=int, help="Number of requests.")
+    parser.add_argument('--latency', '-l', default=0.05, type=float,
+                        help="Time the stub server takes to answer a request, in seconds.")
+    args = parser.parse_args()
+    main(args.requests, args.latency)
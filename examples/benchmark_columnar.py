@@ -0,0 +1,58 @@
+"""
+Compare building and transforming a large random circuit as a Program and as a ColumnarProgram.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import time
+
+import numpy as np
+
+from pyquil.columnar import ColumnarProgram
+from pyquil.quil import Program
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def random_circuit(n_gates, n_qubits, seed=1234):
+    """
+    A random circuit of RZ, RX(+-pi/2) and CZ gates, built directly as arrays.
+    """
+    rs = np.random.RandomState(seed)
+    codes = rs.randint(3, size=n_gates)
+    params = np.where(codes == 0, rs.uniform(-np.pi, np.pi, size=n_gates),
+                      np.where(codes == 1, rs.choice([-np.pi / 2, np.pi / 2], size=n_gates),
+                               np.nan))
+    first = rs.randint(n_qubits, size=n_gates)
+    second = np.where(codes == 2, (first + 1) % n_qubits, -1)
+    return ColumnarProgram(["RZ", "RX", "CZ"], codes, params[:, np.newaxis],
+                           np.stack([first, second], axis=1))
+
+
+def main(n_gates, n_qubits):
+    columnar, t_build = _timed(random_circuit, n_gates, n_qubits)
+    program, t_convert = _timed(columnar.to_program)
+    print("Random circuit of {} gates on {} qubits".format(n_gates, n_qubits))
+    print("{:>16} {:>12} {:>12}".format("", "Program (s)", "columnar (s)"))
+    print("{:>16} {:>12.3f} {:>12.3f}".format("build", t_convert, t_build))
+    for name, prog_fn, col_fn in [
+        ("get_qubits", program.get_qubits, columnar.get_qubits),
+        ("dagger", program.dagger, columnar.dagger),
+        ("out", program.out, columnar.out),
+    ]:
+        _, t_prog = _timed(prog_fn)
+        _, t_col = _timed(col_fn)
+        print("{:>16} {:>12.3f} {:>12.3f}".format(name, t_prog, t_col))
+    _, t_from = _timed(ColumnarProgram.from_program, program)
+    print("{:>16} {:>12.3f}".format("from_program", t_from))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--gates', '-n', default=1000000, type=int, help="Number of gates.")
+    parser.add_argument('--qubits', '-q', default=20, type=int, help="Number of qubits.")
+    args = parser.parse_args()
+    main(args.gates, args.qubits)
@@ -0,0 +1,86 @@
+"""
+Time noisy runs with the in-process density matrix simulator. With all measurements at the end,
+PyQVM simulates the noisy program once and samples every shot from the exact outcome
+distribution. This is compared with simulating every shot separately (extrapolated from a few
+shots) and, if a QVM server is running, with the QVM.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import time
+
+import networkx as nx
+import numpy as np
+from requests import RequestException
+
+from pyquil import Program
+from pyquil.api import ForestConnection, PyQVM, QVM, WavefunctionSimulator
+from pyquil.device import NxDevice, gates_in_isa
+from pyquil.gates import CZ, H, MEASURE, RESET, RX
+from pyquil.noise import decoherence_noise_with_asymmetric_ro
+
+
+def _best_of(repeats, fn, *args):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def noisy_program(n_qubits, depth, trials):
+    """
+    Layers of RX(pi/2) and CZ gates on a line of qubits, followed by measuring all qubits.
+    """
+    program = Program()
+    for _ in range(depth):
+        program += [RX(np.pi / 2, q) for q in range(n_qubits)]
+        program += [CZ(q, q + 1) for q in range(n_qubits - 1)]
+    ro = program.declare('ro', 'BIT', n_qubits)
+    program += [MEASURE(q, ro[q]) for q in range(n_qubits)]
+    return program.wrap_in_numshots_loop(trials)
+
+
+def run(qam, program):
+    return qam.load(program).run().wait().read_from_memory_region(region_name='ro')
+
+
+def main(qubits, depth, trials, per_shot_trials, repeats):
+    connection = ForestConnection()
+    try:
+        WavefunctionSimulator(connection).wavefunction(Program(H(0)))
+        have_qvm = True
+    except (RequestException, OSError):
+        print("No QVM server found, skipping the QVM")
+        have_qvm = False
+
+    print("Noisy circuits of depth {}, {} shots, best of {}".format(depth, trials, repeats))
+    print("{:>7} {:>14} {:>14} {:>14}".format("qubits", "one pass (s)", "per shot (s)", "qvm (s)"))
+    for n in qubits:
+        device = NxDevice(nx.path_graph(n))
+        noise_model = decoherence_noise_with_asymmetric_ro(gates_in_isa(device.get_isa()))
+        qam = PyQVM(noise_model=noise_model)
+
+        one_pass = _best_of(repeats, run, qam, noisy_program(n, depth, trials))
+        # A RESET after the measurements forces PyQVM to simulate every shot
+        per_shot_program = noisy_program(n, depth, per_shot_trials) + RESET()
+        per_shot = _best_of(repeats, run, qam, per_shot_program) * trials / per_shot_trials
+        if have_qvm:
+            qvm = _best_of(repeats, run, QVM(connection, noise_model=noise_model),
+                           noisy_program(n, depth, trials))
+        else:
+            qvm = float('nan')
+        print("{:>7} {:>14.4f} {:>14.1f} {:>14.4f}".format(n, one_pass, per_shot, qvm))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--qubits', '-n', default=[2, 4, 6, 8], type=int, nargs='+',
+                        help="Circuit widths to benchmark.")
+    parser.add_argument('--depth', '-d', default=5, type=int, help="Number of layers.")
+    parser.add_argument('--trials', '-t', default=100000, type=int, help="Number of shots.")
+    parser.add_argument('--per-shot-trials', default=20, type=int,
+                        help="Number of shots to time when simulating shots separately.")
+    parser.add_argument('--repeats', '-r', default=3, type=int, help="Number of repetitions.")
+    args = parser.parse_args()
+    main(args.qubits, args.depth, args.trials, args.per_shot_trials, args.repeats)
@@ -0,0 +1,46 @@
+"""
+Measure the memory used by a large Program, in bytes per instruction.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import gc
+import tracemalloc
+
+from pyquil.gates import RX, RZ, CZ, MEASURE
+from pyquil.quil import Program
+
+
+def _instruction(i, n_qubits):
+    q = i % n_qubits
+    kind = i % 4
+    if kind == 0:
+        return RX(0.5, q)
+    elif kind == 1:
+        return RZ(-0.25, q)
+    elif kind == 2:
+        return CZ(q, (q + 1) % n_qubits)
+    else:
+        return MEASURE(q, ("ro", q))
+
+
+def main(n_instructions, n_qubits):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    program = Program(_instruction(i, n_qubits) for i in range(n_instructions))
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print("Program of {} instructions on {} qubits".format(len(program), n_qubits))
+    print("{:8.1f} MB in total".format((after - before) / 2 ** 20))
+    print("{:8.1f} bytes per instruction".format((after - before) / n_instructions))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--instructions', '-n', default=1000000, type=int,
+                        help="Number of instructions in the program.")
+    parser.add_argument('--qubits', '-q', default=16, type=int, help="Number of qubits.")
+    args = parser.parse_args()
+    main(args.instructions, args.qubits)
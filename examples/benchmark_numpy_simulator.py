@@ -0,0 +1,87 @@
+"""
+Compare simulating random circuits in process with PyWavefunctionSimulator / PyQVM and over
+HTTP with WavefunctionSimulator / QVM. The QVM columns are skipped if no QVM server is running.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import time
+
+import numpy as np
+from requests import RequestException
+
+from pyquil import Program
+from pyquil.api import ForestConnection, PyQVM, PyWavefunctionSimulator, QVM, WavefunctionSimulator
+from pyquil.gates import CNOT, H, MEASURE, RX, RZ
+
+
+def _best_of(repeats, fn, *args):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def random_circuit(n_qubits, depth, seed=1234):
+    """
+    ``depth`` layers of random single qubit rotations followed by a ladder of CNOTs.
+    """
+    rs = np.random.RandomState(seed)
+    program = Program([H(q) for q in range(n_qubits)])
+    for _ in range(depth):
+        for q in range(n_qubits):
+            program += RZ(rs.uniform(-np.pi, np.pi), q)
+            program += RX(rs.uniform(-np.pi, np.pi), q)
+        for q in range(n_qubits - 1):
+            program += CNOT(q, q + 1)
+    return program
+
+
+def measured(program, n_qubits, trials):
+    program = program.copy()
+    ro = program.declare('ro', 'BIT', n_qubits)
+    for q in range(n_qubits):
+        program += MEASURE(q, ro[q])
+    return program.wrap_in_numshots_loop(trials)
+
+
+def run(qam, program):
+    return qam.load(program).run().wait().read_from_memory_region(region_name='ro')
+
+
+def main(qubits, depth, trials, repeats):
+    connection = ForestConnection()
+    try:
+        WavefunctionSimulator(connection).wavefunction(Program(H(0)))
+        have_qvm = True
+    except (RequestException, OSError):
+        print("No QVM server found, only timing the numpy simulator")
+        have_qvm = False
+
+    print("Random circuits of depth {}, {} shots, best of {}".format(depth, trials, repeats))
+    print("{:>7} {:>12} {:>12} {:>12} {:>12}".format(
+        "qubits", "np wf (s)", "qvm wf (s)", "np run (s)", "qvm run (s)"))
+    for n in qubits:
+        program = random_circuit(n, depth)
+        shots = measured(program, n, trials)
+        np_wf = _best_of(repeats, PyWavefunctionSimulator().wavefunction, program)
+        np_run = _best_of(repeats, run, PyQVM(), shots)
+        if have_qvm:
+            qvm_wf = _best_of(repeats, WavefunctionSimulator(connection).wavefunction, program)
+            qvm_run = _best_of(repeats, run, QVM(connection), shots)
+        else:
+            qvm_wf = qvm_run = float('nan')
+        print("{:>7} {:>12.4f} {:>12.4f} {:>12.4f} {:>12.4f}".format(
+            n, np_wf, qvm_wf, np_run, qvm_run))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--qubits', '-n', default=[2, 6, 10, 14, 18], type=int, nargs='+',
+                        help="Circuit widths to benchmark.")
+    parser.add_argument('--depth', '-d', default=10, type=int, help="Number of layers.")
+    parser.add_argument('--trials', '-t', default=1000, type=int, help="Number of shots.")
+    parser.add_argument('--repeats', '-r', default=3, type=int, help="Number of repetitions.")
+    args = parser.parse_args()
+    main(args.qubits, args.depth, args.trials, args.repeats)
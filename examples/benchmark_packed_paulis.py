@@ -0,0 +1,50 @@
+"""
+Compare multiplying random sums of Pauli terms as PauliSums and as PackedPauliSums.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import time
+
+import numpy as np
+
+from pyquil.paulis import PauliSum, PauliTerm
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def random_sum(n_terms, n_qubits, rs):
+    """
+    A sum of random Pauli strings with random complex coefficients.
+    """
+    ops = rs.randint(4, size=(n_terms, n_qubits))
+    coefficients = rs.normal(size=n_terms) + 1j * rs.normal(size=n_terms)
+    return PauliSum([PauliTerm.from_list([("IXYZ"[op], q) for q, op in enumerate(row)],
+                                         coefficient)
+                     for row, coefficient in zip(ops, coefficients)])
+
+
+def main(n_terms, n_qubits, seed=1234):
+    rs = np.random.RandomState(seed)
+    a, b = random_sum(n_terms, n_qubits, rs), random_sum(n_terms, n_qubits, rs)
+    print("Product of two random sums of {} terms on {} qubits".format(n_terms, n_qubits))
+
+    (packed_a, packed_b), t_pack = _timed(lambda: (a.packed(), b.packed()))
+    product, t_packed = _timed(lambda: packed_a * packed_b)
+    _, t_unpack = _timed(product.to_pauli_sum)
+    print("{:>16} {:>12.3f}".format("pack (s)", t_pack))
+    print("{:>16} {:>12.3f}".format("packed (s)", t_packed))
+    print("{:>16} {:>12.3f}".format("unpack (s)", t_unpack))
+    _, t_pauli_sum = _timed(lambda: a * b)
+    print("{:>16} {:>12.3f}".format("PauliSum (s)", t_pauli_sum))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--terms', '-n', default=300, type=int, help="Number of terms per sum.")
+    parser.add_argument('--qubits', '-q', default=20, type=int, help="Number of qubits.")
+    args = parser.parse_args()
+    main(args.terms, args.qubits)
@@ -0,0 +1,56 @@
+"""
+Compare the speed of the parser backends on a large, randomly generated native Quil program.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import time
+
+import numpy as np
+
+from pyquil.parser import parse, PARSER_BACKENDS
+
+
+def native_quil(n_lines, n_qubits=16, seed=1234):
+    """
+    Generate a program that looks like the output of quilc: RZ/RX rotations, CZs and measurements.
+    """
+    rs = np.random.RandomState(seed)
+    lines = ["DECLARE ro BIT[{}]".format(n_qubits), "DECLARE theta REAL[4]"]
+    while len(lines) < n_lines:
+        q = rs.randint(n_qubits)
+        kind = rs.randint(5)
+        if kind == 0:
+            lines.append("RZ({!r}) {}".format(rs.uniform(-np.pi, np.pi), q))
+        elif kind == 1:
+            lines.append("RX({}) {}".format(rs.choice(["pi/2", "-pi/2", "pi"]), q))
+        elif kind == 2:
+            lines.append("CZ {} {}".format(q, (q + 1) % n_qubits))
+        elif kind == 3:
+            lines.append("RZ(2.0*theta[{}]) {}".format(rs.randint(4), q))
+        else:
+            lines.append("PRAGMA PRESERVE_BLOCK")
+    lines.extend("MEASURE {0} ro[{0}]".format(q) for q in range(n_qubits))
+    return "\n".join(lines)
+
+
+def main(n_lines, repeats):
+    quil = native_quil(n_lines)
+    print("Parsing {} lines of native Quil, best of {}".format(n_lines, repeats))
+    timings = {}
+    for backend in sorted(PARSER_BACKENDS):
+        best = float('inf')
+        for _ in range(repeats):
+            start = time.perf_counter()
+            parse(quil, backend=backend)
+            best = min(best, time.perf_counter() - start)
+        timings[backend] = best
+        print("{:>8}: {:8.3f} s ({:9.0f} lines/s)".format(backend, best, n_lines / best))
+    print("Speedup: {:.1f}x".format(timings['antlr'] / timings['fast']))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--lines', '-n', default=5000, type=int, help="Number of lines to parse.")
+    parser.add_argument('--repeats', '-r', default=3, type=int, help="Number of repetitions.")
+    args = parser.parse_args()
+    main(args.lines, args.repeats)
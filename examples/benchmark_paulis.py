@@ -0,0 +1,58 @@
+"""
+Time simplifying, adding and multiplying large sums of Pauli terms.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import time
+
+import numpy as np
+
+from pyquil.paulis import PauliSum, PauliTerm, commuting_groups, simplify_pauli_sum
+
+
+def _timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def random_sum(n_terms, n_qubits, weight, rs):
+    """
+    A sum of random Pauli strings of the given weight, with many repeated strings.
+    """
+    terms = []
+    for _ in range(n_terms):
+        qubits = np.sort(rs.choice(n_qubits, size=weight, replace=False))
+        ops = rs.choice(["X", "Y", "Z"], size=weight)
+        terms.append(PauliTerm.from_list(list(zip(ops, qubits.tolist())), rs.normal()))
+    return PauliSum(terms)
+
+
+def main(n_terms, n_qubits, weight, seed=1234):
+    rs = np.random.RandomState(seed)
+    pauli_sum, t_build = _timed(random_sum, n_terms, n_qubits, weight, rs)
+    print("Random sum of {} terms of weight {} on {} qubits".format(n_terms, weight, n_qubits))
+    print("{:>16} {:>10.3f}".format("build (s)", t_build))
+
+    simplified, t_simplify = _timed(simplify_pauli_sum, pauli_sum)
+    print("{:>16} {:>10.3f} ({} terms left)".format("simplify (s)", t_simplify,
+                                                     len(simplified)))
+    _, t_add = _timed(lambda: pauli_sum + simplified)
+    print("{:>16} {:>10.3f}".format("add (s)", t_add))
+    small = PauliSum(simplified.terms[:10])
+    _, t_mul = _timed(lambda: simplified * small)
+    print("{:>16} {:>10.3f}".format("multiply (s)", t_mul))
+    for qubitwise in True, False:
+        groups, t_group = _timed(commuting_groups, simplified, qubitwise)
+        print("{:>16} {:>10.3f} ({} groups)".format("group QWC (s)" if qubitwise else "group (s)",
+                                                   t_group, len(groups)))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--terms', '-n', default=100000, type=int, help="Number of terms.")
+    parser.add_argument('--qubits', '-q', default=12, type=int, help="Number of qubits.")
+    parser.add_argument('--weight', '-w', default=3, type=int,
+                        help="Number of qubits each term acts on.")
+    args = parser.parse_args()
+    main(args.terms, args.qubits, args.weight)
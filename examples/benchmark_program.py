@@ -0,0 +1,97 @@
+"""
+Benchmarks for building and manipulating large Programs.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import time
+
+from pyquil.gates import RX, CZ, MEASURE
+from pyquil.quil import Program, merge_programs
+
+
+def _best_of(repeats, fn, *args):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _gate(i):
+    return RX(0.1, i % 16) if i % 3 else CZ(i % 16, (i + 1) % 16)
+
+
+def interleaved_append(n, rebuild):
+    """
+    Append ``n`` instructions, reading ``Program.instructions`` after each one. With ``rebuild``
+    the synthesized instructions are thrown away after every append, which is what Program used
+    to do.
+    """
+    p = Program()
+    for i in range(n):
+        p.inst(_gate(i))
+        if rebuild:
+            p._synthesized_instructions = None
+        len(p.instructions)
+        p.instructions[-1]
+    for i in range(16):
+        p.inst(MEASURE(i, ("ro", i)))
+        if rebuild:
+            p._synthesized_instructions = None
+        len(p.instructions)
+
+
+def merge_by_sum(programs):
+    """
+    How merge_programs used to combine instructions.
+    """
+    return sum([prog.instructions for prog in programs], Program())
+
+
+def serialize(program, cached):
+    """
+    Serialize ``program``. Without ``cached`` the Program and Gate caches are cleared first, which
+    is equivalent to what Program.out() used to do on every call.
+    """
+    if not cached:
+        program._cached_out = None
+        for instr in program:
+            instr._cached_out = None
+    program.out()
+
+
+def main(sizes, repeats):
+    print("Appending N instructions and reading Program.instructions after each append")
+    print("{:>8} {:>12} {:>12}".format("N", "rebuild (s)", "incr. (s)"))
+    for n in sizes:
+        rebuild = _best_of(repeats, interleaved_append, n, True) if n <= 4000 else float('nan')
+        incremental = _best_of(repeats, interleaved_append, n, False)
+        print("{:>8} {:>12.4f} {:>12.4f}".format(n, rebuild, incremental))
+
+    print()
+    print("Merging N programs of 3 instructions each")
+    print("{:>8} {:>12} {:>12}".format("N", "sum (s)", "merge (s)"))
+    for n in sizes:
+        programs = [Program(_gate(i), _gate(i + 1), _gate(i + 2)) for i in range(n)]
+        by_sum = _best_of(repeats, merge_by_sum, programs) if n <= 4000 else float('nan')
+        merged = _best_of(repeats, merge_programs, programs)
+        print("{:>8} {:>12.4f} {:>12.4f}".format(n, by_sum, merged))
+
+    print()
+    print("Serializing a program of N gates with Program.out()")
+    print("{:>8} {:>12} {:>12}".format("N", "uncached (s)", "cached (s)"))
+    for n in sizes:
+        program = Program(_gate(i) for i in range(n))
+        uncached = _best_of(repeats, serialize, program, False)
+        cached = _best_of(repeats, serialize, program, True)
+        print("{:>8} {:>12.4f} {:>12.6f}".format(n, uncached, cached))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--sizes', '-n', default=[1000, 2000, 4000, 16000], type=int,
+                        nargs='+', help="Program sizes to benchmark.")
+    parser.add_argument('--repeats', '-r', default=3, type=int, help="Number of repetitions.")
+    args = parser.parse_args()
+    main(args.sizes, args.repeats)
@@ -0,0 +1,44 @@
+"""
+Time generating randomized benchmarking sequences in process with PyBenchmarker. The first call
+for a gateset enumerates its Clifford group (or loads it from the cache directory); later calls
+only sample.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import time
+
+import numpy as np
+
+from pyquil.api import PyBenchmarker
+from pyquil.gates import CZ, RX, RZ
+
+GATESETS = {
+    1: [RX(np.pi / 2, 0), RZ(np.pi / 2, 0)],
+    2: [RX(np.pi / 2, 0), RZ(np.pi / 2, 0), RX(np.pi / 2, 1), RZ(np.pi / 2, 1), CZ(0, 1)],
+}
+
+
+def main(depth, sequences, cache_dir):
+    print("{} sequences of depth {}".format(sequences, depth))
+    print("{:>7} {:>12} {:>14}".format("qubits", "setup (s)", "sequences (s)"))
+    for n_qubits, gateset in sorted(GATESETS.items()):
+        benchmarker = PyBenchmarker(random_seed=1234, cache_dir=cache_dir)
+        start = time.perf_counter()
+        benchmarker.generate_rb_sequence(depth, gateset)
+        setup = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(sequences):
+            benchmarker.generate_rb_sequence(depth, gateset)
+        print("{:>7} {:>12.4f} {:>14.4f}".format(n_qubits, setup, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--depth', '-d', default=20, type=int, help="Cliffords per sequence.")
+    parser.add_argument('--sequences', '-s', default=10000, type=int,
+                        help="Number of sequences to generate.")
+    parser.add_argument('--cache-dir', default=None,
+                        help="Where to store Clifford groups. By default they are not stored.")
+    args = parser.parse_args()
+    main(args.depth, args.sequences, args.cache_dir)
@@ -0,0 +1,73 @@
+"""
+Time running random Clifford circuits on PyQVM with the stabilizer simulator. Gates take time
+linear in the number of qubits and measurements quadratic, so circuits on a thousand qubits run
+in seconds. For small widths, the numpy wavefunction simulator is timed for comparison.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import time
+
+import numpy as np
+
+from pyquil import Program
+from pyquil.api import PyQVM
+from pyquil.gates import CNOT, CZ, H, MEASURE, S
+from pyquil.stabilizer_simulator import StabilizerSimulator
+
+MAX_WAVEFUNCTION_QUBITS = 20
+
+
+def _best_of(repeats, fn, *args):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def random_clifford_circuit(n_qubits, depth, trials, seed=1234):
+    """
+    ``depth`` layers of random H and S gates followed by CNOTs and CZs between random pairs,
+    then measuring all qubits.
+    """
+    rs = np.random.RandomState(seed)
+    program = Program()
+    for _ in range(depth):
+        for q in range(n_qubits):
+            program += [H, S][rs.randint(2)](q)
+        pairs = rs.permutation(n_qubits)[:n_qubits // 2 * 2].reshape(-1, 2).tolist()
+        program += [[CNOT, CZ][rs.randint(2)](a, b) for a, b in pairs]
+    ro = program.declare('ro', 'BIT', n_qubits)
+    program += [MEASURE(q, ro[q]) for q in range(n_qubits)]
+    return program.wrap_in_numshots_loop(trials)
+
+
+def run(qam, program):
+    return qam.load(program).run().wait().read_from_memory_region(region_name='ro')
+
+
+def main(qubits, depth, trials, repeats):
+    print("Random Clifford circuits of depth {}, {} shots, best of {}".format(
+        depth, trials, repeats))
+    print("{:>7} {:>16} {:>16}".format("qubits", "stabilizer (s)", "wavefunction (s)"))
+    for n in qubits:
+        program = random_clifford_circuit(n, depth, trials)
+        stabilizer = _best_of(repeats, run, PyQVM(quantum_simulator_type=StabilizerSimulator),
+                              program)
+        if n <= MAX_WAVEFUNCTION_QUBITS:
+            wavefunction = _best_of(repeats, run, PyQVM(), program)
+        else:
+            wavefunction = float('nan')
+        print("{:>7} {:>16.4f} {:>16.4f}".format(n, stabilizer, wavefunction))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--qubits', '-n', default=[10, 20, 100, 300, 1000], type=int, nargs='+',
+                        help="Circuit widths to benchmark.")
+    parser.add_argument('--depth', '-d', default=10, type=int, help="Number of layers.")
+    parser.add_argument('--trials', '-t', default=1000, type=int, help="Number of shots.")
+    parser.add_argument('--repeats', '-r', default=3, type=int, help="Number of repetitions.")
+    args = parser.parse_args()
+    main(args.qubits, args.depth, args.trials, args.repeats)
@@ -0,0 +1,65 @@
+"""
+Compare decoding the QVM's bit packed wavefunctions with a struct.unpack loop and with NumPy.
+"""
+
+from argparse import ArgumentParser, ArgumentDefaultsHelpFormatter
+import struct
+import time
+
+import numpy as np
+
+from pyquil.wavefunction import Wavefunction, OCTETS_PER_COMPLEX_DOUBLE, OCTETS_PER_DOUBLE_FLOAT
+
+
+def _best_of(repeats, fn, *args):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def unpack_loop(coef_string):
+    """
+    How Wavefunction.from_bit_packed_string used to decode the amplitudes.
+    """
+    num_octets = len(coef_string)
+    wf = np.zeros(num_octets // OCTETS_PER_COMPLEX_DOUBLE, dtype=np.cfloat)
+    for i, p in enumerate(range(0, num_octets, OCTETS_PER_COMPLEX_DOUBLE)):
+        re_be = coef_string[p: p + OCTETS_PER_DOUBLE_FLOAT]
+        im_be = coef_string[p + OCTETS_PER_DOUBLE_FLOAT: p + OCTETS_PER_COMPLEX_DOUBLE]
+        re = struct.unpack('>d', re_be)[0]
+        im = struct.unpack('>d', im_be)[0]
+        wf[i] = complex(re, im)
+    return Wavefunction(wf)
+
+
+def random_packed_wavefunction(n_qubits, seed=1234):
+    rs = np.random.RandomState(seed)
+    amplitudes = rs.randn(2 ** n_qubits) + 1j * rs.randn(2 ** n_qubits)
+    amplitudes /= np.linalg.norm(amplitudes)
+    return amplitudes.astype('>c16').tobytes()
+
+
+def main(qubits, max_loop_qubits, repeats):
+    print("Decoding bit packed wavefunctions, best of {}".format(repeats))
+    print("{:>7} {:>10} {:>10} {:>10}".format("qubits", "loop (s)", "copy (s)", "view (s)"))
+    for n in qubits:
+        packed = random_packed_wavefunction(n)
+        loop = _best_of(repeats, unpack_loop, packed) if n <= max_loop_qubits else float('nan')
+        copy = _best_of(repeats, Wavefunction.from_bit_packed_string, packed)
+        view = _best_of(repeats, Wavefunction.from_bit_packed_string, packed, False)
+        print("{:>7} {:>10.4f} {:>10.4f} {:>10.4f}".format(n, loop, copy, view))
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser(__doc__, formatter_class=ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--qubits', '-n', default=[10, 15, 20, 24], type=int, nargs='+',
+                        help="Wavefunction sizes to benchmark. Each amplitude takes 16 bytes, "
+                             "so 30 qubits need 16 GiB.")
+    parser.add_argument('--max-loop-qubits', default=20, type=int,
+                        help="Largest size for which to time the old struct.unpack loop.")
+    parser.add_argument('--repeats', '-r', default=3, type=int, help="Number of repetitions.")
+    args = parser.parse_args()
+    main(args.qubits, args.max_loop_qubits, args.repeats)
@@ -0,0 +1,108 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+"""
+The bounded least-recently-used table shared by the parse and compile caches.
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class LRUCache(object):
+    """
+    A thread-safe table which keeps at most ``maxsize`` entries, evicting the least recently used
+    ones first, and counts hits and misses.
+
+    :param int maxsize: The maximum number of entries to keep. A size of 0 disables the cache.
+    """
+
+    def __init__(self, maxsize=128):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = 0
+        self.hits = 0
+        self.misses = 0
+        self.maxsize = maxsize
+
+    @property
+    def maxsize(self):
+        """
+        The maximum number of entries to keep. Shrinking the cache evicts the least recently used
+        entries.
+        """
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize):
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError("maxsize must be a non-negative int")
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def get(self, key):
+        # type: (Hashable) -> Optional[Any]
+        """
+        Look up the entry stored under ``key``, updating the hit and miss counters.
+
+        :return: The entry, or None
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return value
+
+    def put(self, key, value):
+        # type: (Hashable, Any) -> None
+        """
+        Store ``value`` under ``key``.
+        """
+        with self._lock:
+            self._insert(key, value)
+
+    def clear(self):
+        """
+        Remove all entries and reset the statistics.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _lookup(self, key):
+        # Callers hold the lock
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def _insert(self, key, value):
+        # Callers hold the lock
+        if self._maxsize == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
@@ -0,0 +1,775 @@
+##############################################################################
+# Copyright 2016-2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+"""
+A hand-written recursive descent parser for Quil.
+
+This parser accepts the same language as the ANTLR grammar in ``Quil.g4`` and builds exactly the
+same PyQuil objects as ``PyQuilListener``, but avoids the (pure Python) generated ANTLR lexer and
+parser. Quil is a line oriented language: every instruction lives on a single line except for
+``DEFGATE`` and ``DEFCIRCUIT``, whose bodies are the indented lines that follow them. The parser
+therefore tokenizes and parses one line at a time, which also makes it possible to parse a
+program incrementally (see :py:func:`iter_fast_parser`).
+"""
+import operator
+import re
+from typing import Any, Iterable, Iterator, List, Tuple
+
+import numpy as np
+from numpy.ma import sin, cos, sqrt, exp
+
+from pyquil import parameters
+from pyquil.gates import QUANTUM_GATES
+from pyquil.parameters import Parameter
+from pyquil.quilatom import MemoryReference, Addr
+from pyquil.quilbase import (Gate, DefGate, Measurement, JumpTarget, Label, Expression,
+                             Nop, Halt, Jump, JumpWhen, JumpUnless, Reset, Wait,
+                             ClassicalNot, ClassicalNeg, ClassicalAnd, ClassicalInclusiveOr,
+                             ClassicalExclusiveOr,
+                             ClassicalMove, ClassicalConvert, ClassicalExchange, ClassicalLoad,
+                             ClassicalStore,
+                             ClassicalEqual, ClassicalGreaterEqual, ClassicalGreaterThan,
+                             ClassicalLessEqual,
+                             ClassicalLessThan, ClassicalAdd, ClassicalSub, ClassicalMul,
+                             ClassicalDiv,
+                             RawInstr, Qubit, Pragma, Declare, AbstractInstruction,
+                             ClassicalTrue, ClassicalFalse, ClassicalOr, ResetQubit)
+
+# Token types. Keywords and punctuation use their own text as their type.
+IDENTIFIER = 'IDENTIFIER'
+INT = 'INT'
+FLOAT = 'FLOAT'
+STRING = 'STRING'
+TAB = 'TAB'
+EOL = '<EOL>'
+INVALID = 'INVALID'
+_SYMBOLIC_TOKENS = frozenset([IDENTIFIER, INT, FLOAT, STRING, TAB, EOL, INVALID])
+
+KEYWORDS = frozenset([
+    'DEFGATE', 'DEFCIRCUIT', 'MEASURE',
+    'LABEL', 'HALT', 'JUMP', 'JUMP-WHEN', 'JUMP-UNLESS',
+    'RESET', 'WAIT', 'NOP', 'INCLUDE', 'PRAGMA',
+    'DECLARE', 'SHARING', 'OFFSET',
+    'NEG', 'NOT', 'TRUE', 'FALSE',
+    'AND', 'IOR', 'XOR', 'OR',
+    'ADD', 'SUB', 'MUL', 'DIV',
+    'MOVE', 'EXCHANGE', 'CONVERT',
+    'EQ', 'GT', 'GE', 'LT', 'LE',
+    'LOAD', 'STORE',
+    'pi', 'i',
+    'sin', 'cos', 'sqrt', 'exp', 'cis',
+])
+
+# Python's regex alternation is first-match rather than longest-match, so the alternatives are
+# written such that they emulate the maximal munch behaviour of the ANTLR lexer. In particular,
+# keywords are matched as identifiers and then looked up in KEYWORDS.
+_TOKEN_RE = re.compile(r"""
+    (?P<SPACE>\ +)
+  | (?P<COMMENT>\#.*)
+  | (?P<STRING>"[^\n\r]*")
+  | (?P<NAME>[A-Za-z_](?:[A-Za-z0-9\-_]*[A-Za-z0-9_])?)
+  | (?P<NUMBER>[0-9]+(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?)
+  | (?P<PUNCTUATION>[.,()\[\]:%@"+\-*/^])
+  | (?P<INVALID>.)
+""", re.VERBOSE)
+
+# Splits a program into lines the same way the ANTLR NEWLINE token does.
+_NEWLINE_RE = re.compile(r'\r\n|\r|\n')
+
+Token = Tuple[str, str, int, int]
+
+
+def run_fast_parser(quil):
+    # type: (str) -> List[AbstractInstruction]
+    """
+    Run the hand-written parser.
+
+    :param str quil: a single or multiline Quil program
+    :return: list of instructions that were parsed
+    """
+    return list(iter_fast_parser(_NEWLINE_RE.split(quil)))
+
+
+def iter_fast_parser(lines):
+    # type: (Iterable[str]) -> Iterator[AbstractInstruction]
+    """
+    Parse Quil one line at a time, yielding instructions as soon as they are complete.
+
+    ``DEFGATE`` and ``DEFCIRCUIT`` blocks are buffered until the first line that is not part of
+    their indented body, so memory use is bounded by the size of the largest single instruction
+    rather than by the size of the program.
+
+    :param lines: an iterable of lines of Quil, with or without trailing newline characters
+    :return: an iterator over the parsed instructions
+    """
+    header = None  # type: List[Token]
+    body = []  # type: List[List[Token]]
+    gap = None  # type: int
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip('\r\n')
+        tokens = _tokenize(line, line_number)
+        if not tokens:
+            # Empty lines are part of the NEWLINE token of the line before. Lines with a few
+            # spaces or a comment make a NEWLINE token of their own, which may separate
+            # instructions but not the lines of a DEFGATE or DEFCIRCUIT. (Lines indented by four
+            # or more spaces have TAB tokens and are rejected below like any other bad line.)
+            if line and header is not None and gap is None:
+                gap = line_number
+            continue
+
+        if header is not None:
+            if tokens[0][0] == TAB:
+                if gap is not None:
+                    _TokenStream([(EOL, EOL, gap, 0)]).error(TAB)
+                body.append(tokens)
+                continue
+            gap = None
+            yield _parse_block(header, body)
+            header = None
+            body = []
+
+        if tokens[0][0] in ('DEFGATE', 'DEFCIRCUIT'):
+            header = tokens
+        else:
+            yield _parse_instruction(tokens)
+
+    if header is not None:
+        yield _parse_block(header, body)
+
+
+def parse_expression(text):
+    # type: (str) -> Any
+    """
+    Parse a single Quil expression, such as a matrix entry of a ``PRAGMA ADD-KRAUS``.
+
+    :param str text: The expression.
+    :return: A number, or an Expression if ``text`` refers to parameters or memory.
+    """
+    stream = _TokenStream(_tokenize(text, 1))
+    result = _expression(stream)
+    stream.expect(EOL)
+    return result
+
+
+def _tokenize(line, line_number):
+    # type: (str, int) -> List[Token]
+    """
+    Split a single line of Quil into tokens of the form ``(type, text, line, column)``.
+
+    Comments and single spaces are skipped. Every run of four spaces is a TAB token, which is
+    how the grammar recognizes the indented bodies of DEFGATE and DEFCIRCUIT.
+    """
+    tokens = []
+    for match in _TOKEN_RE.finditer(line):
+        kind = match.lastgroup
+        text = match.group()
+        column = match.start()
+        if kind == 'NAME':
+            tokens.append((text if text in KEYWORDS else IDENTIFIER, text, line_number, column))
+        elif kind == 'NUMBER':
+            tokens.append((INT if text.isdigit() else FLOAT, text, line_number, column))
+        elif kind == 'SPACE':
+            for n in range(len(text) // 4):
+                tokens.append((TAB, '    ', line_number, column + 4 * n))
+        elif kind == 'PUNCTUATION':
+            tokens.append((text, text, line_number, column))
+        elif kind == 'COMMENT':
+            break
+        else:
+            tokens.append((kind, text, line_number, column))
+    return tokens
+
+
+def _parse_instruction(tokens):
+    # type: (List[Token]) -> AbstractInstruction
+    stream = _TokenStream(tokens)
+    kind = stream.peek()
+    if kind == IDENTIFIER:
+        instr = _gate(stream)
+    else:
+        try:
+            handler = _INSTRUCTIONS[kind]
+        except KeyError:
+            stream.error(IDENTIFIER, *sorted(_INSTRUCTIONS))
+        instr = handler(stream)
+    stream.expect(EOL)
+    return instr
+
+
+def _parse_block(header, body):
+    # type: (List[Token], List[List[Token]]) -> AbstractInstruction
+    stream = _TokenStream(header)
+    if stream.peek() == 'DEFGATE':
+        return _def_gate(stream, body)
+    return _def_circuit(stream, body)
+
+
+class _TokenStream(object):
+    """
+    A cursor over the tokens of a single line.
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+
+    def peek(self):
+        # type: () -> str
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos][0]
+        return EOL
+
+    def next(self):
+        # type: () -> Token
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def accept(self, kind):
+        # type: (str) -> bool
+        if self.peek() == kind:
+            self.pos += 1
+            return True
+        return False
+
+    def expect(self, *kinds):
+        # type: (*str) -> Token
+        if self.peek() in kinds:
+            if self.pos < len(self.tokens):
+                return self.next()
+            return (EOL, '', 0, 0)
+        self.error(*kinds)
+
+    def error(self, *expected):
+        if self.pos < len(self.tokens):
+            _, text, line, column = self.tokens[self.pos]
+        elif self.tokens:
+            _, text, line, column = self.tokens[-1]
+            column += len(text)
+            text = EOL
+        else:
+            text, line, column = EOL, 0, 0
+        expected_tokens = [kind if kind in _SYMBOLIC_TOKENS else "'{}'".format(kind)
+                           for kind in expected]
+        raise RuntimeError(
+            "Error encountered while parsing the quil program at line {} and column {}\n".format(line, column + 1) +
+            "Received an '{}' but was expecting one of [ {} ]".format(text, ', '.join(expected_tokens))
+        )
+
+
+"""
+Instructions
+"""
+
+
+def _gate(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    gate_name = stream.next()[1]
+    params = []
+    if stream.accept('('):
+        params.append(_expression(stream))
+        while stream.accept(','):
+            params.append(_expression(stream))
+        stream.expect(')')
+    qubits = [_qubit(stream)]
+    while stream.peek() == INT:
+        qubits.append(_qubit(stream))
+
+    if gate_name in QUANTUM_GATES:
+        if params:
+            return QUANTUM_GATES[gate_name](*params, *qubits)
+        else:
+            return QUANTUM_GATES[gate_name](*qubits)
+    return Gate(gate_name, params, qubits)
+
+
+def _def_gate(stream, body):
+    # type: (_TokenStream, List[List[Token]]) -> AbstractInstruction
+    stream.expect('DEFGATE')
+    gate_name = stream.expect(IDENTIFIER)[1]
+    variables = _variables(stream)
+    stream.expect(':')
+    stream.expect(EOL)
+
+    if not body:
+        stream.error(TAB)
+    matrix = []
+    for row_tokens in body:
+        row = _TokenStream(row_tokens)
+        row.expect(TAB)
+        elements = [_expression(row)]
+        while row.accept(','):
+            elements.append(_expression(row))
+        row.expect(EOL)
+        matrix.append(elements)
+    return DefGate(gate_name, matrix, variables)
+
+
+def _def_circuit(stream, body):
+    # type: (_TokenStream, List[List[Token]]) -> AbstractInstruction
+    """
+    PyQuil has no support for circuit definitions yet, so they are parsed into a RawInstr. See
+    ``PyQuilListener.exitDefCircuit`` for the format that has to be reproduced here.
+    """
+    stream.expect('DEFCIRCUIT')
+    circuit_name = stream.expect(IDENTIFIER)[1]
+    variables = [str(variable) for variable in _variables(stream)]
+    qubit_variables = []
+    while stream.peek() == IDENTIFIER:
+        qubit_variables.append(stream.next()[1])
+    stream.expect(':')
+    stream.expect(EOL)
+
+    if not body:
+        stream.error(TAB)
+    instructions = []
+    for line_tokens in body:
+        line = _TokenStream(line_tokens)
+        line.expect(TAB)
+        if line.peek() == IDENTIFIER:
+            instructions.append(_circuit_gate(line))
+            line.expect(EOL)
+        else:
+            instructions.append(_parse_instruction(line_tokens[1:]))
+
+    if variables:
+        raw_defcircuit = 'DEFCIRCUIT {}({}) {}:'.format(circuit_name, ', '.join(variables), ' '.join(qubit_variables))
+    else:
+        raw_defcircuit = 'DEFCIRCUIT {} {}:'.format(circuit_name, ' '.join(qubit_variables))
+
+    raw_defcircuit += '\n    '.join([''] + [instr.out() for instr in instructions])
+    return RawInstr(raw_defcircuit)
+
+
+def _circuit_gate(stream):
+    # type: (_TokenStream) -> RawInstr
+    """
+    Gates within a DEFCIRCUIT may act on qubit variables, so they are kept as raw text. As with
+    ANTLR's ``getText`` the text of each parameter is the concatenation of its tokens.
+    """
+    gate_name = stream.next()[1]
+    params = []
+    if stream.accept('('):
+        params.append(_token_text(stream, _expression))
+        while stream.accept(','):
+            params.append(_token_text(stream, _expression))
+        stream.expect(')')
+    qubits = [stream.expect(INT, IDENTIFIER)[1]]
+    while stream.peek() in (INT, IDENTIFIER):
+        qubits.append(stream.next()[1])
+
+    if params:
+        return RawInstr('{}({}) {}'.format(gate_name, ', '.join(params), ' '.join(qubits)))
+    else:
+        return RawInstr('{} {}'.format(gate_name, ' '.join(qubits)))
+
+
+def _measure(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    qubit = _qubit(stream)
+    classical = None
+    if stream.peek() != EOL:
+        classical = _addr(stream)
+    return Measurement(qubit, classical)
+
+
+def _def_label(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    return JumpTarget(_label(stream))
+
+
+def _halt(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    return Halt()
+
+
+def _jump(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    return Jump(_label(stream))
+
+
+def _jump_when(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    label = _label(stream)
+    return JumpWhen(label, _addr(stream))
+
+
+def _jump_unless(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    label = _label(stream)
+    return JumpUnless(label, _addr(stream))
+
+
+def _reset_state(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    if stream.peek() == INT:
+        return ResetQubit(_qubit(stream))
+    return Reset()
+
+
+def _wait(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    return Wait()
+
+
+def _nop(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    return Nop()
+
+
+_CLASSICAL_UNARY = {
+    'TRUE': ClassicalTrue,
+    'FALSE': ClassicalFalse,
+    'NOT': ClassicalNot,
+    'NEG': ClassicalNeg,
+}
+
+
+def _classical_unary(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    cls = _CLASSICAL_UNARY[stream.next()[0]]
+    return cls(_addr(stream))
+
+
+_LOGICAL_BINARY = {
+    'AND': ClassicalAnd,
+    'OR': ClassicalOr,
+    'IOR': ClassicalInclusiveOr,
+    'XOR': ClassicalExclusiveOr,
+}
+
+
+def _logical_binary_op(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    cls = _LOGICAL_BINARY[stream.next()[0]]
+    left = _addr(stream)
+    if stream.peek() == INT:
+        right = int(stream.next()[1])
+    else:
+        right = _addr(stream)
+    return cls(left, right)
+
+
+_ARITHMETIC_BINARY = {
+    'ADD': ClassicalAdd,
+    'SUB': ClassicalSub,
+    'MUL': ClassicalMul,
+    'DIV': ClassicalDiv,
+}
+
+
+def _arithmetic_binary_op(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    cls = _ARITHMETIC_BINARY[stream.next()[0]]
+    left = _addr(stream)
+    return cls(left, _addr_or_number(stream))
+
+
+def _move(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    target = _addr(stream)
+    return ClassicalMove(target, _addr_or_number(stream))
+
+
+def _exchange(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    left = _addr(stream)
+    return ClassicalExchange(left, _addr(stream))
+
+
+def _convert(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    left = _addr(stream)
+    return ClassicalConvert(left, _addr(stream))
+
+
+def _load(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    target = _addr(stream)
+    left = stream.expect(IDENTIFIER)[1]
+    return ClassicalLoad(target, left, _addr(stream))
+
+
+def _store(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    target = stream.expect(IDENTIFIER)[1]
+    left = _addr(stream)
+    return ClassicalStore(target, left, _addr_or_number(stream))
+
+
+_CLASSICAL_COMPARISON = {
+    'EQ': ClassicalEqual,
+    'GT': ClassicalGreaterThan,
+    'GE': ClassicalGreaterEqual,
+    'LT': ClassicalLessThan,
+    'LE': ClassicalLessEqual,
+}
+
+
+def _classical_comparison(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    cls = _CLASSICAL_COMPARISON[stream.next()[0]]
+    target = _addr(stream)
+    left = _addr(stream)
+    return cls(target, left, _addr_or_number(stream))
+
+
+def _include(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    include = stream.next()[1]
+    return RawInstr(include + ' ' + stream.expect(STRING)[1])
+
+
+def _pragma(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    command = stream.expect(IDENTIFIER)[1]
+    args = []
+    while stream.peek() in (IDENTIFIER, INT):
+        args.append(stream.next()[1])
+    if stream.peek() == STRING:
+        # [1:-1] is used to strip the quotes from the parsed string
+        return Pragma(command, args, stream.next()[1][1:-1])
+    return Pragma(command, args)
+
+
+def _memory_descriptor(stream):
+    # type: (_TokenStream) -> AbstractInstruction
+    stream.next()
+    name = stream.expect(IDENTIFIER)[1]
+    memory_type = stream.expect(IDENTIFIER)[1]
+    memory_size = 1
+    if stream.accept('['):
+        memory_size = int(stream.expect(INT)[1])
+        stream.expect(']')
+    shared_region = None
+    offsets = []
+    if stream.accept('SHARING'):
+        shared_region = stream.expect(IDENTIFIER)[1]
+        while stream.accept('OFFSET'):
+            offset = int(stream.expect(INT)[1])
+            offsets.append((offset, stream.expect(IDENTIFIER)[1]))
+    return Declare(name, memory_type, memory_size,
+                   shared_region=shared_region, offsets=offsets)
+
+
+_INSTRUCTIONS = {
+    'MEASURE': _measure,
+    'LABEL': _def_label,
+    'HALT': _halt,
+    'JUMP': _jump,
+    'JUMP-WHEN': _jump_when,
+    'JUMP-UNLESS': _jump_unless,
+    'RESET': _reset_state,
+    'WAIT': _wait,
+    'NOP': _nop,
+    'INCLUDE': _include,
+    'PRAGMA': _pragma,
+    'DECLARE': _memory_descriptor,
+    'MOVE': _move,
+    'EXCHANGE': _exchange,
+    'CONVERT': _convert,
+    'LOAD': _load,
+    'STORE': _store,
+}
+_INSTRUCTIONS.update(dict.fromkeys(_CLASSICAL_UNARY, _classical_unary))
+_INSTRUCTIONS.update(dict.fromkeys(_LOGICAL_BINARY, _logical_binary_op))
+_INSTRUCTIONS.update(dict.fromkeys(_ARITHMETIC_BINARY, _arithmetic_binary_op))
+_INSTRUCTIONS.update(dict.fromkeys(_CLASSICAL_COMPARISON, _classical_comparison))
+
+
+"""
+Helper functions for converting tokens to PyQuil objects
+"""
+
+
+def _qubit(stream):
+    # type: (_TokenStream) -> Qubit
+    return Qubit(int(stream.expect(INT)[1]))
+
+
+def _variables(stream):
+    # type: (_TokenStream) -> List[Parameter]
+    variables = []
+    if stream.accept('('):
+        variables.append(_variable(stream))
+        while stream.accept(','):
+            variables.append(_variable(stream))
+        stream.expect(')')
+    return variables
+
+
+def _variable(stream):
+    # type: (_TokenStream) -> Parameter
+    stream.expect('%')
+    return Parameter(stream.expect(IDENTIFIER)[1])
+
+
+def _addr(stream):
+    # type: (_TokenStream) -> MemoryReference
+    if stream.accept('['):
+        offset = int(stream.expect(INT)[1])
+        stream.expect(']')
+        return Addr(offset)
+    name = stream.expect(IDENTIFIER, '[')[1]
+    if stream.accept('['):
+        offset = int(stream.expect(INT)[1])
+        stream.expect(']')
+        return MemoryReference(name, offset)
+    return MemoryReference(name, 0)
+
+
+def _addr_or_number(stream):
+    # type: (_TokenStream) -> Any
+    if stream.peek() in (IDENTIFIER, '['):
+        return _addr(stream)
+    return _number(stream)
+
+
+def _label(stream):
+    # type: (_TokenStream) -> Label
+    stream.expect('@')
+    return Label(stream.expect(IDENTIFIER)[1])
+
+
+def _token_text(stream, rule):
+    # type: (_TokenStream, Any) -> str
+    """
+    Run a parsing rule and return the concatenated text of the tokens it consumed.
+    """
+    start = stream.pos
+    rule(stream)
+    return ''.join(token[1] for token in stream.tokens[start:stream.pos])
+
+
+def _expression(stream):
+    # type: (_TokenStream) -> Any
+    """
+    Parse an expression. The precedence levels follow the order of the alternatives of the
+    ``expression`` rule in the grammar: a sign binds tightest, then ``^`` (right associative),
+    then ``*`` and ``/``, then ``+`` and ``-`` (both left associative).
+    """
+    result = _mul_div(stream)
+    while True:
+        kind = stream.peek()
+        if kind == '+':
+            stream.next()
+            result = operator.add(result, _mul_div(stream))
+        elif kind == '-':
+            stream.next()
+            result = operator.sub(result, _mul_div(stream))
+        else:
+            return result
+
+
+def _mul_div(stream):
+    # type: (_TokenStream) -> Any
+    result = _power(stream)
+    while True:
+        kind = stream.peek()
+        if kind == '*':
+            stream.next()
+            result = operator.mul(result, _power(stream))
+        elif kind == '/':
+            stream.next()
+            result = operator.truediv(result, _power(stream))
+        else:
+            return result
+
+
+def _power(stream):
+    # type: (_TokenStream) -> Any
+    base = _signed(stream)
+    if stream.accept('^'):
+        return operator.pow(base, _power(stream))
+    return base
+
+
+def _signed(stream):
+    # type: (_TokenStream) -> Any
+    if stream.accept('+'):
+        return _signed(stream)
+    elif stream.accept('-'):
+        return -1 * _signed(stream)
+    return _primary(stream)
+
+
+def _primary(stream):
+    # type: (_TokenStream) -> Any
+    kind = stream.peek()
+    if kind == '(':
+        stream.next()
+        result = _expression(stream)
+        stream.expect(')')
+        return result
+    elif kind in _FUNCTIONS:
+        stream.next()
+        stream.expect('(')
+        result = _apply_function(kind, _expression(stream))
+        stream.expect(')')
+        return result
+    elif kind == '%':
+        return _variable(stream)
+    elif kind in (IDENTIFIER, '['):
+        return _addr(stream)
+    elif kind in (INT, FLOAT, 'i', 'pi'):
+        return _number(stream)
+    stream.error('(', '+', '-', '%', '[', IDENTIFIER, INT, FLOAT, 'i', 'pi', *sorted(_FUNCTIONS))
+
+
+_FUNCTIONS = {
+    'sin': (parameters.quil_sin, sin),
+    'cos': (parameters.quil_cos, cos),
+    'sqrt': (parameters.quil_sqrt, sqrt),
+    'exp': (parameters.quil_exp, exp),
+    'cis': (parameters.quil_cis, lambda arg: cos(arg) + complex(0, 1) * sin(arg)),
+}
+
+
+def _apply_function(name, arg):
+    # type: (str, Any) -> Any
+    symbolic, numeric = _FUNCTIONS[name]
+    if isinstance(arg, Expression):
+        return symbolic(arg)
+    return numeric(arg)
+
+
+def _number(stream):
+    # type: (_TokenStream) -> Any
+    kind, text, _, _ = stream.expect(INT, FLOAT, 'i', 'pi')
+    if kind == 'pi':
+        return np.pi
+    elif kind == 'i':
+        return complex(0, 1)
+
+    real = int(text) if kind == INT else float(text)
+    if stream.accept('i'):
+        return complex(0, real)
+    return real
@@ -19,21 +19,28 @@ Module for facilitating connections to the QVM / QPU.
 import warnings
 
 __all__ = ['QVMConnection', 'LocalQVMCompiler', 'QVMCompiler', 'QPUCompiler',
-           'Job', 'get_devices', 'Device', 'ForestConnection', 'pyquil_protect',
-           'WavefunctionSimulator', 'QuantumComputer', 'list_quantum_computers', 'get_qc',
-           'QAM', 'QVM', 'QPU',
-           'BenchmarkConnection', 'LocalBenchmarkConnection', 'get_benchmarker']
+           'CachingCompiler', 'CompileCache', 'compile_cache',
+           'Job', 'get_devices', 'Device', 'ForestConnection', 'AsyncForestConnection',
+           'pyquil_protect',
+           'WavefunctionSimulator', 'QuantumComputer', 'ParametricExecutable',
+           'list_quantum_computers', 'get_qc',
+           'QAM', 'QVM', 'QPU', 'PyQVM', 'PyWavefunctionSimulator',
+           'BenchmarkConnection', 'LocalBenchmarkConnection', 'PyBenchmarker', 'get_benchmarker']
 
-from pyquil.api._base_connection import ForestConnection
-from pyquil.api._benchmark import BenchmarkConnection, LocalBenchmarkConnection, get_benchmarker
+from pyquil.api._base_connection import ForestConnection, AsyncForestConnection
+from pyquil.api._benchmark import (BenchmarkConnection, LocalBenchmarkConnection, PyBenchmarker,
+                                   get_benchmarker)
+from pyquil.api._compile_cache import CachingCompiler, CompileCache, compile_cache
 from pyquil.api._compiler import QVMCompiler, QPUCompiler, LocalQVMCompiler
 from pyquil.api._error_reporting import pyquil_protect
 from pyquil.api._job import Job
 from pyquil.api._qam import QAM
+from pyquil.api._pyqvm import PyQVM
 from pyquil.api._qpu import get_devices, QPU
-from pyquil.api._quantum_computer import QuantumComputer, list_quantum_computers, get_qc
+from pyquil.api._quantum_computer import (QuantumComputer, ParametricExecutable,
+                                          list_quantum_computers, get_qc)
 from pyquil.api._qvm import QVMConnection, QVM
-from pyquil.api._wavefunction_simulator import WavefunctionSimulator
+from pyquil.api._wavefunction_simulator import WavefunctionSimulator, PyWavefunctionSimulator
 from pyquil.device import Device
 
 
@@ -15,8 +15,11 @@
 ##############################################################################
 from __future__ import print_function
 
+import asyncio
 import re
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from json.decoder import JSONDecodeError
 from typing import Dict, Union, Sequence
 
@@ -86,23 +89,70 @@ def parse_error(res):
     return error_cls(status)
 
 
+_http_adapter = None
+_http_adapter_lock = threading.Lock()
+
+
+def get_http_adapter():
+    """
+    Get the HTTP adapter shared by all sessions created by :py:func:`get_session`.
+
+    The adapter holds a pool of keep-alive connections for each host, so that all pyQuil HTTP
+    clients (e.g. :py:class:`ForestConnection`, :py:class:`LocalQVMCompiler` and
+    :py:class:`LocalBenchmarkConnection`) reuse each other's connections. It keeps at most
+    ``PYQUIL_HTTP_POOL_SIZE`` (by default 10, see :py:class:`PyquilConfig`) idle connections per
+    host, see :py:func:`set_http_pool_size`. The pool is thread-safe.
+
+    :rtype: HTTPAdapter
+    """
+    global _http_adapter
+    with _http_adapter_lock:
+        if _http_adapter is None:
+            _http_adapter = _make_http_adapter(PyquilConfig().http_pool_size)
+        return _http_adapter
+
+
+def set_http_pool_size(pool_size):
+    """
+    Change the number of connections per host kept by the shared connection pool. This only
+    affects sessions created afterwards by :py:func:`get_session`.
+
+    :param int pool_size: The maximum number of idle connections to keep per host.
+    """
+    global _http_adapter
+    if not isinstance(pool_size, integer_types) or pool_size < 1:
+        raise ValueError("pool_size must be a positive int")
+    with _http_adapter_lock:
+        _http_adapter = _make_http_adapter(pool_size)
+
+
+def _make_http_adapter(pool_size):
+    return HTTPAdapter(pool_connections=pool_size,
+                       pool_maxsize=pool_size,
+                       max_retries=Retry(total=3,
+                                         method_whitelist=['POST'],
+                                         status_forcelist=[502, 503, 504, 521, 523],
+                                         backoff_factor=0.2,
+                                         raise_on_status=False))
+
+
 def get_session():
     """
     Create a requests session to access the REST API
 
+    Sessions share their connections through :py:func:`get_http_adapter`, so creating one is
+    cheap. A session can be used by many threads at once as long as its headers are not changed
+    meanwhile.
+
     :return: requests session
     :rtype: Session
     """
     config = PyquilConfig()
     session = requests.Session()
-    retry_adapter = HTTPAdapter(max_retries=Retry(total=3,
-                                                  method_whitelist=['POST'],
-                                                  status_forcelist=[502, 503, 504, 521, 523],
-                                                  backoff_factor=0.2,
-                                                  raise_on_status=False))
+    adapter = get_http_adapter()
 
-    session.mount("http://", retry_adapter)
-    session.mount("https://", retry_adapter)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
 
     # We need this to get binary payload for the wavefunction call.
     session.headers.update({"Accept": "application/octet-stream",
@@ -288,6 +338,10 @@ class ForestConnection:
         """
         Represents a connection to Forest containing methods to wrap all possible API endpoints.
 
+        Connections are thread-safe: QVMs and compilers sharing a connection can run jobs from
+        many threads at once. All connections draw on one pool of keep-alive HTTP connections,
+        see :py:func:`get_http_adapter`.
+
         Users should not use methods from this class directly.
 
         :param sync_endpoint: The endpoint of the server for running (small) QVM jobs
@@ -377,3 +431,77 @@ class ForestConnection:
         response = post_json(self.session, self.sync_endpoint + "/quilc", payload)
         unpacked_response = response.json()
         return unpacked_response
+
+
+class AsyncForestConnection:
+    @_record_call
+    def __init__(self, sync_endpoint=None, compiler_endpoint=None, max_workers=64):
+        """
+        The asyncio counterpart of :py:class:`ForestConnection`: its methods are coroutines, so
+        that a single event loop can have many QVM and quilc requests in flight.
+
+        Requests are made through a :py:class:`ForestConnection` by a pool of ``max_workers``
+        threads, so at most ``max_workers`` requests are sent at once. Raise the size of the
+        shared connection pool (see :py:func:`set_http_pool_size`) to keep that many connections
+        alive. Call :py:meth:`close` to stop the threads.
+
+        Users should not use methods from this class directly.
+
+        :param sync_endpoint: The endpoint of the server for running (small) QVM jobs
+        :param compiler_endpoint: The endpoint of the server for running (small) compiler jobs
+        :param max_workers: The maximum number of concurrent requests.
+        """
+        if not sync_endpoint:
+            pyquil_config = PyquilConfig()
+            sync_endpoint = pyquil_config.qvm_url
+        if not compiler_endpoint:
+            pyquil_config = PyquilConfig()
+            compiler_endpoint = pyquil_config.compiler_url
+
+        self.sync_endpoint = sync_endpoint
+        self.compiler_endpoint = compiler_endpoint
+        self.connection = ForestConnection(sync_endpoint=sync_endpoint,
+                                           compiler_endpoint=compiler_endpoint)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    async def _call(self, method, *args):
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(self._executor, getattr(self.connection, method), *args)
+
+    async def _run_and_measure(self, quil_program, qubits, trials, random_seed) -> np.ndarray:
+        """
+        Run a Forest ``run_and_measure`` job, see :py:meth:`ForestConnection._run_and_measure`.
+        """
+        return await self._call('_run_and_measure', quil_program, qubits, trials, random_seed)
+
+    async def _wavefunction(self, quil_program, random_seed) -> Wavefunction:
+        """
+        Run a Forest ``wavefunction`` job, see :py:meth:`ForestConnection._wavefunction`.
+        """
+        return await self._call('_wavefunction', quil_program, random_seed)
+
+    async def _expectation(self, prep_prog, operator_programs, random_seed) -> np.ndarray:
+        """
+        Run a Forest ``expectation`` job, see :py:meth:`ForestConnection._expectation`.
+        """
+        return await self._call('_expectation', prep_prog, operator_programs, random_seed)
+
+    async def _qvm_run(self, quil_program, classical_addresses, trials,
+                       measurement_noise, gate_noise, random_seed) -> np.ndarray:
+        """
+        Run a Forest ``run`` job on a QVM, see :py:meth:`ForestConnection._qvm_run`.
+        """
+        return await self._call('_qvm_run', quil_program, classical_addresses, trials,
+                                measurement_noise, gate_noise, random_seed)
+
+    async def _quilc_compile(self, quil_program, isa, specs):
+        """
+        Send a quilc job to Forest, see :py:meth:`ForestConnection._quilc_compile`.
+        """
+        return await self._call('_quilc_compile', quil_program, isa, specs)
+
+    def close(self):
+        """
+        Stop the worker threads once the requests in flight are done.
+        """
+        self._executor.shutdown(wait=True)
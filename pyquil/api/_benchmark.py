@@ -13,6 +13,10 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
+import hashlib
+import os
+
+import numpy as np
 import rpcq
 from rpcq.core_messages import (RandomizedBenchmarkingRequest, RandomizedBenchmarkingResponse,
                                 ConjugateByCliffordRequest, ConjugateByCliffordResponse)
@@ -24,6 +28,21 @@ from pyquil.api._error_reporting import _record_call
 from pyquil.api._qac import AbstractBenchmarker
 from pyquil.paulis import PauliTerm
 from pyquil.quil import address_qubits, Program
+from pyquil.quilatom import Qubit
+from pyquil.quilbase import Gate
+from pyquil.stabilizer_simulator import StabilizerSimulator, _pauli_products
+
+
+# The Pauli with the given X and Z parts
+_PAULI_NAMES = {(False, False): "I", (True, False): "X", (True, True): "Y", (False, True): "Z"}
+
+# The sizes of the Clifford groups (up to phase) on one and two qubits
+_CLIFFORD_GROUP_ORDERS = {1: 24, 2: 11520}
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pyquil", "clifford_groups")
+"""
+Where :py:class:`PyBenchmarker` stores the Clifford groups it enumerates.
+"""
 
 
 class BenchmarkConnection(AbstractBenchmarker):
@@ -233,6 +252,238 @@ class LocalBenchmarkConnection(AbstractBenchmarker):
         return list(reversed(programs))
 
 
+class PyBenchmarker(AbstractBenchmarker):
+    """
+    Generates benchmarking data in process, without a connection to a server.
+
+    Cliffords are represented by their action on the Pauli group: the images of ``X`` and ``Z``
+    on every qubit, i.e. a symplectic matrix over GF(2) together with a sign per image.
+
+    To generate randomized benchmarking sequences, the one or two qubit Clifford group is
+    enumerated once per gateset, along with the shortest decomposition of every element into the
+    gateset. This takes a few seconds for two qubits, so the result is also stored in
+    ``cache_dir``.
+
+    :param random_seed: A seed for the random number generator.
+    :param cache_dir: The directory to store Clifford groups in, or None to not store them.
+    """
+    _clifford_groups = {}
+
+    @_record_call
+    def __init__(self, random_seed=None, cache_dir=DEFAULT_CACHE_DIR):
+        self.rs = np.random.RandomState(random_seed)
+        self.cache_dir = cache_dir
+
+    def _clifford_images(self, clifford, qubits):
+        """
+        Compute the images ``C X_q C^dagger`` and ``C Z_q C^dagger`` of a Clifford ``C``.
+
+        :param Program clifford: A Program that consists only of Clifford gates.
+        :param list qubits: The qubits to represent the Clifford on, in order.
+        :return: The x, z and sign parts of the images, each with ``2 * len(qubits)`` rows
+            ordered as ``X_0, Z_0, X_1, Z_1, ...``.
+        """
+        tableau = StabilizerSimulator(len(qubits), rs=self.rs)
+        for gate in _relabel(clifford, qubits):
+            tableau.do_gate(gate)
+        # The tableau starts out with destabilizers X_q and stabilizers Z_q
+        rows = np.arange(2 * len(qubits)).reshape(2, -1).T.ravel()
+        return tableau.x[rows], tableau.z[rows], tableau.r[rows, 0]
+
+    def apply_clifford_to_paulis(self, clifford, paulis):
+        """
+        Conjugate many PauliTerms by the same Clifford. See :py:meth:`apply_clifford_to_pauli`.
+
+        :param Program clifford: A Program that consists only of Clifford operations.
+        :param list paulis: PauliTerms to be acted on by clifford via conjugation.
+        :return: A list of PauliTerms, one for each of ``paulis``.
+        """
+        qubits = sorted(set(clifford.get_qubits()).union(*(p.get_qubits() for p in paulis)))
+        if not qubits:
+            return [PauliTerm("I", 0, pauli.coefficient) for pauli in paulis]
+        x_images, z_images, sign_images = self._clifford_images(clifford, qubits)
+
+        # Write each Pauli as i^(number of Ys) prod_q X_q^x_q Z_q^z_q and select the images of
+        # the factors
+        index = {q: i for i, q in enumerate(qubits)}
+        selected = np.zeros((len(paulis), 2 * len(qubits)), dtype=bool)
+        exponents = np.zeros(len(paulis), dtype=int)
+        for i, pauli in enumerate(paulis):
+            for qubit, op in pauli:
+                selected[i, 2 * index[qubit]] = op in ('X', 'Y')
+                selected[i, 2 * index[qubit] + 1] = op in ('Z', 'Y')
+                exponents[i] += op == 'Y'
+        x, z, product_exponents = _pauli_products(x_images & selected[:, :, None],
+                                                  z_images & selected[:, :, None])
+        exponents += product_exponents + 2 * np.count_nonzero(selected & sign_images, axis=1)
+
+        results = []
+        for i, pauli in enumerate(paulis):
+            pauli_out = PauliTerm("I", 0, 1.j ** (exponents[i] % 4))
+            for q, qubit in enumerate(qubits):
+                op = _PAULI_NAMES[x[i, q], z[i, q]]
+                if op != "I":
+                    pauli_out *= PauliTerm(op, qubit)
+            results.append(pauli_out * pauli.coefficient)
+        return results
+
+    def apply_clifford_to_pauli(self, clifford, pauli_in):
+        r"""
+        Given a circuit that consists only of elements of the Clifford group,
+        return its action on a PauliTerm.
+
+        In particular, for Clifford C, and Pauli P, this returns the PauliTerm
+        representing CPC^{\dagger}.
+
+        :param Program clifford: A Program that consists only of Clifford operations.
+        :param PauliTerm pauli_in: A PauliTerm to be acted on by clifford via conjugation.
+        :return: A PauliTerm corresponding to clifford * pauli_in * clifford^{\dagger}
+        """
+        return self.apply_clifford_to_paulis(clifford, [pauli_in])[0]
+
+    def _clifford_group(self, gates):
+        """
+        Look up, load or enumerate the Clifford group generated by ``gates``.
+
+        :param list gates: Gates on the qubits ``0 .. n - 1``.
+        :return: The group as a tuple of
+
+            - the decomposition of each element, as a list of indices into ``gates``. Element 0
+              is the identity.
+            - the element obtained by applying each gate after each element, as a list of lists.
+            - the inverse of each element.
+        """
+        gateset_key = Program(gates).out()
+        if gateset_key in self._clifford_groups:
+            return self._clifford_groups[gateset_key]
+
+        path = None
+        if self.cache_dir is not None:
+            digest = hashlib.sha256(gateset_key.encode('utf-8')).hexdigest()
+            path = os.path.join(self.cache_dir, "clifford-group-{}.npz".format(digest))
+        if path is not None and os.path.exists(path):
+            with np.load(path) as data:
+                words = [[g for g in word if g >= 0] for word in data['words'].tolist()]
+                group = words, data['transitions'].tolist(), data['inverses'].tolist()
+        else:
+            group = _enumerate_clifford_group(gates)
+            if path is not None:
+                words, transitions, inverses = group
+                padded = np.full((len(words), max(map(len, words))), -1, dtype=np.int16)
+                for i, word in enumerate(words):
+                    padded[i, :len(word)] = word
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # Write to a temporary file first so that concurrent processes never see a
+                # partial file
+                temporary_path = "{}.{}.tmp".format(path, os.getpid())
+                with open(temporary_path, 'wb') as f:
+                    np.savez(f, words=padded, transitions=np.array(transitions, dtype=np.int32),
+                             inverses=np.array(inverses, dtype=np.int32))
+                os.replace(temporary_path, path)
+        self._clifford_groups[gateset_key] = group
+        return group
+
+    @_record_call
+    def generate_rb_sequence(self, depth, gateset, seed=None):
+        """
+        Construct a randomized benchmarking experiment on the given qubits, decomposing into
+        gateset.
+
+        The sequence consists of ``depth - 1`` uniformly random Cliffords followed by the Clifford
+        that inverts them.
+
+        :param int depth: The number of Clifford gates to include in the randomized benchmarking
+         experiment. This is different than the number of gates in the resulting experiment.
+        :param list gateset: A list of pyquil gates on one or two qubits to decompose the Clifford
+         elements into. These must generate the clifford group on the qubits of interest. e.g. for
+         one qubit [RZ(np.pi/2), RX(np.pi/2)].
+        :param int seed: A seed for the random generation of the gate sequence. Defaults to
+         using this benchmarker's random number generator.
+        :return: A list of pyquil programs. Each pyquil program is a circuit that represents an
+         element of the Clifford group. When these programs are composed, the resulting Program
+         will be the randomized benchmarking experiment of the desired depth. e.g. if the return
+         programs are called cliffords then `sum(cliffords, Program())` will give the randomized
+         benchmarking experiment, which will compose to the identity program.
+        """
+        if depth < 1:
+            raise ValueError("The depth of a randomized benchmarking sequence must be at least 1")
+        gateset_as_program = address_qubits(sum(gateset, Program()))
+        qubits = sorted(gateset_as_program.get_qubits())
+        if len(qubits) not in _CLIFFORD_GROUP_ORDERS:
+            raise ValueError("PyBenchmarker only generates sequences on one or two qubits")
+        words, transitions, inverses = self._clifford_group(
+            _relabel(gateset_as_program, qubits))
+
+        rs = np.random.RandomState(seed) if seed is not None else self.rs
+        sequence = rs.randint(len(words), size=depth - 1).tolist()
+        element = 0
+        for clifford in sequence:
+            for g in words[clifford]:
+                element = transitions[element][g]
+        sequence.append(inverses[element])
+        return [Program([gateset[g] for g in words[clifford]]) for clifford in sequence]
+
+
+def _relabel(program, qubits):
+    """
+    :return: The gates of a program with the qubits relabeled to their positions in ``qubits``.
+    :rtype: List[Gate]
+    """
+    index = {q: i for i, q in enumerate(qubits)}
+    gates = []
+    for instr in program:
+        if not isinstance(instr, Gate):
+            raise ValueError("{} is not a Clifford gate".format(instr))
+        gates.append(Gate(instr.name, instr.params, [Qubit(index[q.index]) for q in instr.qubits]))
+    return gates
+
+
+def _enumerate_clifford_group(gates):
+    """
+    Enumerate the Clifford group generated by some gates by breadth-first search, which finds the
+    shortest decomposition of each element. See :py:meth:`PyBenchmarker._clifford_group`.
+    """
+    n_qubits = 1 + max(q.index for gate in gates for q in gate.qubits)
+
+    def key(tableau):
+        return np.packbits(np.hstack([tableau.x, tableau.z, tableau.r])).tobytes()
+
+    tableaus = [StabilizerSimulator(n_qubits)]
+    elements = {key(tableaus[0]): 0}
+    words = [[]]
+    parents = [None]
+    transitions = []
+    for element, (tableau, word) in enumerate(zip(tableaus, words)):
+        transitions.append([])
+        for g, gate in enumerate(gates):
+            new = tableau.copy().do_gate(gate)
+            new_key = key(new)
+            if new_key not in elements:
+                elements[new_key] = len(tableaus)
+                tableaus.append(new)
+                words.append(word + [g])
+                parents.append(element)
+            transitions[-1].append(elements[new_key])
+    if len(tableaus) != _CLIFFORD_GROUP_ORDERS[n_qubits]:
+        raise ValueError("The gateset generates {} elements instead of the {} of the Clifford "
+                         "group".format(len(tableaus), _CLIFFORD_GROUP_ORDERS[n_qubits]))
+
+    gate_inverses = []
+    for gate in gates:
+        tableau = StabilizerSimulator(n_qubits)
+        for inverse_gate in Program(gate).dagger():
+            tableau.do_gate(inverse_gate)
+        gate_inverses.append(elements[key(tableau)])
+    # If element e is element p followed by gate g, its inverse is g^-1 followed by p^-1
+    inverses = [0]
+    for parent, word in zip(parents[1:], words[1:]):
+        element = gate_inverses[word[-1]]
+        for g in words[inverses[parent]]:
+            element = transitions[element][g]
+        inverses.append(element)
+    return words, transitions, inverses
+
+
 def get_benchmarker(endpoint: str = None):
     """
     Retrieve an instance of the appropriate AbstractBenchmarker subclass for a given endpoint.
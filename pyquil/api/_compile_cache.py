@@ -0,0 +1,242 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+"""
+A cache of compiler results, keyed on the content of the compiled program and on the target
+device.
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+from collections import namedtuple
+
+from pyquil._lru_cache import LRUCache
+from pyquil.api._config import PyquilConfig
+from pyquil.api._error_reporting import _record_call
+from pyquil.api._qac import AbstractCompiler
+from pyquil.quil import Program
+
+_log = logging.getLogger(__name__)
+
+CompileCacheInfo = namedtuple('CompileCacheInfo',
+                              ['hits', 'disk_hits', 'misses', 'maxsize', 'currsize'])
+
+
+class CompileCache(LRUCache):
+    """
+    A cache of compiled programs, kept in memory in a bounded least-recently-used table and
+    optionally also on disk, so that it persists across processes.
+
+    Entries are stored under hex string keys, see :py:class:`CachingCompiler`. Entries found on
+    disk are loaded into memory. Entries that cannot be pickled are only kept in memory.
+
+    :param int maxsize: The maximum number of entries to keep in memory. A size of 0 disables the
+        cache, including the entries on disk.
+    :param cache_dir: The directory to store entries in, or None to not store them on disk.
+    """
+
+    def __init__(self, maxsize=128, cache_dir=None):
+        self.cache_dir = cache_dir
+        self.disk_hits = 0
+        super().__init__(maxsize)
+
+    def get(self, key):
+        """
+        Look up the entry stored under ``key``, updating the hit and miss counters.
+
+        :param str key: The key of the entry.
+        :return: The entry, or None
+        """
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+
+        value = self._load(key)
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.disk_hits += 1
+                self._insert(key, value)
+        return value
+
+    def put(self, key, value):
+        """
+        Store ``value`` under ``key``.
+        """
+        super().put(key, value)
+        self._store(key, value)
+
+    def invalidate(self, key):
+        """
+        Remove the entry stored under ``key``, if any, from memory and from disk.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+        path = self._path(key)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def clear(self, disk=True):
+        """
+        Remove all entries and reset the statistics.
+
+        :param bool disk: Whether to also remove the entries stored on disk.
+        """
+        super().clear()
+        self.disk_hits = 0
+        if disk and self.cache_dir is not None and os.path.isdir(self.cache_dir):
+            for filename in os.listdir(self.cache_dir):
+                if filename.endswith('.pkl'):
+                    os.remove(os.path.join(self.cache_dir, filename))
+
+    def cache_info(self):
+        """
+        :return: the hit (in memory and on disk) and miss counts, the maximum size and the current
+            size of the in-memory table
+        :rtype: CompileCacheInfo
+        """
+        with self._lock:
+            return CompileCacheInfo(self.hits, self.disk_hits, self.misses, self.maxsize,
+                                    len(self._entries))
+
+    @property
+    def hit_rate(self):
+        """
+        The fraction of lookups which were answered from memory or from disk.
+        """
+        lookups = self.hits + self.disk_hits + self.misses
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+    def _path(self, key):
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, "{}.pkl".format(key))
+
+    def _load(self, key):
+        path = self._path(key)
+        if path is None or self._maxsize == 0 or not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError) as e:
+            _log.warning("Ignoring unreadable compile cache entry %s: %s", path, e)
+            return None
+
+    def _store(self, key, value):
+        path = self._path(key)
+        if path is None or self._maxsize == 0:
+            return
+        try:
+            data = pickle.dumps(value)
+        except (pickle.PicklingError, TypeError, AttributeError) as e:
+            _log.debug("Not storing compile cache entry %s on disk: %s", key, e)
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temporary file first so that concurrent processes never see a partial file
+        temporary_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(temporary_path, 'wb') as f:
+            f.write(data)
+        os.replace(temporary_path, path)
+
+
+compile_cache = CompileCache(cache_dir=PyquilConfig().compile_cache_dir)
+"""
+The cache used by ``get_qc(..., compile_cache=True)``. It is stored on disk if the
+``PYQUIL_COMPILE_CACHE_DIR`` environment variable or the ``compile_cache_dir`` entry of the
+``[Rigetti Forest]`` section of ``~/.forest_config`` names a directory.
+"""
+
+
+def _target_device_dict(compiler):
+    """
+    Extract the description of the device a compiler targets, so that it can be part of the keys
+    of its results.
+    """
+    if hasattr(compiler, 'target_device'):
+        return {'isa': compiler.target_device.isa, 'specs': compiler.target_device.specs}
+    if hasattr(compiler, 'isa'):
+        specs = compiler.specs.to_dict() if compiler.specs is not None else None
+        return {'isa': compiler.isa.to_dict(), 'specs': specs}
+    return None
+
+
+class CachingCompiler(AbstractCompiler):
+    """
+    Wraps a compiler (e.g. a :py:class:`QPUCompiler`, :py:class:`QVMCompiler` or
+    :py:class:`LocalQVMCompiler`) so that compiling a program that was compiled before returns
+    the earlier result instead of calling the compiler again.
+
+    Results are keyed on the program's :py:meth:`~pyquil.quil.Program.fingerprint` and number of
+    shots, the compilation stage, and the type, target ISA and specs of the wrapped compiler, so
+    one cache can be shared by compilers for different devices. Programs are handed out as copies.
+    Other attributes are looked up on the wrapped compiler.
+
+    :param compiler: The compiler to wrap.
+    :param CompileCache cache: The cache to use. Defaults to a new in-memory cache.
+    """
+
+    @_record_call
+    def __init__(self, compiler, cache=None):
+        self.compiler = compiler
+        self.cache = cache if cache is not None else CompileCache()
+        target = json.dumps({'compiler': type(compiler).__name__,
+                             'target_device': _target_device_dict(compiler)},
+                            sort_keys=True, default=str)
+        self._target_digest = hashlib.sha256(target.encode('utf-8')).hexdigest()
+
+    def _key(self, stage, program):
+        key = "{}:{}:{}:{}".format(stage, self._target_digest, program.fingerprint(),
+                                   program.num_shots)
+        return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+    def _cached(self, stage, program, compile_):
+        key = self._key(stage, program)
+        result = self.cache.get(key)
+        if result is None:
+            result = compile_(program)
+            self.cache.put(key, result.copy() if isinstance(result, Program) else result)
+            return result
+        return result.copy() if isinstance(result, Program) else result
+
+    @_record_call
+    def quil_to_native_quil(self, program: Program) -> Program:
+        return self._cached('quil_to_native_quil', program, self.compiler.quil_to_native_quil)
+
+    @_record_call
+    def native_quil_to_executable(self, nq_program: Program):
+        return self._cached('native_quil_to_executable', nq_program,
+                            self.compiler.native_quil_to_executable)
+
+    def invalidate(self, program):
+        """
+        Forget the results of compiling ``program`` with this compiler, so that it is compiled
+        again. Use ``self.cache.clear()`` to forget everything.
+
+        :param Program program: The program (or native Quil program) to forget.
+        """
+        for stage in ('quil_to_native_quil', 'native_quil_to_executable'):
+            self.cache.invalidate(self._key(stage, program))
+
+    def __getattr__(self, name):
+        # Only called for attributes not found on self, e.g. the wrapped compiler's shim
+        if name == 'compiler':
+            raise AttributeError(name)
+        return getattr(self.compiler, name)
@@ -211,7 +211,7 @@ class LocalQVMCompiler(AbstractCompiler):
     def quil_to_native_quil(self, program: Program) -> Program:
         response = self._connection._quilc_compile(program, self.isa, self.specs)
 
-        compiled_program = Program(response['compiled-quil'])
+        compiled_program = parse_program(response['compiled-quil'])
         compiled_program.native_quil_metadata = response['metadata']
         compiled_program.num_shots = program.num_shots
 
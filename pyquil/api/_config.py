@@ -89,6 +89,22 @@ class PyquilConfig(object):
         "default": "http://127.0.0.1:6000"
     }
 
+    COMPILE_CACHE_DIR = {
+        "env": "PYQUIL_COMPILE_CACHE_DIR",
+        "file": FOREST_CONFIG,
+        "section": "Rigetti Forest",
+        "name": "compile_cache_dir",
+        "default": None
+    }
+
+    HTTP_POOL_SIZE = {
+        "env": "PYQUIL_HTTP_POOL_SIZE",
+        "file": FOREST_CONFIG,
+        "section": "Rigetti Forest",
+        "name": "http_pool_size",
+        "default": "10"
+    }
+
     def __init__(self):
         self.configparsers = {}
         for env_name, default_path in CONFIG_PATHS.items():
@@ -144,3 +160,11 @@ class PyquilConfig(object):
     @property
     def compiler_url(self):
         return self._env_or_config_or_default(**self.COMPILER_URL)
+
+    @property
+    def compile_cache_dir(self):
+        return self._env_or_config_or_default(**self.COMPILE_CACHE_DIR)
+
+    @property
+    def http_pool_size(self):
+        return int(self._env_or_config_or_default(**self.HTTP_POOL_SIZE))
@@ -16,14 +16,15 @@
 """
 Module for automatically generating error reports helpful for diagnosing pyQuil errors.
 
-IMPORTANT NOTE: THIS MODULE USES GLOBAL STATE AND IS NOT ESPECIALLY THREAD-SAFE.
-                If your threaded code is experiencing pyQuil errors, you'll have to track
-                your own state and not use this convenient decorator.
+The call log is global state shared by all threads. Access to it is serialized by a lock, so
+functions decorated with :py:func:`_record_call` can be called from many threads at once, but
+the calls of all threads are interleaved in the reports.
 """
 import os
 import sys
 import json
 import inspect
+import threading
 from datetime import datetime, date
 from dataclasses import dataclass
 import dataclasses
@@ -137,6 +138,14 @@ class ErrorContext(object):
 
     log: Dict[CallLogKey, CallLogValue] = {}
     filename = "pyquil_error.log"
+    lock = threading.Lock()
+
+    def record(self, key, value):
+        """
+        Store an entry in the call log.
+        """
+        with self.lock:
+            self.log[key] = value
 
     def generate_report(self, exception, trace):
         """
@@ -159,11 +168,17 @@ class ErrorContext(object):
                              timestamp=datetime.utcnow(),
                              exception=exception,
                              system_info=system_info,
-                             call_log=flatten_log(self.log))
+                             call_log=flatten_log(self._log_snapshot()))
 
         return report
 
-    def dump_error(self, exception, trace):
+    def _log_snapshot(self):
+        with self.lock:
+            return dict(self.log)
+
+    def dump_error(self, exception, trace, filename=None):
+        if filename is None:
+            filename = self.filename
         warn_msg = """
 >>> PYQUIL_PROTECT <<<
 An uncaught exception was raised in a function wrapped in pyquil_protect.  We are writing out a
@@ -172,14 +187,14 @@ log file to "{}".
 Along with a description of what you were doing when the error occurred, send this file to
 Rigetti Computing support by email at support@rigetti.com for assistance.
 >>> PYQUIL_PROTECT <<<
-""".format(os.path.abspath(self.filename))
+""".format(os.path.abspath(filename))
 
         _log.warning(warn_msg)
 
         report = self.generate_report(exception, trace)
 
         # overwrite any existing log file
-        fh = open(self.filename, "w")
+        fh = open(filename, "w")
         fh.write(json.dumps(report, default=json_serialization_helper))
         fh.close()
 
@@ -195,16 +210,10 @@ def pyquil_protect(func, log_filename="pyquil_error.log"):
     def pyquil_protect_wrapper(*args, **kwargs):
         global global_error_context
 
-        old_filename = global_error_context.filename
-        global_error_context.filename = log_filename
-
         try:
-            val = func(*args, **kwargs)
-            global_error_context.filename = old_filename
-            return val
+            return func(*args, **kwargs)
         except Exception as e:
-            global_error_context.dump_error(e, inspect.trace())
-            global_error_context.filename = old_filename
+            global_error_context.dump_error(e, inspect.trace(), filename=log_filename)
             raise
 
     return pyquil_protect_wrapper
@@ -229,7 +238,7 @@ def _record_call(func):
         pre_entry = CallLogValue(timestamp_in=datetime.utcnow(),
                                  timestamp_out=None,
                                  return_value=None)
-        global_error_context.log[key] = pre_entry
+        global_error_context.record(key, pre_entry)
 
         val = func(*args, **kwargs)
 
@@ -237,7 +246,7 @@ def _record_call(func):
         post_entry = CallLogValue(timestamp_in=pre_entry.timestamp_in,
                                   timestamp_out=datetime.utcnow(),
                                   return_value=serialize_object_for_logging(val))
-        global_error_context.log[key] = post_entry
+        global_error_context.record(key, post_entry)
 
         return val
 
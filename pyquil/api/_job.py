@@ -74,8 +74,7 @@ class Job(object):
                 raise UnknownApiError(self._raw['result'])
 
         if self._raw['program']['type'] == 'wavefunction':
-            return Wavefunction.from_bit_packed_string(
-                base64.b64decode(self._raw['result']), self._raw['program']['addresses'])
+            return Wavefunction.from_bit_packed_string(base64.b64decode(self._raw['result']))
         elif self._raw['program']['type'] in ['multishot', 'multishot-measure', 'expectation']:
             return np.asarray(self._raw['result'])
         else:
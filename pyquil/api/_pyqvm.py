@@ -0,0 +1,373 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+from abc import ABC, abstractmethod
+
+import numpy as np
+from rpcq.core_messages import PyQuilExecutableResponse
+from six import integer_types
+
+from pyquil.api._compiler import _extract_program_from_pyquil_executable_response
+from pyquil.api._error_reporting import _record_call
+from pyquil.api._qam import QAM, QAMError
+from pyquil.gate_matrices import QUANTUM_GATES
+from pyquil.noise import _parse_pragma_matrix, apply_noise_model
+from pyquil.quil import Program
+from pyquil.quilatom import Expression, MemoryReference, Qubit, substitute, substitute_array
+from pyquil.quilbase import (Declare, DefGate, Gate, Halt, Measurement, Nop, Pragma, Reset,
+                             ResetQubit, Wait)
+from pyquil.slot import Slot
+
+# The kinds of operations a program is compiled into, see PyQVM._compile
+_GATE = 'gate'
+_GATE_MATRIX = 'gate_matrix'
+_MEASURE = 'measure'
+_RESET_QUBIT = 'reset_qubit'
+_RESET = 'reset'
+_KRAUS = 'kraus'
+
+
+class AbstractQuantumSimulator(ABC):
+    """
+    The interface between :py:class:`PyQVM` and the object which actually keeps track of the
+    quantum state. Qubits are always numbered ``0 .. n_qubits - 1``.
+    """
+
+    @abstractmethod
+    def __init__(self, n_qubits, rs=None):
+        """
+        :param n_qubits: The number of qubits to simulate.
+        :param rs: A ``np.random.RandomState`` to use for all randomness.
+        """
+
+    @abstractmethod
+    def reset(self):
+        """
+        Reset all qubits to the zero state.
+        """
+
+    @abstractmethod
+    def do_gate(self, gate):
+        """
+        Apply a standard gate, given as a :py:class:`Gate` with numeric parameters.
+        """
+
+    @abstractmethod
+    def do_gate_matrix(self, matrix, qubits):
+        """
+        Apply a gate given by its matrix to the given qubits.
+        """
+
+    def do_kraus(self, kraus_ops, qubits):
+        """
+        Apply a channel given by its Kraus operators to the given qubits.
+        """
+        raise NotImplementedError("{} does not support noisy gates. Please use a "
+                                  "DensityMatrixSimulator".format(type(self).__name__))
+
+    @abstractmethod
+    def do_measurement(self, qubit):
+        """
+        Measure a qubit, collapsing the state, and return the outcome.
+        """
+
+    @abstractmethod
+    def sample_bitstrings(self, n_samples, qubits=None):
+        """
+        Sample measurement outcomes of the given qubits without changing the state.
+        """
+
+    @abstractmethod
+    def expectation(self, operator):
+        """
+        Compute the expectation value of a PauliTerm or PauliSum.
+        """
+
+
+class PyQVM(QAM):
+    @_record_call
+    def __init__(self, n_qubits=None, quantum_simulator_type=None, random_seed=None,
+                 noise_model=None):
+        """
+        A QAM which simulates Quil programs in this process instead of sending them to a QVM
+        server.
+
+        It executes protoquil (gates on numeric or memory-reference parameters, including
+        ``DEFGATE`` gates), ``MEASURE``, ``RESET``, ``DECLARE`` and ``HALT``. Like the QVM, it
+        understands the noise pragmas emitted by :py:meth:`Program.define_noisy_gate`,
+        :py:meth:`Program.define_noisy_readout` and :py:func:`~pyquil.noise.apply_noise_model`:
+
+        - ``PRAGMA ADD-KRAUS`` replaces a gate on specific qubits by a Kraus map, unless the gate
+          is preceded by ``PRAGMA NO-NOISE``. This needs a simulator which supports Kraus maps,
+          such as :py:class:`~pyquil.numpy_simulator.DensityMatrixSimulator`.
+        - ``PRAGMA READOUT-POVM`` flips the reported outcome of measuring a qubit with the given
+          assignment probabilities.
+
+        Other pragmas are ignored. When all measurements come after the last gate, the state is
+        simulated once and all shots are sampled from it; otherwise every shot is simulated
+        separately.
+
+        :param n_qubits: The maximum number of qubits a program may use, or None for no limit.
+            The simulator only allocates as many qubits as the program actually uses.
+        :param quantum_simulator_type: A subclass of :py:class:`AbstractQuantumSimulator`.
+            Defaults to :py:class:`~pyquil.numpy_simulator.NumpyWavefunctionSimulator`.
+        :param random_seed: A seed for the random number generator. Either None (for an
+            automatically generated seed) or a non-negative integer. As with the QVM, every run
+            with the same seed produces the same results.
+        :param noise_model: A noise model to apply to every program, see
+            :py:func:`~pyquil.noise.apply_noise_model`. If given, the simulator defaults to a
+            :py:class:`~pyquil.numpy_simulator.DensityMatrixSimulator`.
+        """
+        super().__init__()
+
+        if quantum_simulator_type is None:
+            from pyquil.numpy_simulator import DensityMatrixSimulator, NumpyWavefunctionSimulator
+            if noise_model is None:
+                quantum_simulator_type = NumpyWavefunctionSimulator
+            else:
+                quantum_simulator_type = DensityMatrixSimulator
+
+        if random_seed is None:
+            self.random_seed = None
+        elif isinstance(random_seed, integer_types) and random_seed >= 0:
+            self.random_seed = random_seed
+        else:
+            raise TypeError("random_seed should be None or a non-negative int")
+
+        self.n_qubits = n_qubits
+        self.quantum_simulator_type = quantum_simulator_type
+        self.noise_model = noise_model
+        self.rs = None
+        self.ram = {}
+        self.wf_simulator = None
+
+    @_record_call
+    def run(self):
+        """
+        Run the loaded program ``num_shots`` times and store the contents of ``ro`` after each
+        shot, see :py:meth:`QAM.read_from_memory_region`.
+        """
+        super().run()
+
+        if isinstance(self._executable, PyQuilExecutableResponse):
+            quil_program = _extract_program_from_pyquil_executable_response(self._executable)
+        elif isinstance(self._executable, Program):
+            quil_program = self._executable
+        else:
+            raise TypeError("The executable must be a PyQuilExecutableResponse or a Program.")
+        trials = quil_program.num_shots
+        if self.noise_model is not None:
+            quil_program = apply_noise_model(quil_program, self.noise_model)
+
+        # Only simulate the qubits which are actually used
+        qubits = sorted(quil_program.get_qubits(indices=True))
+        if self.n_qubits is not None and len(qubits) > self.n_qubits:
+            raise ValueError("The program uses {} qubits but this PyQVM only has {}"
+                             .format(len(qubits), self.n_qubits))
+        axes = {qubit: axis for axis, qubit in enumerate(qubits)}
+
+        self.ram = self._initial_memory(quil_program)
+        ops = self._compile(quil_program, axes)
+        self.rs = np.random.RandomState(self.random_seed)
+        self.wf_simulator = self.quantum_simulator_type(len(qubits), rs=self.rs)
+        self._bitstrings = self._run_shots(ops, trials)
+        return self
+
+    def execute(self, program, n_qubits=0):
+        """
+        Run a program once, leaving the final state in :py:attr:`wf_simulator` and the final
+        memory in :py:attr:`ram`. Unlike :py:meth:`run`, qubit ``i`` of the program is qubit
+        ``i`` of the simulator.
+
+        :param Program program: The program to execute.
+        :param int n_qubits: The minimum number of qubits to simulate. The simulator always
+            covers all qubits up to the largest one used by the program.
+        :return: This object.
+        """
+        n_qubits = max([n_qubits] + [q + 1 for q in program.get_qubits(indices=True)])
+        self.ram = self._initial_memory(program)
+        ops = self._compile(program, {q: q for q in range(n_qubits)})
+        self.rs = np.random.RandomState(self.random_seed)
+        self.wf_simulator = self.quantum_simulator_type(n_qubits, rs=self.rs)
+        self._execute(ops)
+        return self
+
+    def _initial_memory(self, program):
+        """
+        Allocate the declared memory regions and fill in the values from ``write_memory``.
+        """
+        ram = {}
+        for instr in program.instructions:
+            if isinstance(instr, Declare):
+                dtype = float if instr.memory_type == 'REAL' else int
+                ram[instr.name] = np.zeros(instr.memory_size, dtype=dtype)
+
+        for aref, value in self._variables_shim.items():
+            if aref.name not in ram or not 0 <= aref.index < len(ram[aref.name]):
+                raise QAMError("{}[{}] has not been declared".format(aref.name, aref.index))
+            ram[aref.name][aref.index] = value
+        return ram
+
+    def _compile(self, program, axes):
+        """
+        Turn a program into a list of ``(kind, args)`` operations with all parameters evaluated
+        and all qubits replaced by simulator axes, so that shots only do the simulation itself.
+        """
+        memory = {MemoryReference(name, offset): value
+                  for name, values in self.ram.items()
+                  for offset, value in enumerate(values.tolist())}
+        defined_gates = {defgate.name: defgate for defgate in program.defined_gates}
+        kraus_maps, readout_povms = _noise_pragmas(program)
+
+        ops = []
+        no_noise = False
+        for instr in program.instructions:
+            if isinstance(instr, Gate):
+                params = [_evaluate(param, memory) for param in instr.params]
+                qubits = [axes[q.index] for q in instr.qubits]
+                kraus_ops = kraus_maps.get((instr.name, tuple(q.index for q in instr.qubits)))
+                if kraus_ops is not None and not no_noise:
+                    # Kraus operators put the first qubit in the least significant bit
+                    ops.append((_KRAUS, (kraus_ops, qubits[::-1])))
+                elif instr.name in defined_gates:
+                    ops.append((_GATE_MATRIX, (_defgate_matrix(defined_gates[instr.name], params),
+                                               qubits)))
+                elif instr.name in QUANTUM_GATES:
+                    ops.append((_GATE, (Gate(instr.name, params, [Qubit(q) for q in qubits]),)))
+                else:
+                    raise ValueError("Unknown gate {}".format(instr.name))
+                no_noise = False
+            elif isinstance(instr, Pragma) and instr.command == 'NO-NOISE':
+                no_noise = True
+            elif isinstance(instr, Measurement):
+                target = instr.classical_reg
+                if target is not None:
+                    if target.name not in self.ram or target.offset >= len(self.ram[target.name]):
+                        raise QAMError("{} has not been declared".format(target))
+                    target = (target.name, target.offset)
+                ops.append((_MEASURE, (axes[instr.qubit.index], target,
+                                       readout_povms.get(instr.qubit.index))))
+            elif isinstance(instr, ResetQubit):
+                # Qubits which nothing else acts on are not simulated and always in |0>
+                if instr.qubit.index in axes:
+                    ops.append((_RESET_QUBIT, (axes[instr.qubit.index],)))
+            elif isinstance(instr, Reset):
+                ops.append((_RESET, ()))
+            elif isinstance(instr, Halt):
+                break
+            elif not isinstance(instr, (Declare, DefGate, Pragma, Wait, Nop)):
+                raise ValueError("PyQVM cannot execute {}".format(instr))
+        return ops
+
+    def _execute(self, ops):
+        """
+        Execute one shot of compiled operations on the current simulator.
+        """
+        simulator = self.wf_simulator
+        for kind, args in ops:
+            if kind == _GATE:
+                simulator.do_gate(*args)
+            elif kind == _GATE_MATRIX:
+                simulator.do_gate_matrix(*args)
+            elif kind == _KRAUS:
+                simulator.do_kraus(*args)
+            elif kind == _MEASURE:
+                qubit, target, povm = args
+                outcome = simulator.do_measurement(qubit)
+                if povm is not None:
+                    outcome = int(self.rs.uniform() < povm[1, outcome])
+                if target is not None:
+                    self.ram[target[0]][target[1]] = outcome
+            elif kind == _RESET_QUBIT:
+                if simulator.do_measurement(*args):
+                    simulator.do_gate(Gate('X', [], [Qubit(args[0])]))
+            elif kind == _RESET:
+                simulator.reset()
+
+    def _run_shots(self, ops, trials):
+        """
+        :return: The contents of ``ro`` after each shot, as an array of shape
+            ``(trials, len(ro))``.
+        """
+        ro_size = len(self.ram['ro']) if 'ro' in self.ram else 0
+        bitstrings = np.zeros((trials, ro_size), dtype=int)
+
+        n_gates = next((i for i, (kind, _) in enumerate(ops)
+                        if kind not in (_GATE, _GATE_MATRIX, _KRAUS)), len(ops))
+        if all(kind == _MEASURE for kind, _ in ops[n_gates:]):
+            # Only measurements at the end: all shots sample from the same final state
+            self._execute(ops[:n_gates])
+            measured = sorted({qubit for _, (qubit, _, _) in ops[n_gates:]})
+            samples = self.wf_simulator.sample_bitstrings(trials, measured)
+            for _, (qubit, target, povm) in ops[n_gates:]:
+                outcomes = samples[:, measured.index(qubit)]
+                if povm is not None:
+                    outcomes = (self.rs.uniform(size=trials) < povm[1, outcomes]).astype(int)
+                if target is not None and target[0] == 'ro':
+                    bitstrings[:, target[1]] = outcomes
+            return bitstrings
+
+        initial_ram = self.ram
+        for trial in range(trials):
+            self.ram = {name: values.copy() for name, values in initial_ram.items()}
+            self.wf_simulator.reset()
+            self._execute(ops)
+            if ro_size:
+                bitstrings[trial] = self.ram['ro']
+        return bitstrings
+
+
+def _evaluate(param, memory):
+    """
+    Evaluate a gate parameter, looking up memory references in ``memory``.
+    """
+    if isinstance(param, Slot):
+        return param.value()
+    value = substitute(param, memory)
+    if isinstance(value, Expression):
+        raise ValueError("Cannot evaluate the parameter {}".format(param))
+    return value
+
+
+def _noise_pragmas(program):
+    """
+    Collect the ``ADD-KRAUS`` and ``READOUT-POVM`` pragmas of a program. As on the QVM, they apply
+    to the whole program, regardless of where they appear.
+
+    :return: A dict mapping ``(gate name, qubit indices)`` to Kraus operators and a dict mapping
+        qubit indices to assignment probability matrices.
+    """
+    kraus_maps = {}
+    readout_povms = {}
+    for instr in program.instructions:
+        if not isinstance(instr, Pragma):
+            continue
+        if instr.command == 'ADD-KRAUS':
+            key = (str(instr.args[0]), tuple(int(str(q)) for q in instr.args[1:]))
+            kraus_maps.setdefault(key, []).append(_parse_pragma_matrix(instr.freeform_string))
+        elif instr.command == 'READOUT-POVM':
+            povm = np.real(_parse_pragma_matrix(instr.freeform_string))
+            readout_povms[int(str(instr.args[0]))] = povm
+    return kraus_maps, readout_povms
+
+
+def _defgate_matrix(defgate, params):
+    """
+    :return: The matrix of a DEFGATE with the given parameter values.
+    """
+    if not defgate.parameters:
+        return defgate.matrix
+    matrix = substitute_array(defgate.matrix, dict(zip(defgate.parameters, params)))
+    return matrix.astype(complex)
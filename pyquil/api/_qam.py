@@ -13,6 +13,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
+import asyncio
 from abc import ABC, abstractmethod
 
 from rpcq.core_messages import ParameterAref
@@ -85,6 +86,18 @@ class QAM(ABC):
 
         return self
 
+    async def run_async(self, executor=None):
+        """
+        Run the loaded Quil program without blocking the event loop, by calling :py:meth:`run`
+        in ``executor``.
+
+        :param executor: A :py:class:`concurrent.futures.Executor`, or None for the event loop's
+            default executor.
+        """
+        loop = asyncio.get_event_loop()
+        await loop.run_in_executor(executor, self.run)
+        return self
+
     @_record_call
     def wait(self):
         """
@@ -13,7 +13,14 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
+import asyncio
+import copy
+import functools
+import hashlib
+import itertools
 import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from math import pi
 from typing import List
 
@@ -21,11 +28,14 @@ import networkx as nx
 import numpy as np
 from rpcq.core_messages import BinaryExecutableResponse
 
+from pyquil.api import _compile_cache
+from pyquil.api._compile_cache import CachingCompiler, CompileCache
 from pyquil.api._compiler import QVMCompiler, QPUCompiler, LocalQVMCompiler
 from pyquil.api._config import PyquilConfig
 from pyquil.api._devices import get_device, get_lattice
 from pyquil.api._error_reporting import _record_call
 from pyquil.api._qac import AbstractCompiler
+from pyquil.api._pyqvm import PyQVM
 from pyquil.api._qam import QAM
 from pyquil.api._qpu import QPU
 from pyquil.api._qvm import ForestConnection, QVM
@@ -33,10 +43,16 @@ from pyquil.device import AbstractDevice, NxDevice, gates_in_isa
 from pyquil.gates import RX, MEASURE
 from pyquil.noise import decoherence_noise_with_asymmetric_ro
 from pyquil.quil import Program
-from pyquil.quilbase import Measurement, Pragma, Gate, Reset
+from pyquil.quilatom import MemoryReference
+from pyquil.quilbase import Declare, Measurement, Pragma, Gate, Reset
 
 pyquil_config = PyquilConfig()
 
+PARAMETRIC_CACHE_SIZE = 128
+"""
+The number of programs :py:meth:`QuantumComputer.compile_parametric` keeps compiled.
+"""
+
 
 def _get_flipped_protoquil_program(program: Program) -> Program:
     """For symmetrization, generate a program where X gates are added before measurement.
@@ -65,6 +81,53 @@ def _get_flipped_protoquil_program(program: Program) -> Program:
     return program
 
 
+class ParametricExecutable:
+    """
+    A program compiled once, to be run for many values of its parameters. See
+    :py:meth:`QuantumComputer.compile_parametric`.
+
+    :param executable: The compiled program.
+    :param parameters: The memory locations set by each column of a batch of parameter values,
+        as ``(region name, offset)`` pairs.
+    :param integer: Whether each parameter is stored in an ``INTEGER`` or ``BIT`` region.
+    """
+
+    def __init__(self, executable, parameters, integer):
+        self.executable = executable
+        self.parameters = parameters
+        self.integer = integer
+
+    def __repr__(self):
+        return "<ParametricExecutable with parameters {}>".format(
+            ", ".join("{}[{}]".format(name, offset) for name, offset in self.parameters))
+
+
+def _parameter_locations(program, parameters):
+    """
+    Resolve the parameters of a program, see :py:meth:`QuantumComputer.compile_parametric`.
+
+    :return: The ``(region name, offset)`` pairs of the parameters, and whether each is an
+        integer.
+    """
+    declarations = {instr.name: instr for instr in program if isinstance(instr, Declare)}
+    if parameters is None:
+        parameters = [name for name in declarations if name != "ro"]
+
+    locations = []
+    for parameter in parameters:
+        if isinstance(parameter, MemoryReference):
+            name, offsets = parameter.name, [parameter.offset]
+        elif parameter in declarations:
+            name, offsets = parameter, range(declarations[parameter].memory_size)
+        else:
+            raise ValueError("{} is not a memory region declared by the program".format(parameter))
+        if name not in declarations:
+            raise ValueError("{} is not a memory region declared by the program".format(name))
+        locations.extend((name, offset) for offset in offsets)
+    integer = [declarations[name].memory_type in ('INTEGER', 'BIT') for name, _ in locations]
+    return locations, integer
+
+
 class QuantumComputer:
     @_record_call
     def __init__(self, *, name: str, qam: QAM, device: AbstractDevice, compiler: AbstractCompiler,
@@ -93,6 +156,7 @@ class QuantumComputer:
         self.compiler = compiler
 
         self.symmetrize_readout = symmetrize_readout
+        self._parametric_executables = CompileCache(maxsize=PARAMETRIC_CACHE_SIZE)
 
     def qubit_topology(self):
         return self.device.qubit_topology()
@@ -113,6 +177,61 @@ class QuantumComputer:
             .wait() \
             .read_from_memory_region(region_name="ro")
 
+    async def run_async(self, executable, executor=None) -> np.ndarray:
+        """
+        Run a quil executable without blocking the event loop.
+
+        Each call runs the executable on its own copy of the QAM, so many executables can be run
+        concurrently, e.g. with ``asyncio.gather``.
+
+        :param executable: The program to run. You are responsible for compiling this first.
+        :param executor: See :py:meth:`QAM.run_async`.
+        :return: A numpy array of shape (trials, len(ro-register)) that contains 0s and 1s
+        """
+        qam = copy.copy(self.qam)
+        qam.load(executable)
+        await qam.run_async(executor)
+        return qam.wait().read_from_memory_region(region_name="ro")
+
+    @_record_call
+    def run_batch(self, executables, lookahead=4, to_native_gates=True, optimize=True):
+        """
+        Run many programs, compiling them ahead of time.
+
+        Programs are compiled in a background thread while earlier programs run, so the latency
+        of the compiler is hidden behind execution. Compiler clients are not thread-safe, so the
+        programs are compiled one at a time, at most ``lookahead`` programs ahead of the one
+        which is running. The programs are run one after the other on the QAM.
+
+        :param executables: The programs to run, either as Programs, which are compiled with
+            :py:meth:`compile`, or as executables, which are run as they are.
+        :param lookahead: The number of programs to compile ahead of the running one.
+        :param to_native_gates: See :py:meth:`compile`.
+        :param optimize: See :py:meth:`compile`.
+        :return: A list with the result of :py:meth:`run` for each executable, in order.
+        """
+        if lookahead < 1:
+            raise ValueError("lookahead must be at least 1")
+
+        def prepare(executable):
+            if isinstance(executable, Program):
+                return self.compile(executable, to_native_gates=to_native_gates,
+                                    optimize=optimize)
+            return executable
+
+        results = []
+        pending = deque()
+        executables = iter(executables)
+        with ThreadPoolExecutor(max_workers=1) as compiler_thread:
+            for executable in itertools.islice(executables, lookahead):
+                pending.append(compiler_thread.submit(prepare, executable))
+            while pending:
+                binary = pending.popleft().result()
+                for executable in itertools.islice(executables, 1):
+                    pending.append(compiler_thread.submit(prepare, executable))
+                results.append(self.run(binary))
+        return results
+
     @_record_call
     def run_symmetrized_readout(self, program, trials, classical_addresses):
         """
@@ -189,6 +308,76 @@ class QuantumComputer:
         binary = self.compiler.native_quil_to_executable(nq_program)
         return binary
 
+    async def compile_async(self, program, to_native_gates=True, optimize=True, executor=None):
+        """
+        Compile a program without blocking the event loop, by calling :py:meth:`compile` in
+        ``executor``.
+
+        :param executor: A :py:class:`concurrent.futures.Executor`, or None for the event loop's
+            default executor.
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(executor, functools.partial(
+            self.compile, program, to_native_gates=to_native_gates, optimize=optimize))
+
+    @_record_call
+    def compile_parametric(self, program, parameters=None, to_native_gates=True, optimize=True):
+        r"""
+        Compile a program whose gate parameters are read from ``DECLARE``\ d memory, so that it
+        can be run for many parameter values without compiling it again.
+
+        The last ``PARAMETRIC_CACHE_SIZE`` compiled programs are cached, so compiling the same
+        program (and parameters) again returns the same executable without calling the compiler.
+
+        :param Program program: The program to compile.
+        :param parameters: The memory locations to set for each run, in order. Each is the name
+            of a declared memory region, which stands for all of its elements, or a
+            ``MemoryReference`` to a single element. Defaults to all declared regions but ``ro``,
+            in the order they are declared.
+        :param to_native_gates: See :py:meth:`compile`.
+        :param optimize: See :py:meth:`compile`.
+        :rtype: ParametricExecutable
+        """
+        locations, integer = _parameter_locations(program, parameters)
+        key = "{}:{}:{}:{}:{}".format(program.fingerprint(), program.num_shots, to_native_gates,
+                                      optimize, locations)
+        key = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        parametric = self._parametric_executables.get(key)
+        if parametric is None:
+            executable = self.compile(program, to_native_gates=to_native_gates, optimize=optimize)
+            parametric = ParametricExecutable(executable, locations, integer)
+            self._parametric_executables.put(key, parametric)
+        return parametric
+
+    @_record_call
+    def run_parametric(self, executable, values) -> np.ndarray:
+        """
+        Run a parametric program for a batch of parameter values.
+
+        :param executable: A :py:class:`ParametricExecutable`, or a Program which is compiled
+            with :py:meth:`compile_parametric` (and therefore only once).
+        :param values: An array of shape ``(n_points, n_parameters)``, each row of which holds
+            values for the executable's parameters.
+        :return: A numpy array of shape ``(n_points, trials, len(ro-register))`` that contains 0s
+            and 1s.
+        """
+        if isinstance(executable, Program):
+            executable = self.compile_parametric(executable)
+        values = np.asarray(values)
+        if values.ndim != 2 or values.shape[1] != len(executable.parameters):
+            raise ValueError("Expected parameter values of shape (n_points, {}), not {}"
+                             .format(len(executable.parameters), values.shape))
+
+        results = []
+        columns = list(zip(executable.parameters, executable.integer))
+        for row in values.tolist():
+            self.qam.load(executable.executable)
+            for ((name, offset), integer), value in zip(columns, row):
+                self.qam.write_memory(region_name=name, offset=offset,
+                                      value=int(value) if integer else value)
+            results.append(self.qam.run().wait().read_from_memory_region(region_name="ro"))
+        return np.array(results)
+
     def __str__(self):
         return self.name
 
@@ -268,7 +457,23 @@ def _get_qvm_compiler_based_on_endpoint(endpoint=None, device=None):
         raise ValueError("Protocol for QVM compiler endpoints must be HTTP or TCP.")
 
 
-def _get_9q_generic_qvm(connection: ForestConnection, noisy: bool):
+def _get_qvm_qam(connection: ForestConnection, noise_model, backend: str, n_qubits: int) -> QAM:
+    """
+    Construct the QAM which simulates a QVM-backed quantum computer.
+
+    :param connection: The connection to use to talk to external services
+    :param noise_model: The noise model to simulate, or None
+    :param backend: Either "qvm" for the QVM server or "numpy" for an in-process :py:class:`PyQVM`
+    :param n_qubits: The number of qubits of the device
+    """
+    if backend == 'qvm':
+        return QVM(connection=connection, noise_model=noise_model)
+    if backend == 'numpy':
+        return PyQVM(n_qubits=n_qubits, noise_model=noise_model)
+    raise ValueError("Unknown backend {}. Please use 'qvm' or 'numpy'".format(backend))
+
+
+def _get_9q_generic_qvm(connection: ForestConnection, noisy: bool, backend: str = 'qvm'):
     """
     A nine-qubit 3x3 square lattice.
 
@@ -280,6 +485,7 @@ def _get_9q_generic_qvm(connection: ForestConnection, noisy: bool):
 
     :param connection: The connection to use to talk to external services
     :param noisy: Whether to construct a noisy quantum computer
+    :param backend: The simulator to use, see :py:func:`get_qc`
     :return: A pre-configured QuantumComputer
     """
     nineq_square = nx.convert_node_labels_to_integers(nx.grid_2d_graph(3, 3))
@@ -291,14 +497,15 @@ def _get_9q_generic_qvm(connection: ForestConnection, noisy: bool):
         noise_model = None
 
     return QuantumComputer(name='9q-generic-qvm',
-                           qam=QVM(connection=connection, noise_model=noise_model),
+                           qam=_get_qvm_qam(connection, noise_model, backend, 9),
                            device=nineq_device,
                            compiler=_get_qvm_compiler_based_on_endpoint(
                                device=nineq_device,
                                endpoint=connection.compiler_endpoint))
 
 
-def _get_unrestricted_qvm(connection: ForestConnection, noisy: bool, n_qubits: int = 34):
+def _get_unrestricted_qvm(connection: ForestConnection, noisy: bool, n_qubits: int = 34,
+                          backend: str = 'qvm'):
     """
     A qvm with a fully-connected topology.
 
@@ -310,6 +517,7 @@ def _get_unrestricted_qvm(connection: ForestConnection, noisy: bool, n_qubits: i
     :param connection: The connection to use to talk to external services
     :param noisy: Whether to construct a noisy quantum computer
     :param n_qubits: 34 qubits ought to be enough for anybody.
+    :param backend: The simulator to use, see :py:func:`get_qc`
     :return: A pre-configured QuantumComputer
     """
     fully_connected_device = NxDevice(topology=nx.complete_graph(n_qubits))
@@ -322,7 +530,7 @@ def _get_unrestricted_qvm(connection: ForestConnection, noisy: bool, n_qubits: i
         noise_model = None
 
     return QuantumComputer(name='9q-generic-qvm',
-                           qam=QVM(connection=connection, noise_model=noise_model),
+                           qam=_get_qvm_qam(connection, noise_model, backend, n_qubits),
                            device=fully_connected_device,
                            compiler=_get_qvm_compiler_based_on_endpoint(
                                device=fully_connected_device,
@@ -331,7 +539,8 @@ def _get_unrestricted_qvm(connection: ForestConnection, noisy: bool, n_qubits: i
 
 @_record_call
 def get_qc(name: str, *, as_qvm: bool = None, noisy: bool = None,
-           connection: ForestConnection = None):
+           connection: ForestConnection = None, backend: str = 'qvm',
+           compile_cache=None):
     """
     Get a quantum computer.
 
@@ -357,6 +566,11 @@ def get_qc(name: str, *, as_qvm: bool = None, noisy: bool = None,
 
         >>> qc = get_qc("qvm")
 
+    QVMs can also be simulated in this process, without a QVM server, by asking for the numpy
+    backend::
+
+        >>> qc = get_qc("9q-generic-qvm", backend="numpy")
+
     Redundant flags are acceptable, but conflicting flags will raise an exception::
 
         >>> qc = get_qc("9q-generic-qvm") # qc is fully specified by its name
@@ -388,8 +602,30 @@ def get_qc(name: str, *, as_qvm: bool = None, noisy: bool = None,
         the default values for URL endpoints, ping time, and status time will be used. Your
         user id and API key will be read from ~/.pyquil_config. If you deign to change any
         of these parameters, pass your own :py:class:`ForestConnection` object.
+    :param backend: How QVMs are simulated. Either "qvm" (the default) to use the QVM server or
+        "numpy" to use an in-process :py:class:`PyQVM`, which is faster for small programs.
+        Noisy QVMs then simulate density matrices. Asking for a QPU with the "numpy" backend is
+        an error. Programs still need to be compiled by quilc,
+        unless they are passed directly to :py:meth:`QuantumComputer.run`.
+    :param compile_cache: Whether to cache the results of compiling programs. Either ``True`` to
+        use the cache shared by all quantum computers, ``pyquil.api.compile_cache``, or a
+        :py:class:`CompileCache`. Programs which were compiled for the same device before are
+        then not sent to the compiler again. See :py:class:`CachingCompiler`.
     :return:
     """
+    qc = _get_qc(name, as_qvm=as_qvm, noisy=noisy, connection=connection, backend=backend)
+    if compile_cache:
+        if compile_cache is True:
+            compile_cache = _compile_cache.compile_cache
+        qc.compiler = CachingCompiler(qc.compiler, cache=compile_cache)
+    return qc
+
+
+def _get_qc(name: str, *, as_qvm: bool, noisy: bool, connection: ForestConnection,
+            backend: str):
+    """
+    Construct the quantum computer described by the arguments of :py:func:`get_qc`.
+    """
     if connection is None:
         connection = ForestConnection()
 
@@ -398,12 +634,16 @@ def get_qc(name: str, *, as_qvm: bool = None, noisy: bool = None,
     if name == '':
         if not as_qvm:
             raise ValueError("Please name a valid device or run as a QVM")
-        return _get_unrestricted_qvm(connection=connection, noisy=noisy)
+        return _get_unrestricted_qvm(connection=connection, noisy=noisy, backend=backend)
 
     if name == '9q-generic':
         if not as_qvm:
             raise ValueError("The device '9q-generic' is only available as a QVM")
-        return _get_9q_generic_qvm(connection=connection, noisy=noisy)
+        return _get_9q_generic_qvm(connection=connection, noisy=noisy, backend=backend)
+
+    if not as_qvm and backend != 'qvm':
+        raise ValueError("The {} backend only simulates QVMs, but {} is a QPU. Please use "
+                         "as_qvm=True or a name ending in '-qvm'".format(backend, name))
 
     device = get_lattice(name)
     if not as_qvm:
@@ -424,7 +664,8 @@ def get_qc(name: str, *, as_qvm: bool = None, noisy: bool = None,
         name = "{name}-qvm".format(name=name)
 
     return QuantumComputer(name=name,
-                           qam=QVM(connection=connection, noise_model=noise_model),
+                           qam=_get_qvm_qam(connection, noise_model, backend,
+                                            len(device.qubit_topology().nodes)),
                            device=device,
                            compiler=_get_qvm_compiler_based_on_endpoint(
                                device=device,
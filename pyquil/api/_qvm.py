@@ -20,7 +20,8 @@ from six import integer_types
 
 from pyquil.api._base_connection import (validate_qubit_list, validate_noise_probabilities,
                                          TYPE_MULTISHOT_MEASURE, TYPE_WAVEFUNCTION,
-                                         TYPE_EXPECTATION, post_json, ForestConnection)
+                                         TYPE_EXPECTATION, post_json, ForestConnection,
+                                         AsyncForestConnection)
 from pyquil.api._compiler import (LocalQVMCompiler,
                                   _extract_program_from_pyquil_executable_response)
 from rpcq.core_messages import PyQuilExecutableResponse
@@ -32,6 +33,7 @@ from pyquil.gates import MOVE, MemoryReference
 from pyquil.noise import apply_noise_model
 from pyquil.paulis import PauliSum
 from pyquil.quil import Program, get_classical_addresses_from_program, percolate_declares
+from pyquil.quilbase import Declare
 from pyquil.wavefunction import Wavefunction
 
 
@@ -353,7 +355,8 @@ class QVM(QAM):
         """
         A virtual machine that classically emulates the execution of Quil programs.
 
-        :param connection: A connection to the Forest web API.
+        :param connection: A connection to the Forest web API. If it is an
+            :py:class:`AsyncForestConnection`, programs must be run with :py:meth:`run_async`.
         :param noise_model: A noise model that describes noise to apply when emulating a program's
             execution.
         :param gate_noise: A list of three numbers [Px, Py, Pz] indicating the probability of an X,
@@ -378,6 +381,8 @@ To read more about supplying noise to the QVM, see http://pyquil.readthedocs.io/
 
         self.noise_model = noise_model
         self.connection = connection
+        self._prepared = None
+        self._prepared_for = None
 
         validate_noise_probabilities(gate_noise)
         validate_noise_probabilities(measurement_noise)
@@ -391,17 +396,25 @@ To read more about supplying noise to the QVM, see http://pyquil.readthedocs.io/
         else:
             raise TypeError("random_seed should be None or a non-negative int")
 
-    @_record_call
-    def run(self):
+    def _preparation_key(self):
         """
-        Run a Quil program on the QVM multiple times and return the values stored in the
-        classical registers designated by the classical_addresses parameter.
+        :return: What the preparation of the loaded executable depends on, besides its identity.
+            Programs may be changed in place between runs, so for them this is their content.
+        """
+        if isinstance(self._executable, Program):
+            return self._executable.fingerprint(), self._executable.num_shots
+        return None
 
-        :return: An array of bitstrings of shape ``(trials, len(classical_addresses))``
+    def _prepare(self):
         """
+        Extract the program to run from the loaded executable and apply the noise model.
 
-        super().run()
+        The result is reused for as long as the same, unchanged executable is loaded, e.g. to run
+        it again with different memory values.
 
+        :return: The program split into its declarations and the rest, the number of trials,
+            and the classical addresses to read out.
+        """
         if isinstance(self._executable, PyQuilExecutableResponse):
             quil_program = _extract_program_from_pyquil_executable_response(self._executable)
         elif isinstance(self._executable, Program):
@@ -418,16 +431,70 @@ To read more about supplying noise to the QVM, see http://pyquil.readthedocs.io/
         if self.noise_model is not None:
             quil_program = apply_noise_model(quil_program, self.noise_model)
 
-        quil_program = self.augment_program_with_memory_values(quil_program)
-        self.bitstrings = self.connection._qvm_run(quil_program=quil_program,
-                                                   classical_addresses=classical_addresses,
-                                                   trials=trials,
-                                                   measurement_noise=self.measurement_noise,
-                                                   gate_noise=self.gate_noise,
-                                                   random_seed=self.random_seed)['ro']
+        declarations = [instr for instr in quil_program if isinstance(instr, Declare)]
+        body = [instr for instr in quil_program if not isinstance(instr, Declare)]
+        return declarations, body, quil_program.defined_gates, trials, classical_addresses
+
+    @_record_call
+    def run(self):
+        """
+        Run a Quil program on the QVM multiple times and return the values stored in the
+        classical registers designated by the classical_addresses parameter.
+
+        :return: An array of bitstrings of shape ``(trials, len(classical_addresses))``
+        """
+
+        super().run()
+
+        self._bitstrings = self.connection._qvm_run(**self._qvm_run_args())['ro']
 
         return self
 
+    async def run_async(self, executor=None):
+        """
+        Run the loaded Quil program without blocking the event loop.
+
+        If this QVM's connection is an :py:class:`AsyncForestConnection`, the request is sent by
+        the connection, and ``executor`` is ignored. Otherwise :py:meth:`run` is called in
+        ``executor``.
+
+        :param executor: A :py:class:`concurrent.futures.Executor`, or None for the event loop's
+            default executor.
+        """
+        if not isinstance(self.connection, AsyncForestConnection):
+            return await super().run_async(executor)
+
+        QAM.run(self)
+        ram = await self.connection._qvm_run(**self._qvm_run_args())
+        self._bitstrings = ram['ro']
+        return self
+
+    def _qvm_run_args(self):
+        """
+        :return: The arguments of :py:meth:`ForestConnection._qvm_run` which run the loaded
+            program with the memory values set by :py:meth:`write_memory`.
+        """
+        key = self._preparation_key()
+        if (self._prepared is None or self._prepared_for[0] is not self._executable
+                or self._prepared_for[1] != key):
+            self._prepared = self._prepare()
+            self._prepared_for = (self._executable, key)
+        declarations, body, defined_gates, trials, classical_addresses = self._prepared
+
+        # This is augment_program_with_memory_values, without re-sorting the DECLAREs each run
+        quil_program = Program()._extend(declarations)
+        quil_program._extend([MOVE(MemoryReference(name=k.name, offset=k.index), v)
+                              for k, v in self._variables_shim.items()])
+        quil_program._extend(body)
+        quil_program._defined_gates = list(defined_gates)
+
+        return dict(quil_program=quil_program,
+                    classical_addresses=classical_addresses,
+                    trials=trials,
+                    measurement_noise=self.measurement_noise,
+                    gate_noise=self.gate_noise,
+                    random_seed=self.random_seed)
+
     def augment_program_with_memory_values(self, quil_program):
         p = Program()
 
@@ -21,6 +21,7 @@ from six import integer_types
 from pyquil.api._base_connection import ForestConnection
 from pyquil.api._error_reporting import _record_call
 from pyquil.api._job import Job
+from pyquil.api._pyqvm import PyQVM
 from pyquil.paulis import PauliSum, PauliTerm
 from pyquil.quil import Program
 from pyquil.wavefunction import Wavefunction
@@ -171,3 +172,79 @@ class WavefunctionSimulator:
         """
         return self.connection._wait_for_job(job_id=job_id, ping_time=ping_time,
                                              status_time=status_time, machine='QVM')
+
+
+class PyWavefunctionSimulator:
+    @_record_call
+    def __init__(self, random_seed: Optional[int] = None, quantum_simulator_type=None) -> None:
+        """
+        A drop-in replacement for :py:class:`WavefunctionSimulator` which simulates programs in
+        this process with a :py:class:`PyQVM` instead of sending them to a QVM server.
+
+        :param random_seed: A seed for the simulator's random number generator. Either None (for
+            an automatically generated seed) or a non-negative integer.
+        :param quantum_simulator_type: The simulator to use, see :py:class:`PyQVM`.
+        """
+        self.qam = PyQVM(quantum_simulator_type=quantum_simulator_type, random_seed=random_seed)
+
+    @property
+    def random_seed(self):
+        return self.qam.random_seed
+
+    @_record_call
+    def wavefunction(self, quil_program: Program) -> Wavefunction:
+        """
+        Simulate a Quil program and return the wavefunction.
+
+        See :py:meth:`WavefunctionSimulator.wavefunction`.
+
+        :param quil_program: A Quil program.
+        :return: A Wavefunction object representing the final state.
+        """
+        simulator = self.qam.execute(quil_program).wf_simulator
+        return Wavefunction(simulator.amplitudes)
+
+    @_record_call
+    def expectation(self, prep_prog: Program,
+                    pauli_terms: Union[PauliSum, List[PauliTerm]]) -> Union[float, np.ndarray]:
+        """
+        Calculate the expectation value of Pauli operators given a state prepared by prep_program.
+
+        See :py:meth:`WavefunctionSimulator.expectation`.
+
+        :param prep_prog: A program that prepares the state on which we measure the expectation.
+        :param pauli_terms: A Pauli representation of a quantum operator.
+        :return: Either a float or array floats depending on ``pauli_terms``.
+        """
+        if isinstance(pauli_terms, PauliSum):
+            terms = pauli_terms.terms
+        else:
+            terms = list(pauli_terms)
+        n_qubits = max([q + 1 for term in terms for q in term.get_qubits()], default=0)
+        simulator = self.qam.execute(prep_prog, n_qubits=n_qubits).wf_simulator
+
+        if isinstance(pauli_terms, PauliSum):
+            return simulator.expectation(pauli_terms)
+        return np.array([simulator.expectation(term) for term in terms])
+
+    @_record_call
+    def run_and_measure(self, quil_program: Program, qubits: List[int] = None,
+                        trials: int = 1) -> np.ndarray:
+        """
+        Run a Quil program once to determine the final wavefunction, and measure multiple times.
+
+        See :py:meth:`WavefunctionSimulator.run_and_measure`.
+
+        :param quil_program: The program to run and measure
+        :param qubits: An optional list of qubits to measure. The order of this list is
+            respected in the returned bitstrings. If not provided, all qubits used in
+            the program will be measured and returned in their sorted order.
+        :param int trials: Number of times to sample from the prepared wavefunction.
+        :return: An array of measurement results (0 or 1) of shape (trials, len(qubits))
+        """
+        if qubits is None:
+            qubits = sorted(quil_program.get_qubits(indices=True))
+
+        n_qubits = max([q + 1 for q in qubits], default=0)
+        simulator = self.qam.execute(quil_program, n_qubits=n_qubits).wf_simulator
+        return simulator.sample_bitstrings(trials, qubits)
@@ -0,0 +1,280 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+"""
+A columnar representation of protoquil programs, backed by NumPy arrays.
+
+A :py:class:`ColumnarProgram` stores each gate as a row of a few arrays instead of as a
+:py:class:`~pyquil.quilbase.Gate` object, which makes it possible to build and transform
+programs with millions of gates. ``Gate`` objects are only created on demand, when iterating or
+indexing.
+"""
+from numbers import Real
+
+import numpy as np
+from six import integer_types
+
+from pyquil.gates import QUANTUM_GATES
+from pyquil.quil import Program
+from pyquil.quilatom import Qubit
+from pyquil.quilbase import Gate
+
+# The number of gates for which Gate objects are created at once when iterating
+_CHUNK_SIZE = 4096
+
+
+class ColumnarProgram(object):
+    """
+    .. note:: Experimental
+
+    A protoquil program stored as arrays. Row ``i`` describes the ``i``-th gate:
+
+    - ``codes[i]`` is the index of its name in ``gate_names``,
+    - ``params[i]`` are its (real) parameters, padded with NaN,
+    - ``qubits[i]`` are the indices of the qubits it acts on, padded with -1.
+
+    Slicing a ColumnarProgram returns another ColumnarProgram whose arrays are views on the
+    original ones.
+
+    :param gate_names: The gate names which ``codes`` refer to.
+    :param codes: An integer array of shape (n,).
+    :param params: A float array of shape (n, max. number of parameters). Defaults to no
+        parameters. Note that integer parameters are stored, and hence printed, as floats.
+    :param qubits: An integer array of shape (n, max. number of qubits). May only be left out if
+        the program has no gates.
+    :param defined_gates: DefGates for any gates which aren't standard gates.
+    """
+
+    def __init__(self, gate_names, codes, params=None, qubits=None, defined_gates=None):
+        self.gate_names = tuple(gate_names)
+        self.codes = np.asarray(codes)
+        if params is None:
+            params = np.zeros((len(self.codes), 0))
+        self.params = np.asarray(params, dtype=float)
+        if qubits is None:
+            qubits = np.zeros((0, 0), dtype=np.int64)
+        self.qubits = np.asarray(qubits)
+        self.defined_gates = list(defined_gates) if defined_gates is not None else []
+
+        if self.codes.ndim != 1 or not np.issubdtype(self.codes.dtype, np.integer):
+            raise TypeError("codes should be a one-dimensional integer array")
+        if self.params.ndim != 2 or len(self.params) != len(self.codes):
+            raise ValueError("params should have shape (len(codes), number of parameters)")
+        if self.qubits.ndim != 2 or len(self.qubits) != len(self.codes):
+            raise ValueError("qubits should have shape (len(codes), number of qubits)")
+        if not np.issubdtype(self.qubits.dtype, np.integer):
+            raise TypeError("qubits should be an integer array")
+        if len(self.codes) and (self.codes.min() < 0 or self.codes.max() >= len(self.gate_names)):
+            raise ValueError("codes should index into gate_names")
+
+    @classmethod
+    def from_program(cls, program):
+        """
+        Convert a Program to its columnar representation.
+
+        :param Program program: A protoquil program, with real parameters and no placeholders.
+        :return: The equivalent ColumnarProgram.
+        :rtype: ColumnarProgram
+        """
+        if not program.is_protoquil():
+            raise ValueError("Program must be valid Protoquil")
+
+        instructions = program.instructions
+        gate_codes = {}
+        n_params = max((len(gate.params) for gate in instructions), default=0)
+        n_qubits = max((len(gate.qubits) for gate in instructions), default=0)
+        codes = np.empty(len(instructions), dtype=np.int32)
+        params = np.full((len(instructions), n_params), np.nan)
+        qubits = np.full((len(instructions), n_qubits), -1, dtype=np.int64)
+        for i, gate in enumerate(instructions):
+            codes[i] = gate_codes.setdefault(gate.name, len(gate_codes))
+            for j, param in enumerate(gate.params):
+                if not isinstance(param, Real):
+                    raise TypeError("Only gates with real parameters can be stored in a "
+                                    "ColumnarProgram, not {}".format(gate))
+                params[i, j] = param
+            for j, qubit in enumerate(gate.qubits):
+                if not isinstance(qubit, Qubit):
+                    raise TypeError("Please call address_qubits on the program first")
+                qubits[i, j] = qubit.index
+
+        return cls(list(gate_codes), codes, params, qubits, program.defined_gates)
+
+    def to_program(self):
+        """
+        Convert this program into a regular Program.
+
+        :rtype: Program
+        """
+        p = Program()
+        for defgate in self.defined_gates:
+            p.inst(defgate)
+        return p._extend(list(self))
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __iter__(self):
+        for start in range(0, len(self), _CHUNK_SIZE):
+            chunk = slice(start, start + _CHUNK_SIZE)
+            for code, params, qubits in zip(self.codes[chunk].tolist(),
+                                            self.params[chunk].tolist(),
+                                            self.qubits[chunk].tolist()):
+                yield self._gate(code, params, qubits)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ColumnarProgram(self.gate_names, self.codes[index], self.params[index],
+                                   self.qubits[index], self.defined_gates)
+        return self._gate(self.codes[index], self.params[index].tolist(),
+                          self.qubits[index].tolist())
+
+    def _gate(self, code, params, qubits):
+        return Gate(self.gate_names[code],
+                    [param for param in params if param == param],  # NaN is padding
+                    [Qubit(q) for q in qubits if q >= 0])
+
+    def get_qubits(self):
+        """
+        :return: The indices of all the qubits used in this program.
+        :rtype: set
+        """
+        return set(np.unique(self.qubits[self.qubits >= 0]).tolist())
+
+    def remap_qubits(self, qubit_mapping):
+        """
+        Relabel the qubits of this program.
+
+        :param dict qubit_mapping: A mapping from qubit indices to new qubit indices. Qubits which
+            are not in the mapping are left alone.
+        :return: A new program acting on the new qubits.
+        :rtype: ColumnarProgram
+        """
+        for old, new in qubit_mapping.items():
+            if not (isinstance(old, integer_types) and old >= 0
+                    and isinstance(new, integer_types) and new >= 0):
+                raise TypeError("qubit_mapping should map non-negative ints to non-negative ints")
+        size = max(max(qubit_mapping, default=-1), self.qubits.max(initial=-1)) + 1
+        # The extra last entry maps the -1 padding to itself
+        table = np.append(np.arange(size, dtype=self.qubits.dtype), -1)
+        for old, new in qubit_mapping.items():
+            table[old] = new
+        return ColumnarProgram(self.gate_names, self.codes, self.params, table[self.qubits],
+                               self.defined_gates)
+
+    def dagger(self, inv_dict=None, suffix="-INV"):
+        """
+        Creates the conjugate transpose of the program, see :py:meth:`Program.dagger`.
+
+        :return: The program's inverse
+        :rtype: ColumnarProgram
+        """
+        defined_gates = Program()
+        for gate in self.defined_gates:
+            if inv_dict is None or gate.name not in inv_dict:
+                if gate.parameters:
+                    raise TypeError("Cannot auto define daggered version of parameterized gates")
+                defined_gates.defgate(gate.name + suffix, gate.matrix.T.conj())
+
+        # Work out what each gate name turns into and then apply that to all rows at once
+        fixed_params = {"S": ("PHASE", -np.pi / 2), "T": ("RZ", np.pi / 4),
+                        "ISWAP": ("PSWAP", np.pi / 2)}
+        names = []
+        code_map = np.empty(len(self.gate_names), dtype=self.codes.dtype)
+        negate = np.zeros(len(self.gate_names), dtype=bool)
+        fixed = np.full(len(self.gate_names), np.nan)
+        for code, name in enumerate(self.gate_names):
+            if name in fixed_params:
+                new_name, fixed[code] = fixed_params[name]
+            elif name in QUANTUM_GATES:
+                new_name, negate[code] = name, True
+            elif inv_dict is not None and name in inv_dict:
+                new_name = inv_dict[name]
+            else:
+                new_name = name + suffix
+            if new_name not in names:
+                names.append(new_name)
+            code_map[code] = names.index(new_name)
+
+        codes = self.codes[::-1]
+        params = np.where(negate[codes][:, np.newaxis], -self.params[::-1], self.params[::-1])
+        if not np.isnan(fixed).all():
+            if params.shape[1] == 0:
+                params = np.full((len(codes), 1), np.nan)
+            params[:, 0] = np.where(np.isnan(fixed[codes]), params[:, 0], fixed[codes])
+        return ColumnarProgram(names, code_map[codes], params, self.qubits[::-1],
+                               defined_gates.defined_gates)
+
+    def out(self):
+        """
+        Serializes the program to a string suitable for submitting to the QVM or QPU. The result
+        is the same as that of ``self.to_program().out()``.
+        """
+        lines = np.array(self.gate_names, dtype=object)[self.codes]
+        has_params = np.zeros(len(self), dtype=bool)
+        for j in range(self.params.shape[1]):
+            rows = ~np.isnan(self.params[:, j])
+            lines[rows] += np.where(has_params[rows], ',', '(').astype(object)
+            lines[rows] += _format_real_params(self.params[rows, j])
+            has_params |= rows
+        lines[has_params] += ')'
+
+        for j in range(self.qubits.shape[1]):
+            rows = self.qubits[:, j] >= 0
+            indices = self.qubits[rows, j]
+            if not len(indices):
+                continue
+            uniques, inverse = np.unique(indices, return_inverse=True)
+            lines[rows] += ' '
+            lines[rows] += np.array([str(q) for q in uniques.tolist()], dtype=object)[inverse]
+
+        return '\n'.join([dg.out() for dg in self.defined_gates] + lines.tolist() + [''])
+
+    def __str__(self):
+        return self.out()
+
+
+def _format_real_params(values):
+    """
+    Vectorized version of :py:func:`pyquil.parameters.format_parameter` for an array of floats:
+    multiples of pi/n with n <= 8 are written in terms of pi. Each distinct value is only
+    formatted once.
+
+    :param np.ndarray values: The parameters to format.
+    :return: An object array of strings.
+    """
+    uniques, inverse = np.unique(values, return_inverse=True)
+    formatted = np.empty(len(uniques), dtype=object)
+    ratio = uniques / np.pi
+    done = np.zeros(len(uniques), dtype=bool)
+    # The smallest denominator for which ratio is exactly num / den gives num / den in lowest
+    # terms, like Fraction.limit_denominator does in _check_for_pi.
+    for den in range(1, 9):
+        num = np.round(ratio * den)
+        match = ~done & (num / den == ratio)
+        for i, n in zip(np.flatnonzero(match).tolist(), num[match].astype(object).tolist()):
+            n = int(n)
+            if n == 0:
+                formatted[i] = "0"
+                continue
+            sign = "-" if n < 0 else ""
+            if abs(n) == 1:
+                formatted[i] = sign + "pi" if den == 1 else sign + "pi/" + repr(den)
+            else:
+                formatted[i] = repr(n) + "*pi" if den == 1 else repr(n) + "*pi/" + repr(den)
+        done |= match
+    for i in np.flatnonzero(~done).tolist():
+        formatted[i] = repr(float(uniques[i]))
+    return formatted[inverse]
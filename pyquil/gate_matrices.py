@@ -0,0 +1,160 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+"""
+Matrix representations of the standard gates in :py:data:`pyquil.gates.QUANTUM_GATES`.
+
+As in Quil, the rows and columns of the matrix of a gate acting on several qubits are ordered
+such that the first qubit argument is the most significant one. E.g. ``CNOT 0 1`` flips qubit 1
+if qubit 0 is in the excited state.
+"""
+import numpy as np
+
+I = np.eye(2)
+
+X = np.array([[0, 1],
+              [1, 0]])
+
+Y = np.array([[0, -1j],
+              [1j, 0]])
+
+Z = np.array([[1, 0],
+              [0, -1]])
+
+H = np.array([[1, 1],
+              [1, -1]]) / np.sqrt(2)
+
+S = np.array([[1, 0],
+              [0, 1j]])
+
+T = np.array([[1, 0],
+              [0, np.exp(1j * np.pi / 4)]])
+
+
+def PHASE(phi):
+    return np.array([[1, 0],
+                     [0, np.exp(1j * phi)]])
+
+
+def RX(phi):
+    return np.array([[np.cos(phi / 2), -1j * np.sin(phi / 2)],
+                     [-1j * np.sin(phi / 2), np.cos(phi / 2)]])
+
+
+def RY(phi):
+    return np.array([[np.cos(phi / 2), -np.sin(phi / 2)],
+                     [np.sin(phi / 2), np.cos(phi / 2)]])
+
+
+def RZ(phi):
+    return np.array([[np.exp(-1j * phi / 2), 0],
+                     [0, np.exp(1j * phi / 2)]])
+
+
+CZ = np.diag([1, 1, 1, -1])
+
+CNOT = np.array([[1, 0, 0, 0],
+                 [0, 1, 0, 0],
+                 [0, 0, 0, 1],
+                 [0, 0, 1, 0]])
+
+CCNOT = np.eye(8)
+CCNOT[6:, 6:] = X
+
+
+def CPHASE00(phi):
+    return np.diag([np.exp(1j * phi), 1, 1, 1])
+
+
+def CPHASE01(phi):
+    return np.diag([1, np.exp(1j * phi), 1, 1])
+
+
+def CPHASE10(phi):
+    return np.diag([1, 1, np.exp(1j * phi), 1])
+
+
+def CPHASE(phi):
+    return np.diag([1, 1, 1, np.exp(1j * phi)])
+
+
+SWAP = np.array([[1, 0, 0, 0],
+                 [0, 0, 1, 0],
+                 [0, 1, 0, 0],
+                 [0, 0, 0, 1]])
+
+CSWAP = np.eye(8)
+CSWAP[4:, 4:] = SWAP
+
+ISWAP = np.array([[1, 0, 0, 0],
+                  [0, 0, 1j, 0],
+                  [0, 1j, 0, 0],
+                  [0, 0, 0, 1]])
+
+
+def PSWAP(phi):
+    return np.array([[1, 0, 0, 0],
+                     [0, 0, np.exp(1j * phi), 0],
+                     [0, np.exp(1j * phi), 0, 0],
+                     [0, 0, 0, 1]])
+
+
+QUANTUM_GATES = {
+    'I': I,
+    'X': X,
+    'Y': Y,
+    'Z': Z,
+    'H': H,
+    'S': S,
+    'T': T,
+    'PHASE': PHASE,
+    'RX': RX,
+    'RY': RY,
+    'RZ': RZ,
+    'CZ': CZ,
+    'CNOT': CNOT,
+    'CCNOT': CCNOT,
+    'CPHASE00': CPHASE00,
+    'CPHASE01': CPHASE01,
+    'CPHASE10': CPHASE10,
+    'CPHASE': CPHASE,
+    'SWAP': SWAP,
+    'CSWAP': CSWAP,
+    'ISWAP': ISWAP,
+    'PSWAP': PSWAP}
+"""
+Dictionary of gate matrices. Keys are gate names, values are either matrices or, for parametric
+gates, functions of the parameters which return a matrix.
+"""
+
+
+def gate_matrix(name, params=()):
+    """
+    Look up the matrix of a standard gate.
+
+    :param str name: The name of the gate.
+    :param params: The (numeric) parameters of the gate.
+    :return: The gate's matrix.
+    :rtype: np.ndarray
+    """
+    try:
+        matrix = QUANTUM_GATES[name]
+    except KeyError:
+        raise ValueError("{} is not a standard gate".format(name)) from None
+    if callable(matrix):
+        return matrix(*params)
+    if params:
+        raise ValueError("{} does not take parameters".format(name))
+    return matrix
@@ -67,6 +67,15 @@ def to_latex(circuit, settings=None):
     return text
 
 
+def _name_and_qubits(inst):
+    """
+    Get the name and qubits of a gate or measurement, for drawing.
+    """
+    if isinstance(inst, Measurement):
+        return "MEASURE", [inst.qubit]
+    return inst.name, inst.qubits
+
+
 def body(circuit, settings):
     """
     Return the body of the Latex document, including the entire circuit in
@@ -82,19 +91,15 @@ def body(circuit, settings):
 
     # Allocate each qubit.
     for inst in circuit:
-        if isinstance(inst, Measurement):
-            inst.qubits = [inst.qubit]
-            inst.name = "MEASURE"
-        else:
-            qubits = inst.qubits
+        gate, qubits = _name_and_qubits(inst)
         for qubit in qubits:
             qubit_instruction_mapping[qubit.index] = []
     for k, v in list(qubit_instruction_mapping.items()):
         v.append(command(ALLOCATE, [k], [], [k], k))
 
     for inst in circuit:
-        qubits = [qubit.index for qubit in inst.qubits]
-        gate = inst.name
+        gate, qubits = _name_and_qubits(inst)
+        qubits = [qubit.index for qubit in qubits]
         # If this is a single qubit instruction.
         if len(qubits) == 1:
             for qubit in qubits:
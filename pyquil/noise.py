@@ -23,6 +23,7 @@ from typing import Sequence
 import numpy as np
 import sys
 
+from pyquil._parser.fast_parser import parse_expression
 from pyquil.gates import I, MEASURE, X
 from pyquil.parameters import format_parameter
 from pyquil.quilbase import Pragma, Gate
@@ -217,6 +218,23 @@ def _create_kraus_pragmas(name, qubit_indices, kraus_ops):
     return pragmas
 
 
+def _parse_pragma_matrix(freeform_string):
+    """
+    Parse the matrix in the freeform string of a ``PRAGMA ADD-KRAUS`` or ``PRAGMA READOUT-POVM``,
+    i.e. undo the formatting done by :py:func:`_create_kraus_pragmas` and
+    :py:meth:`Program.define_noisy_readout`.
+
+    :param str freeform_string: The row-major matrix entries, e.g. ``"(0.9 0.2 0.1 0.8)"``.
+    :return: The matrix.
+    :rtype: np.ndarray
+    """
+    entries = [parse_expression(entry) for entry in freeform_string.strip().strip('()').split()]
+    size = int(round(np.sqrt(len(entries))))
+    if size * size != len(entries):
+        raise ValueError("Expected a square matrix, got {} entries".format(len(entries)))
+    return np.array(entries, dtype=np.complex128).reshape(size, size)
+
+
 def append_kraus_to_gate(kraus_ops, gate_matrix):
     """
     Follow a gate ``gate_matrix`` by a Kraus map described by ``kraus_ops``.
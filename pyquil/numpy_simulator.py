@@ -0,0 +1,296 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+"""
+In-process simulators which store the state as a NumPy tensor with one axis per qubit (two for a
+density matrix) and apply gates by contracting their matrices with the relevant axes.
+"""
+import numpy as np
+
+from pyquil.api._pyqvm import AbstractQuantumSimulator
+from pyquil.gate_matrices import QUANTUM_GATES, gate_matrix
+from pyquil.packed_paulis import PackedPauliSum
+from pyquil.paulis import PauliSum, PauliTerm
+
+
+class NumpyWavefunctionSimulator(AbstractQuantumSimulator):
+    """
+    A wavefunction simulator backed by a tensor of shape ``(2,) * n_qubits``. Axis ``i`` of
+    :py:attr:`wf` corresponds to qubit ``i``, so a gate on ``k`` qubits only touches ``k`` axes
+    and costs ``O(2**(n_qubits + k))`` operations.
+
+    :param n_qubits: The number of qubits to simulate.
+    :param rs: A ``np.random.RandomState`` used for measurements and sampling. Defaults to a
+        fresh, randomly seeded one.
+    """
+
+    def __init__(self, n_qubits, rs=None):
+        self.n_qubits = n_qubits
+        self.rs = rs if rs is not None else np.random.RandomState()
+        self.wf = None
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the state to the all-zeros state.
+        """
+        self.wf = np.zeros((2,) * self.n_qubits, dtype=np.complex128)
+        self.wf[(0,) * self.n_qubits] = 1
+        return self
+
+    @property
+    def amplitudes(self):
+        """
+        The state as a vector ordered like :py:class:`~pyquil.wavefunction.Wavefunction`, i.e.
+        with qubit 0 as the least significant bit of the index.
+        """
+        return self.wf.transpose(tuple(reversed(range(self.n_qubits)))).reshape(-1)
+
+    def do_gate(self, gate):
+        """
+        Apply a standard gate to the state.
+
+        :param Gate gate: A gate from :py:data:`pyquil.gates.QUANTUM_GATES` with numeric
+            parameters.
+        """
+        matrix = gate_matrix(gate.name, gate.params)
+        return self.do_gate_matrix(matrix, [q.index for q in gate.qubits])
+
+    def do_gate_matrix(self, matrix, qubits):
+        """
+        Apply an arbitrary unitary to the state.
+
+        :param matrix: A ``2**k`` by ``2**k`` matrix whose first row/column index bit is the
+            most significant one, as in ``DEFGATE``.
+        :param qubits: The ``k`` qubit indices the matrix acts on.
+        """
+        self.wf = _apply_matrix(self.wf, matrix, qubits)
+        return self
+
+    def do_measurement(self, qubit):
+        """
+        Measure a qubit in the computational basis, collapsing the state.
+
+        :param int qubit: The qubit to measure.
+        :return: The measurement outcome, 0 or 1.
+        :rtype: int
+        """
+        one = _axis_index(self.n_qubits, qubit, 1)
+        p_one = np.sum(np.abs(self.wf[one]) ** 2)
+        outcome = int(self.rs.uniform() < p_one)
+
+        collapsed = np.zeros_like(self.wf)
+        kept = _axis_index(self.n_qubits, qubit, outcome)
+        collapsed[kept] = self.wf[kept] / np.sqrt(p_one if outcome else 1 - p_one)
+        self.wf = collapsed
+        return outcome
+
+    def sample_bitstrings(self, n_samples, qubits=None):
+        """
+        Sample measurement outcomes without collapsing the state.
+
+        :param int n_samples: The number of samples.
+        :param qubits: The qubits to sample, in the order of the returned columns. Defaults to
+            all qubits in order.
+        :return: An int array of shape ``(n_samples, len(qubits))``.
+        """
+        if qubits is None:
+            qubits = list(range(self.n_qubits))
+        if len(qubits) == 0:
+            return np.zeros((n_samples, 0), dtype=int)
+        probabilities = np.abs(self.wf.reshape(-1)) ** 2
+        samples = self.rs.choice(probabilities.size, size=n_samples,
+                                 p=probabilities / probabilities.sum())
+        bits = np.unravel_index(samples, self.wf.shape)
+        return np.array([bits[q] for q in qubits], dtype=int).reshape(len(qubits), n_samples).T
+
+    def expectation(self, operator):
+        """
+        Compute the expectation value of a Pauli operator in the current state.
+
+        :param operator: A PauliTerm or PauliSum on qubits ``< n_qubits``.
+        :return: The (real part of the) expectation value, including coefficients.
+        :rtype: float
+        """
+        values = PackedPauliSum.from_pauli_sum(operator).expectations(self.amplitudes)
+        return float(np.sum(values).real)
+
+
+class DensityMatrixSimulator(AbstractQuantumSimulator):
+    """
+    A density matrix simulator backed by a tensor of shape ``(2,) * 2 * n_qubits``. Axis ``i``
+    of :py:attr:`density` is the row (ket) index of qubit ``i`` and axis ``n_qubits + i`` its
+    column (bra) index.
+
+    Unlike a wavefunction simulator, this tracks mixed states exactly, so noise given as Kraus
+    maps is applied in a single pass instead of by sampling one trajectory per shot.
+
+    :param n_qubits: The number of qubits to simulate.
+    :param rs: A ``np.random.RandomState`` used for measurements and sampling. Defaults to a
+        fresh, randomly seeded one.
+    """
+
+    def __init__(self, n_qubits, rs=None):
+        self.n_qubits = n_qubits
+        self.rs = rs if rs is not None else np.random.RandomState()
+        self.density = None
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the state to the all-zeros state.
+        """
+        self.density = np.zeros((2,) * 2 * self.n_qubits, dtype=np.complex128)
+        self.density[(0,) * 2 * self.n_qubits] = 1
+        return self
+
+    @property
+    def density_matrix(self):
+        """
+        The density matrix with rows and columns ordered like
+        :py:class:`~pyquil.wavefunction.Wavefunction`, i.e. with qubit 0 as the least significant
+        bit of the index.
+        """
+        n = self.n_qubits
+        order = tuple(reversed(range(n))) + tuple(reversed(range(n, 2 * n)))
+        return self.density.transpose(order).reshape(2 ** n, 2 ** n)
+
+    def probabilities(self):
+        """
+        :return: The probabilities of all bitstrings, in
+            :py:class:`~pyquil.wavefunction.Wavefunction` order.
+        :rtype: np.ndarray
+        """
+        return np.real(np.diagonal(self.density_matrix)).copy()
+
+    def do_gate(self, gate):
+        """
+        Apply a standard gate to the state.
+
+        :param Gate gate: A gate from :py:data:`pyquil.gates.QUANTUM_GATES` with numeric
+            parameters.
+        """
+        matrix = gate_matrix(gate.name, gate.params)
+        return self.do_gate_matrix(matrix, [q.index for q in gate.qubits])
+
+    def do_gate_matrix(self, matrix, qubits):
+        """
+        Apply an arbitrary unitary to the state, see
+        :py:meth:`NumpyWavefunctionSimulator.do_gate_matrix`.
+        """
+        self.density = self._conjugate(self.density, matrix, qubits)
+        return self
+
+    def do_kraus(self, kraus_ops, qubits):
+        """
+        Apply the channel ``rho -> sum_k K_k rho K_k^dagger`` to the state.
+
+        :param kraus_ops: The Kraus operators, with the same qubit ordering as
+            :py:meth:`do_gate_matrix`.
+        :param qubits: The qubits the channel acts on.
+        """
+        self.density = sum(self._conjugate(self.density, k, qubits) for k in kraus_ops)
+        return self
+
+    def _conjugate(self, density, matrix, qubits):
+        density = _apply_matrix(density, matrix, qubits)
+        return _apply_matrix(density, np.conj(matrix), [q + self.n_qubits for q in qubits])
+
+    def do_measurement(self, qubit):
+        """
+        Measure a qubit in the computational basis, collapsing the state.
+
+        :param int qubit: The qubit to measure.
+        :return: The measurement outcome, 0 or 1.
+        :rtype: int
+        """
+        diagonal = self._diagonal().reshape((2,) * self.n_qubits)
+        p_one = np.sum(diagonal[_axis_index(self.n_qubits, qubit, 1)])
+        outcome = int(self.rs.uniform() < p_one)
+
+        projector = np.zeros((2, 2))
+        projector[outcome, outcome] = 1
+        self.density = self._conjugate(self.density, projector, [qubit])
+        self.density /= p_one if outcome else 1 - p_one
+        return outcome
+
+    def sample_bitstrings(self, n_samples, qubits=None):
+        """
+        Sample measurement outcomes without collapsing the state.
+
+        :param int n_samples: The number of samples.
+        :param qubits: The qubits to sample, in the order of the returned columns. Defaults to
+            all qubits in order.
+        :return: An int array of shape ``(n_samples, len(qubits))``.
+        """
+        if qubits is None:
+            qubits = list(range(self.n_qubits))
+        if len(qubits) == 0:
+            return np.zeros((n_samples, 0), dtype=int)
+        probabilities = self._diagonal()
+        samples = self.rs.choice(probabilities.size, size=n_samples,
+                                 p=probabilities / probabilities.sum())
+        bits = np.unravel_index(samples, (2,) * self.n_qubits)
+        return np.array([bits[q] for q in qubits], dtype=int).reshape(len(qubits), n_samples).T
+
+    def _diagonal(self):
+        """
+        :return: The diagonal of the density matrix with qubit 0 as the most significant bit.
+        """
+        size = 2 ** self.n_qubits
+        return np.maximum(np.real(np.diagonal(self.density.reshape(size, size))), 0)
+
+    def expectation(self, operator):
+        """
+        Compute the expectation value of a Pauli operator in the current state.
+
+        :param operator: A PauliTerm or PauliSum on qubits ``< n_qubits``.
+        :return: The (real part of the) expectation value, including coefficients.
+        :rtype: float
+        """
+        if isinstance(operator, PauliTerm):
+            operator = PauliSum([operator])
+        size = 2 ** self.n_qubits
+        result = 0.0
+        for term in operator:
+            density = self.density
+            for qubit, op in term:
+                density = _apply_matrix(density, QUANTUM_GATES[op], [qubit])
+            result += term.coefficient * np.trace(density.reshape(size, size))
+        return float(np.real(result))
+
+
+def _apply_matrix(tensor, matrix, axes):
+    """
+    Contract a ``2**k`` by ``2**k`` matrix with ``k`` axes of a tensor of qubit axes. The first
+    of the axes corresponds to the most significant bit of the matrix's row and column indices.
+
+    :return: The new tensor, with the same axis order as the old one.
+    """
+    k = len(axes)
+    matrix = np.reshape(matrix, (2,) * 2 * k)
+    # tensordot puts the gate's output axes first, so move them back into place
+    result = np.tensordot(matrix, tensor, axes=(list(range(k, 2 * k)), list(axes)))
+    return np.moveaxis(result, list(range(k)), list(axes))
+
+
+def _axis_index(n_qubits, qubit, value):
+    """
+    :return: An index into a ``(2,) * n_qubits`` tensor selecting the slice where ``qubit`` has
+        the given value.
+    """
+    index = [slice(None)] * n_qubits
+    index[qubit] = value
+    return tuple(index)
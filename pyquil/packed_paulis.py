@@ -0,0 +1,578 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+"""
+A packed representation of sums of Pauli operators, backed by NumPy arrays.
+
+A :py:class:`PackedPauliSum` stores each term as a pair of bit masks, the qubits on which it
+acts with an ``X`` or ``Y`` and the qubits on which it acts with a ``Z`` or ``Y``, and a
+complex coefficient. Products, sums and commutation checks of many terms are then a handful of
+vectorized bitwise operations instead of a Python loop over the operators of each term.
+"""
+from numbers import Integral, Number
+
+import numpy as np
+
+from pyquil.paulis import PauliSum, PauliTerm
+
+# The number of bits in a word of the masks
+_WORD_SIZE = 64
+
+# The number of products that are formed at once when multiplying sums
+_CHUNK_SIZE = 1 << 20
+
+# The largest number of axes for which expectation values are summed with einsum
+_MAX_EINSUM_AXES = 10
+
+# The Walsh-Hadamard matrix of size 32. Its top left corners are the smaller ones.
+_HADAMARD = np.ones((1, 1))
+for _ in range(5):
+    _HADAMARD = np.kron(_HADAMARD, [[1, 1], [1, -1]])
+
+_POPCOUNT_TABLE = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+_PHASES = np.array([1, 1j, -1, -1j])
+
+_X_BITS = {'X': (1, 0), 'Y': (1, 1), 'Z': (0, 1)}
+_OPS = {(1, 0): 'X', (1, 1): 'Y', (0, 1): 'Z'}
+
+
+def popcount(words):
+    """
+    Count the set bits of the words along the last axis of an array.
+
+    :param np.ndarray words: An array of ``uint64``\\ s.
+    :return: An integer array with the last axis of ``words`` removed.
+    """
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=-1, dtype=np.int64)
+    counts = _POPCOUNT_TABLE[words.view(np.uint8)]
+    return counts.sum(axis=-1, dtype=np.int64)
+
+
+def _parity(words):
+    """
+    Decide which words of a ``uint64`` array have an odd number of set bits.
+    """
+    if hasattr(np, 'bitwise_count'):
+        return (np.bitwise_count(words) & 1).astype(bool)
+    for shift in 32, 16, 8, 4, 2, 1:
+        words = words ^ (words >> np.uint64(shift))
+    return (words & np.uint64(1)).astype(bool)
+
+
+def product_phases(x1, z1, x2, z2):
+    """
+    Compute the phases of the products of Pauli operators given by bit masks, so that
+    ``P(x1, z1) * P(x2, z2) = phase * P(x1 ^ x2, z1 ^ z2)``, where each ``P`` is a tensor
+    product of ``I``, ``X``, ``Y`` and ``Z``. The masks are broadcast against each other.
+
+    :return: The phases, one of 1, 1j, -1 and -1j, as a complex array.
+    """
+    x_only1, y1, z_only1 = x1 & ~z1, x1 & z1, z1 & ~x1
+    x_only2, y2, z_only2 = x2 & ~z2, x2 & z2, z2 & ~x2
+    # XY = iZ, YZ = iX and ZX = iY, and the reverse products have the opposite phase
+    plus = popcount((x_only1 & y2) | (y1 & z_only2) | (z_only1 & x_only2))
+    minus = popcount((y1 & x_only2) | (z_only1 & y2) | (x_only1 & z_only2))
+    return _PHASES[(plus - minus) % 4]
+
+
+def anticommutation_matrix(x1, z1, x2, z2):
+    """
+    Decide which pairs of Pauli operators given by bit masks anticommute, i.e. whose symplectic
+    inner product is odd.
+
+    :param x1: The X masks of the first operators, of shape (n, number of words).
+    :param z1: The Z masks of the first operators, of the same shape.
+    :param x2: The X masks of the second operators, of shape (m, number of words).
+    :param z2: The Z masks of the second operators, of the same shape.
+    :return: A boolean array of shape (n, m).
+    """
+    x1, z1 = x1[:, np.newaxis, :], z1[:, np.newaxis, :]
+    x2, z2 = x2[np.newaxis, :, :], z2[np.newaxis, :, :]
+    return _parity(np.bitwise_xor.reduce((x1 & z2) ^ (z1 & x2), axis=-1))
+
+
+def qubitwise_conflict_matrix(x1, z1, x2, z2):
+    """
+    Decide which pairs of Pauli operators given by bit masks do not commute qubit-wise, i.e. act
+    with different non-identity operators on some qubit. The arguments are as for
+    :py:func:`anticommutation_matrix`.
+
+    :return: A boolean array of shape (n, m).
+    """
+    # Two single-qubit operators other than the identity anticommute if and only if they differ
+    x1, z1 = x1[:, np.newaxis, :], z1[:, np.newaxis, :]
+    x2, z2 = x2[np.newaxis, :, :], z2[np.newaxis, :, :]
+    return np.bitwise_or.reduce((x1 & z2) ^ (z1 & x2), axis=-1) != 0
+
+
+class PackedPauliSum(object):
+    """
+    .. note:: Experimental
+
+    A sum of Pauli terms stored as arrays. Term ``i`` is ``coefficients[i]`` times the tensor
+    product over ``k`` of the operator on ``qubits[k]`` given by bit ``k % 64`` of
+    ``x[i, k // 64]`` and ``z[i, k // 64]``: ``I`` if neither is set, ``X`` if only the bit of
+    ``x`` is set, ``Z`` if only the bit of ``z`` is set and ``Y`` if both are set.
+
+    Convert a :py:class:`PauliSum` with :py:meth:`from_pauli_sum` (or
+    :py:meth:`PauliSum.packed`) and back with :py:meth:`to_pauli_sum`. Arithmetic with numbers
+    and other packed sums returns simplified packed sums, as does arithmetic with a PauliSum or
+    PauliTerm on the right. Convert PauliSums and PauliTerms on the left first, since their
+    operators do not know about packed sums.
+
+    :param qubits: The qubits the masks refer to, as ints or QubitPlaceholders.
+    :param x: A ``uint64`` array of shape (number of terms, number of words).
+    :param z: A ``uint64`` array of the same shape.
+    :param coefficients: A complex array of shape (number of terms,).
+    """
+
+    def __init__(self, qubits, x, z, coefficients):
+        self.qubits = tuple(qubits)
+        self.x = np.asarray(x, dtype=np.uint64)
+        self.z = np.asarray(z, dtype=np.uint64)
+        self.coefficients = np.asarray(coefficients, dtype=complex)
+
+        n_words = _n_words(len(self.qubits))
+        if self.x.ndim != 2 or self.x.shape != self.z.shape:
+            raise ValueError("x and z should be two-dimensional arrays of the same shape")
+        if self.x.shape[1] != n_words:
+            raise ValueError("{} qubits need masks of {} words, not {}"
+                             .format(len(self.qubits), n_words, self.x.shape[1]))
+        if self.coefficients.shape != (len(self.x),):
+            raise ValueError("coefficients should have shape (number of terms,)")
+        if len(set(self.qubits)) != len(self.qubits):
+            raise ValueError("qubits should be distinct")
+
+    @classmethod
+    def from_pauli_sum(cls, pauli_sum, qubits=None):
+        """
+        Pack a PauliSum (or PauliTerm, or sequence of PauliTerms).
+
+        :param pauli_sum: The terms to pack.
+        :param qubits: The qubits of the packed sum. Defaults to the qubits of the terms, in the
+            order in which they first appear.
+        :rtype: PackedPauliSum
+        """
+        if isinstance(pauli_sum, PauliTerm):
+            terms = [pauli_sum]
+        else:
+            terms = list(pauli_sum)
+        if qubits is None:
+            qubits = list(dict.fromkeys(q for term in terms for q in term.get_qubits()))
+        positions = {q: k for k, q in enumerate(qubits)}
+
+        # Collect the bits as Python ints, which is much faster than setting them one by one
+        n_words = _n_words(len(qubits))
+        x = np.zeros((len(terms), n_words), dtype=np.uint64)
+        z = np.zeros((len(terms), n_words), dtype=np.uint64)
+        for i, term in enumerate(terms):
+            x_bits, z_bits = 0, 0
+            for qubit, op in term._ops.items():
+                try:
+                    k = positions[qubit]
+                except KeyError:
+                    raise ValueError("{} acts on qubit {}, which is not one of {}"
+                                     .format(term, qubit, qubits))
+                x_bit, z_bit = _X_BITS[op]
+                x_bits |= x_bit << k
+                z_bits |= z_bit << k
+            for w in range(n_words):
+                x[i, w] = (x_bits >> (w * _WORD_SIZE)) & 0xFFFFFFFFFFFFFFFF
+                z[i, w] = (z_bits >> (w * _WORD_SIZE)) & 0xFFFFFFFFFFFFFFFF
+        coefficients = np.array([term.coefficient for term in terms], dtype=complex)
+        return cls(qubits, x, z, coefficients)
+
+    def to_pauli_sum(self):
+        """
+        Unpack this sum. The operators of each term are ordered like :py:attr:`qubits`.
+
+        :rtype: PauliSum
+        """
+        bits_x = self._bits(self.x)
+        bits_z = self._bits(self.z)
+        terms = []
+        for i, coefficient in enumerate(self.coefficients.tolist()):
+            term = PauliTerm.from_list([], coefficient)
+            for k in np.flatnonzero(bits_x[i] | bits_z[i]).tolist():
+                term._ops[self.qubits[k]] = _OPS[bits_x[i, k], bits_z[i, k]]
+            terms.append(term)
+        return PauliSum(terms)
+
+    def _bits(self, masks):
+        """
+        Unpack masks into an integer array of shape (number of terms, number of qubits).
+        """
+        positions = np.arange(len(self.qubits))
+        shifts = (positions % _WORD_SIZE).astype(np.uint64)
+        return ((masks[:, positions // _WORD_SIZE] >> shifts) & np.uint64(1)).astype(np.int64)
+
+    def with_qubits(self, qubits):
+        """
+        Re-pack this sum onto different qubits, which must include all qubits this sum acts on.
+
+        :param qubits: The new qubits.
+        :rtype: PackedPauliSum
+        """
+        qubits = tuple(qubits)
+        if qubits == self.qubits:
+            return self
+        positions = {q: k for k, q in enumerate(qubits)}
+        n_words = _n_words(len(qubits))
+        new = []
+        for masks in self.x, self.z:
+            bits = self._bits(masks).astype(np.uint64)
+            new_masks = np.zeros((len(self), n_words), dtype=np.uint64)
+            for k, qubit in enumerate(self.qubits):
+                if qubit in positions:
+                    word, shift = divmod(positions[qubit], _WORD_SIZE)
+                    new_masks[:, word] |= bits[:, k] << np.uint64(shift)
+                elif bits[:, k].any():
+                    raise ValueError("This sum acts on qubit {}, which is not one of {}"
+                                     .format(qubit, qubits))
+            new.append(new_masks)
+        return PackedPauliSum(qubits, new[0], new[1], self.coefficients)
+
+    def __len__(self):
+        return len(self.coefficients)
+
+    def __iter__(self):
+        return iter(self.to_pauli_sum())
+
+    def __str__(self):
+        return str(self.to_pauli_sum())
+
+    def __repr__(self):
+        return "<PackedPauliSum with {} terms on {} qubits>".format(len(self), len(self.qubits))
+
+    def copy(self):
+        return PackedPauliSum(self.qubits, self.x.copy(), self.z.copy(), self.coefficients.copy())
+
+    def simplify(self, atol=1e-8):
+        """
+        Combine like terms and drop the terms whose coefficient is zero (up to ``atol``). The
+        remaining terms are ordered by their first appearance.
+
+        :rtype: PackedPauliSum
+        """
+        if len(self) == 0:
+            return self.copy()
+        keys = np.ascontiguousarray(np.hstack([self.x, self.z]))
+        keys = keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).ravel()
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        coefficients = (np.bincount(inverse, self.coefficients.real, len(first)) +
+                        1j * np.bincount(inverse, self.coefficients.imag, len(first)))
+
+        order = np.argsort(first, kind='stable')
+        rows = first[order]
+        coefficients = coefficients[order]
+        keep = np.abs(coefficients) > atol
+        return PackedPauliSum(self.qubits, self.x[rows[keep]], self.z[rows[keep]],
+                              coefficients[keep])
+
+    def commutes_with(self, other):
+        """
+        Decide which terms of this sum commute with which terms of another.
+
+        :param other: A PackedPauliSum, PauliSum or PauliTerm.
+        :return: A boolean array of shape (len(self), len(other)).
+        """
+        left, right = _align(self, _as_packed(other))
+        return ~anticommutation_matrix(left.x, left.z, right.x, right.z)
+
+    def conflict_matrix(self, qubitwise=False):
+        """
+        Decide which pairs of terms of this sum do not commute, or do not commute qubit-wise.
+
+        :param bool qubitwise: Whether to check qubit-wise commutation.
+        :return: A symmetric boolean array of shape (len(self), len(self)).
+        """
+        conflicts = qubitwise_conflict_matrix if qubitwise else anticommutation_matrix
+        matrix = np.empty((len(self), len(self)), dtype=bool)
+        chunk = max(1, _CHUNK_SIZE // max(1, len(self) * self.x.shape[1]))
+        for start in range(0, len(self), chunk):
+            matrix[start:start + chunk] = conflicts(self.x[start:start + chunk],
+                                                    self.z[start:start + chunk], self.x, self.z)
+        return matrix
+
+    def to_sparse(self, n_qubits=None):
+        """
+        Build the matrix of this sum as a SciPy sparse matrix, without going through a dense
+        matrix. Basis states are ordered like the amplitudes of a
+        :py:class:`~pyquil.wavefunction.Wavefunction`, i.e. bit ``k`` of the index of a basis state
+        is the state of qubit ``k``. Requires SciPy.
+
+        :param int n_qubits: The number of qubits, which are numbered from 0. Defaults to one more
+            than the largest qubit this sum acts on.
+        :rtype: scipy.sparse.csr_matrix
+        """
+        from scipy.sparse import csr_matrix
+
+        packed = self._on_qubit_range(n_qubits)
+        dim = 2 ** len(packed.qubits)
+        if len(packed) == 0:
+            return csr_matrix((dim, dim), dtype=complex)
+
+        # A term maps basis state c to phase(c) times basis state c ^ x, so the terms with the same
+        # X mask have their entries in the same places: in row r, in column r ^ x
+        x, z = packed.x[:, 0], packed.z[:, 0]
+        flips, groups = np.unique(x, return_inverse=True)
+        phases = packed._phases()
+        rows = np.arange(dim, dtype=np.uint64)
+        data = np.zeros((len(flips), dim), dtype=complex)
+        for t, group in enumerate(groups.ravel().tolist()):
+            data[group] += np.where(_parity((rows ^ x[t]) & z[t]), -phases[t], phases[t])
+
+        columns = (rows[:, np.newaxis] ^ flips[np.newaxis, :]).astype(np.int64)
+        indptr = np.arange(0, dim * len(flips) + 1, len(flips))
+        matrix = csr_matrix((data.T.ravel(), columns.ravel(), indptr), shape=(dim, dim))
+        matrix.sort_indices()
+        matrix.eliminate_zeros()
+        return matrix
+
+    def to_linear_operator(self, n_qubits=None):
+        """
+        Wrap this sum as a SciPy linear operator, which multiplies vectors by the matrix of this
+        sum (see :py:meth:`to_sparse`) without building it. The vectors are permuted and negated
+        in place for each term, so memory use is a small multiple of the size of the vectors.
+        Requires SciPy.
+
+        :param int n_qubits: The number of qubits, at most 32. Defaults to one more than the
+            largest qubit this sum acts on.
+        :rtype: scipy.sparse.linalg.LinearOperator
+        """
+        from scipy.sparse.linalg import LinearOperator
+
+        packed = self._on_qubit_range(n_qubits)
+        adjoint = PackedPauliSum(packed.qubits, packed.x, packed.z, packed.coefficients.conj())
+        dim = 2 ** len(packed.qubits)
+        return LinearOperator((dim, dim), matvec=packed._apply, rmatvec=adjoint._apply,
+                              dtype=complex)
+
+    def expectations(self, amplitudes):
+        """
+        Compute the expectation value of each term of this sum in a state.
+
+        Terms with the same X mask are evaluated together: one pass over the amplitudes forms the
+        products ``conj(amplitudes[c ^ x]) * amplitudes[c]``, which are summed over the qubits on
+        which none of the terms acts with a ``Z`` or ``Y``. A Walsh-Hadamard transform of the
+        remaining, usually small, tensor then gives the expectation values of all the terms at
+        once. The cost is thus about one pass over the amplitudes for each different X mask.
+
+        :param amplitudes: The amplitudes of the state, ordered like the amplitudes of a
+            :py:class:`~pyquil.wavefunction.Wavefunction` on at least as many qubits as this sum
+            acts on.
+        :return: A complex array with the expectation value of each term, times its coefficient.
+        """
+        amplitudes = np.asarray(amplitudes, dtype=complex)
+        n = len(amplitudes).bit_length() - 1
+        packed = self._on_qubit_range(n)
+        if len(packed) == 0:
+            return np.zeros(0, dtype=complex)
+        conjugate = np.conj(amplitudes)
+        probabilities = np.abs(amplitudes) ** 2
+        # Axis n - 1 - k of the states reshaped to (2,) * n is qubit k
+        x_bits, z_bits = packed._bits(packed.x)[:, ::-1], packed._bits(packed.z)[:, ::-1]
+        phases = packed._phases()
+        results = np.zeros(len(packed), dtype=complex)
+
+        _, groups = np.unique(packed.x[:, 0], return_inverse=True)
+        order = np.argsort(groups.ravel(), kind='stable')
+        bounds = np.cumsum(np.bincount(groups.ravel()))
+        for members in np.split(order, bounds[:-1]):
+            flipped = x_bits[members[0]].astype(bool)
+            kept = z_bits[members].any(axis=0)
+            # Only the flipped and the kept axes need to be separate, so merge the others to make
+            # the arrays NumPy loops over have fewer, longer axes
+            shape, labels, axes = _merge_axes(flipped | kept)
+            if flipped.any():
+                operands = [np.flip(conjugate.reshape(shape),
+                                    tuple(axes[a] for a in np.flatnonzero(flipped))),
+                            amplitudes.reshape(shape)]
+            else:
+                # The products for diagonal terms are the probabilities, which are real
+                operands = [probabilities.reshape(shape)]
+            kept_axes = [axes[a] for a in np.flatnonzero(kept)]
+            if len(kept_axes) <= _MAX_EINSUM_AXES:
+                subscripts = '{}->{}'.format(','.join([labels] * len(operands)),
+                                             ''.join(labels[a] for a in kept_axes))
+                products = np.einsum(subscripts, *operands)
+            else:
+                # einsum is slow to write to many small axes, so multiply and sum separately
+                products = operands[0] * operands[1] if flipped.any() else operands[0]
+                summed = tuple(sorted(set(range(len(shape))) - set(kept_axes)))
+                products = products.sum(axis=summed) if summed else products
+            products = _walsh_hadamard(products)
+            indices = tuple(z_bits[members][:, kept].T)
+            results[members] = phases[members] * products[indices]
+        return results
+
+    def _on_qubit_range(self, n_qubits):
+        """
+        Re-pack this sum onto the qubits 0 to ``n_qubits - 1``.
+        """
+        if not all(isinstance(q, Integral) for q in self.qubits):
+            raise ValueError("Only sums on integer qubits have a matrix")
+        if n_qubits is None:
+            n_qubits = max(self.qubits) + 1 if self.qubits else 0
+        if n_qubits >= _WORD_SIZE:
+            raise ValueError("{} qubits are too many to build a matrix for".format(n_qubits))
+        return self.with_qubits(range(n_qubits))
+
+    def _phases(self):
+        """
+        The coefficients of the terms times the phases of writing them as products of X's and Z's,
+        using ``Y = iXZ``.
+        """
+        return self.coefficients * _PHASES[popcount(self.x & self.z) % 4]
+
+    def _apply(self, vector):
+        """
+        Multiply a vector, or each column of a matrix, of amplitudes on the qubits 0 to
+        ``len(self.qubits) - 1`` by the matrix of this sum.
+        """
+        n = len(self.qubits)
+        vector = np.asarray(vector)
+        # Qubit k is axis n - 1 - k of the tensor, followed by an axis for the columns
+        tensor = vector.reshape((2,) * n + (-1,))
+        result = np.zeros(tensor.shape, dtype=np.result_type(vector, complex))
+        x_bits, z_bits = self._bits(self.x), self._bits(self.z)
+        for t, phase in enumerate(self._phases().tolist()):
+            flipped = tuple(n - 1 - k for k in np.flatnonzero(x_bits[t]).tolist())
+            term = phase * np.flip(tensor, flipped)
+            # The sign depends on the state the amplitude came from, before the flip
+            for k in np.flatnonzero(z_bits[t]).tolist():
+                index = [slice(None)] * (n + 1)
+                index[n - 1 - k] = 1 - x_bits[t, k]
+                term[tuple(index)] *= -1
+            result += term
+        return result.reshape(vector.shape)
+
+    def __add__(self, other):
+        if isinstance(other, Number):
+            other = PauliTerm("I", 0, other)
+        left, right = _align(self, _as_packed(other))
+        return PackedPauliSum(left.qubits, np.vstack([left.x, right.x]),
+                              np.vstack([left.z, right.z]),
+                              np.concatenate([left.coefficients, right.coefficients])).simplify()
+
+    def __radd__(self, other):
+        return self + other
+
+    def __sub__(self, other):
+        return self + -1. * other
+
+    def __rsub__(self, other):
+        return other + -1. * self
+
+    def __neg__(self):
+        return -1. * self
+
+    def __mul__(self, other):
+        if isinstance(other, Number):
+            return PackedPauliSum(self.qubits, self.x, self.z,
+                                  self.coefficients * other).simplify()
+        left, right = _align(self, _as_packed(other))
+        if len(left) == 0 or len(right) == 0:
+            return PackedPauliSum(left.qubits, left.x[:0], left.z[:0], left.coefficients[:0])
+
+        chunk = max(1, _CHUNK_SIZE // len(right))
+        pieces = []
+        for start in range(0, len(left), chunk):
+            x1 = left.x[start:start + chunk, np.newaxis, :]
+            z1 = left.z[start:start + chunk, np.newaxis, :]
+            x2, z2 = right.x[np.newaxis, :, :], right.z[np.newaxis, :, :]
+            phases = product_phases(x1, z1, x2, z2)
+            coefficients = (left.coefficients[start:start + chunk, np.newaxis] *
+                            right.coefficients[np.newaxis, :] * phases)
+            n_words = left.x.shape[1]
+            pieces.append(PackedPauliSum(left.qubits, (x1 ^ x2).reshape(-1, n_words),
+                                         (z1 ^ z2).reshape(-1, n_words),
+                                         coefficients.ravel()).simplify())
+        return PackedPauliSum(left.qubits, np.vstack([p.x for p in pieces]),
+                              np.vstack([p.z for p in pieces]),
+                              np.concatenate([p.coefficients for p in pieces])).simplify()
+
+    def __rmul__(self, other):
+        return self * other
+
+
+def _walsh_hadamard(products):
+    """
+    Compute the Walsh-Hadamard transform of an array of shape ``(2,) * k``, i.e. the array whose
+    entry ``z`` is the sum over ``c`` of entry ``c`` of ``products`` times
+    ``(-1) ** popcount(c & z)``, where the indices are read as binary numbers.
+    """
+    vector = np.ascontiguousarray(products).reshape(-1)
+    # The first few stages only combine neighbouring entries, so do them at once with a matrix
+    block = min(len(vector), len(_HADAMARD))
+    vector = vector.reshape(-1, block).dot(_HADAMARD[:block, :block]).reshape(-1)
+    half = block
+    while half < len(vector):
+        pairs = vector.reshape(-1, 2 * half)
+        even = pairs[:, :half].copy()
+        pairs[:, :half] += pairs[:, half:]
+        np.subtract(even, pairs[:, half:], out=pairs[:, half:])
+        half *= 2
+    return vector.reshape(np.shape(products))
+
+
+def _merge_axes(separate):
+    """
+    Describe a view of a state of shape ``(2,) * len(separate)`` in which the runs of axes that
+    need not be separate are merged into one.
+
+    :param separate: A boolean array saying which axes should stay separate.
+    :return: The shape of the view, an einsum label for each of its axes, and a dict from the
+        original axes which stay separate to their axis in the view.
+    """
+    shape, axes = [], {}
+    for axis, keep in enumerate(separate.tolist()):
+        if keep:
+            axes[axis] = len(shape)
+            shape.append(2)
+        elif shape and axis - 1 not in axes and axis > 0:
+            shape[-1] *= 2
+        else:
+            shape.append(2)
+    labels = 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'[:len(shape)]
+    return tuple(shape), labels, axes
+
+
+def _n_words(n_qubits):
+    return max(1, -(-n_qubits // _WORD_SIZE))
+
+
+def _as_packed(other):
+    if isinstance(other, PackedPauliSum):
+        return other
+    if isinstance(other, (PauliSum, PauliTerm)):
+        return PackedPauliSum.from_pauli_sum(other)
+    raise TypeError("Can't combine a PackedPauliSum with an object of type {}"
+                    .format(type(other)))
+
+
+def _align(left, right):
+    """
+    Re-pack two sums onto the union of their qubits.
+    """
+    if left.qubits == right.qubits:
+        return left, right
+    left_qubits = set(left.qubits)
+    qubits = left.qubits + tuple(q for q in right.qubits if q not in left_qubits)
+    return left.with_qubits(qubits), right.with_qubits(qubits)
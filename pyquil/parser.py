@@ -16,26 +16,131 @@
 """
 Module for parsing Quil programs from text into PyQuil objects
 """
+import hashlib
+from collections import namedtuple
+from typing import Hashable, Iterable, Iterator, List, Optional
+
+from pyquil._lru_cache import LRUCache
 from pyquil.quil import Program
+from pyquil.quilbase import AbstractInstruction
 
 from pyquil._parser.PyQuilListener import run_parser
+from pyquil._parser.fast_parser import run_fast_parser, iter_fast_parser
+
+PARSER_BACKENDS = {
+    'fast': run_fast_parser,
+    'antlr': run_parser,
+}
+"""
+Available parser backends. ``fast`` is a hand-written parser and is the default. ``antlr`` is the
+parser generated from the reference grammar in ``pyquil/_parser/Quil.g4``. Both produce identical
+instructions.
+"""
+
+
+ParseCacheInfo = namedtuple('ParseCacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+class ParseCache(LRUCache):
+    """
+    A bounded least-recently-used cache of parsed Quil programs.
+
+    Entries are keyed on a hash of the Quil text so that large programs are not kept alive as
+    dictionary keys. Since instructions are treated as immutable (see :py:meth:`Program.copy`),
+    the cache hands out shallow copies of the cached instruction lists.
+
+    :param int maxsize: The maximum number of programs to keep. A size of 0 disables the cache.
+    """
+
+    def get(self, key):
+        # type: (Hashable) -> Optional[List[AbstractInstruction]]
+        """
+        Look up the instructions stored under ``key``, updating the hit and miss counters.
+
+        :return: a copy of the cached list of instructions, or None
+        """
+        instructions = super().get(key)
+        return list(instructions) if instructions is not None else None
+
+    def put(self, key, instructions):
+        # type: (Hashable, List[AbstractInstruction]) -> None
+        """
+        Store a copy of ``instructions`` under ``key``.
+        """
+        super().put(key, list(instructions))
 
+    def cache_info(self):
+        # type: () -> ParseCacheInfo
+        """
+        :return: the hit and miss counts, the maximum size and the current size of the cache
+        """
+        with self._lock:
+            return ParseCacheInfo(self.hits, self.misses, self._maxsize, len(self._entries))
 
-def parse_program(quil):
+
+parse_cache = ParseCache()
+"""
+The cache used by :py:func:`parse` and :py:func:`parse_program`. Set ``parse_cache.maxsize`` to
+bound its size, or to 0 to disable caching.
+"""
+
+
+def parse_program(quil, backend='fast'):
     """
     Parse a raw Quil program and return a PyQuil program.
 
     :param str quil: a single or multiline Quil program
+    :param str backend: which parser to use, one of the keys of ``PARSER_BACKENDS``
     :return: PyQuil Program object
     """
-    return Program(parse(quil))
+    return Program(parse(quil, backend=backend))
 
 
-def parse(quil):
+def parse(quil, backend='fast'):
     """
     Parse a raw Quil program and return a corresponding list of PyQuil objects.
 
+    Results are memoized in :py:data:`parse_cache`, so parsing the same text again only costs
+    hashing it and copying the list of instructions.
+
     :param str quil: a single or multiline Quil program
+    :param str backend: which parser to use, one of the keys of ``PARSER_BACKENDS``
     :return: list of instructions
     """
-    return run_parser(quil)
+    try:
+        run = PARSER_BACKENDS[backend]
+    except KeyError:
+        raise ValueError("Unknown parser backend {}. Valid backends are {}"
+                         .format(backend, sorted(PARSER_BACKENDS)))
+    if parse_cache.maxsize == 0:
+        return run(quil)
+
+    key = (backend, hashlib.sha256(quil.encode('utf-8')).digest())
+    instructions = parse_cache.get(key)
+    if instructions is None:
+        instructions = run(quil)
+        parse_cache.put(key, instructions)
+    return instructions
+
+
+def iter_parse(fileobj):
+    # type: (Iterable[str]) -> Iterator[AbstractInstruction]
+    """
+    Lazily parse a Quil program, yielding one instruction at a time.
+
+    The program is read line by line, so very large programs can be streamed from disk into
+    :py:meth:`Program.inst` or straight into a serializer without holding the text or a parse
+    tree in memory::
+
+        with open('huge.quil') as f:
+            for instr in iter_parse(f):
+                ...
+
+    Multi-line ``DEFGATE`` and ``DEFCIRCUIT`` blocks are yielded once their last line has been
+    read. Parse errors are raised when the offending line is reached, so instructions before it
+    will already have been yielded. Results are not cached.
+
+    :param fileobj: a file object opened in text mode, or any other iterable of lines of Quil
+    :return: an iterator over the parsed instructions
+    """
+    return iter_fast_parser(fileobj)
@@ -117,7 +117,13 @@ class PauliTerm(object):
 
         :return: frozenset of strings representing Pauli operations
         """
-        return frozenset(self._ops.items())
+        return frozenset(self._ops_key())
+
+    def _ops_key(self):
+        """
+        The operations of this term as a tuple of (qubit, op) pairs, in order.
+        """
+        return tuple(self._ops.items())
 
     def __eq__(self, other):
         if not isinstance(other, (PauliTerm, PauliSum)):
@@ -303,6 +309,17 @@ class PauliTerm(object):
         out = "%s*%s" % (self.coefficient, '*'.join(term_strs))
         return out
 
+    def to_sparse(self, n_qubits=None):
+        """
+        Build the matrix of this term as a SciPy sparse matrix. See
+        :py:meth:`PauliSum.to_sparse`.
+
+        :param int n_qubits: The number of qubits, which are numbered from 0. Defaults to one more
+            than the largest qubit this term acts on.
+        :rtype: scipy.sparse.csr_matrix
+        """
+        return PauliSum([self]).to_sparse(n_qubits)
+
     @classmethod
     def from_list(cls, terms_list, coefficient=1.0):
         """
@@ -626,6 +643,41 @@ class PauliSum(object):
         """
         return simplify_pauli_sum(self)
 
+    def packed(self, qubits=None):
+        """
+        Convert this sum to a :py:class:`~pyquil.packed_paulis.PackedPauliSum`, which multiplies,
+        adds and compares large sums much faster.
+
+        :param qubits: The qubits of the packed sum. Defaults to the qubits of the terms, in the
+            order in which they first appear.
+        :rtype: PackedPauliSum
+        """
+        from pyquil.packed_paulis import PackedPauliSum
+        return PackedPauliSum.from_pauli_sum(self, qubits=qubits)
+
+    def to_sparse(self, n_qubits=None):
+        """
+        Build the matrix of this sum as a SciPy sparse matrix, whose rows and columns are ordered
+        like the amplitudes of a :py:class:`~pyquil.wavefunction.Wavefunction`. Requires SciPy.
+
+        :param int n_qubits: The number of qubits, which are numbered from 0. Defaults to one more
+            than the largest qubit this sum acts on.
+        :rtype: scipy.sparse.csr_matrix
+        """
+        return self.packed().to_sparse(n_qubits)
+
+    def to_linear_operator(self, n_qubits=None):
+        """
+        Wrap this sum as a SciPy linear operator, which multiplies vectors of amplitudes by its
+        matrix without building it, so that it works on many more qubits than
+        :py:meth:`to_sparse`. Requires SciPy.
+
+        :param int n_qubits: The number of qubits, which are numbered from 0. Defaults to one more
+            than the largest qubit this sum acts on.
+        :rtype: scipy.sparse.linalg.LinearOperator
+        """
+        return self.packed().to_linear_operator(n_qubits)
+
     def get_programs(self):
         """
         Get a Pyquil Program corresponding to each term in the PauliSum and a coefficient
@@ -639,33 +691,54 @@ class PauliSum(object):
 
 
 def simplify_pauli_sum(pauli_sum):
-    # You might want to use a defaultdict(list) here, but don't because
-    # we want to do our best to preserve the order of terms.
-    like_terms = OrderedDict()
-    for term in pauli_sum.terms:
-        key = term.operations_as_set()
-        if key in like_terms:
-            like_terms[key].append(term)
-        else:
-            like_terms[key] = [term]
+    """
+    Combine the like terms of a PauliSum, i.e. the terms with the same operations, and drop the
+    terms whose coefficient is close to zero. Terms are kept in the order in which they first
+    appear, and combined terms keep the order of operations of the first one. A warning is emitted
+    if terms with different orders of operations are combined.
+
+    :param PauliSum pauli_sum: The sum to simplify.
+    :rtype: PauliSum
+    """
+    # Number the groups of like terms in the order in which they first appear. Like terms almost
+    # always list their operations in the same order, so look them up by the ordered operations
+    # first and only fall back to the (slower to build) set of operations for new orders.
+    groups = {}
+    groups_by_set = {}
+    first_terms = []
+    indices = np.empty(len(pauli_sum.terms), dtype=int)
+    for i, term in enumerate(pauli_sum.terms):
+        ops = term._ops_key()
+        group = groups.get(ops)
+        if group is None:
+            ops_set = frozenset(ops)
+            group = groups_by_set.get(ops_set)
+            if group is None:
+                group = groups_by_set[ops_set] = len(first_terms)
+                first_terms.append(term)
+            else:
+                # This warns once per order of operations, like the default warnings filter
+                warnings.warn("The term {} will be combined with {}, but they have different "
+                              "orders of operations. This doesn't matter for QVM or "
+                              "wavefunction simulation but may be important when "
+                              "running on an actual device."
+                              .format(term.id(sort_ops=False),
+                                      first_terms[group].id(sort_ops=False)))
+            groups[ops] = group
+        indices[i] = group
+
+    coefficients = np.array([term.coefficient for term in pauli_sum.terms], dtype=complex)
+    n_groups = len(first_terms)
+    sizes = np.bincount(indices, minlength=n_groups)
+    sums = (np.bincount(indices, coefficients.real, n_groups) +
+            1j * np.bincount(indices, coefficients.imag, n_groups))
 
     terms = []
-    for term_list in like_terms.values():
-        first_term = term_list[0]
-        if len(term_list) == 1 and not np.isclose(first_term.coefficient, 0.0):
-            terms.append(first_term)
+    for group in np.flatnonzero(~np.isclose(sums, 0.0)).tolist():
+        if sizes[group] == 1:
+            terms.append(first_terms[group])
         else:
-            coeff = sum(t.coefficient for t in term_list)
-            for t in term_list:
-                if list(t._ops.items()) != list(first_term._ops.items()):
-                    warnings.warn("The term {} will be combined with {}, but they have different "
-                                  "orders of operations. This doesn't matter for QVM or "
-                                  "wavefunction simulation but may be important when "
-                                  "running on an actual device."
-                                  .format(t.id(sort_ops=False), first_term.id(sort_ops=False)))
-
-            if not np.isclose(coeff, 0.0):
-                terms.append(term_with_coeff(term_list[0], coeff))
+            terms.append(term_with_coeff(first_terms[group], sums[group]))
     return PauliSum(terms)
 
 
@@ -725,6 +798,82 @@ def commuting_sets(pauli_terms):
     return groups
 
 
+def commuting_groups(pauli_terms, qubitwise=True, strategy='dsatur'):
+    """
+    Partition the terms of a PauliSum into as few groups of commuting terms as this greedy
+    heuristic finds, so that each group can be measured with one measurement setting.
+
+    The terms are the vertices of a graph whose edges join terms that do not commute, and the
+    groups are the color classes of a greedy coloring of this graph. Terms which commute
+    qubit-wise, i.e. act with the same operator on each qubit on which they both act, can be
+    measured together in a product basis. Terms which only commute need an entangling circuit to
+    be measured together, but usually fall into fewer groups.
+
+    The graph is stored as a dense boolean matrix, i.e. it takes ``len(pauli_terms) ** 2`` bytes.
+
+    :param pauli_terms: A PauliSum or a list of PauliTerms.
+    :param bool qubitwise: Whether the terms of each group should commute qubit-wise, rather than
+        just commute.
+    :param str strategy: The order in which terms are assigned to groups. ``"largest_first"`` goes
+        through the terms with the most conflicts first. ``"dsatur"`` next assigns the term whose
+        conflicting terms are already spread over the most groups (Brelaz's DSATUR heuristic),
+        which is slower but often finds fewer groups.
+    :returns: A list of lists of PauliTerms, in which the terms are in their original order.
+    :rtype: list
+    """
+    from pyquil.packed_paulis import PackedPauliSum
+
+    if strategy not in ('largest_first', 'dsatur'):
+        raise ValueError("strategy should be 'largest_first' or 'dsatur', not {!r}"
+                         .format(strategy))
+    terms = pauli_terms.terms if isinstance(pauli_terms, PauliSum) else list(pauli_terms)
+    if len(terms) == 0:
+        return []
+    adjacency = PackedPauliSum.from_pauli_sum(terms).conflict_matrix(qubitwise=qubitwise)
+    colors = _greedy_coloring(adjacency, strategy)
+    return [[terms[i] for i in np.flatnonzero(colors == color)]
+            for color in range(colors.max() + 1)]
+
+
+def _greedy_coloring(adjacency, strategy):
+    """
+    Color a graph, given by a symmetric boolean adjacency matrix with a false diagonal, greedily:
+    each vertex in turn gets the smallest color that none of its neighbors has.
+
+    :return: An integer array of colors, numbered from 0 in the order in which they were first
+        used.
+    """
+    n = len(adjacency)
+    degrees = adjacency.sum(axis=1)
+    colors = np.full(n, -1, dtype=int)
+    # used[c, v] is whether a neighbor of v has color c. Rows are added as colors are used.
+    used = np.zeros((8, n), dtype=bool)
+    n_colors = 0
+    if strategy == 'largest_first':
+        order = np.argsort(-degrees, kind='stable').tolist()
+    else:
+        # The number of colors of each vertex's neighbors, with the degree as a tie-breaker
+        priority = degrees.astype(float)
+    for step in range(n):
+        if strategy == 'largest_first':
+            vertex = order[step]
+        else:
+            vertex = int(np.argmax(priority))
+            priority[vertex] = -np.inf
+        free = np.flatnonzero(~used[:n_colors, vertex])
+        color = int(free[0]) if len(free) else n_colors
+        if color == n_colors:
+            n_colors += 1
+            if n_colors > len(used):
+                used = np.vstack([used, np.zeros_like(used)])
+        colors[vertex] = color
+        neighbors = adjacency[vertex]
+        if strategy == 'dsatur':
+            priority += (n + 1) * (neighbors & ~used[color])
+        used[color] |= neighbors
+    return colors
+
+
 def is_identity(term):
     """
     Check if Pauli Term is a scalar multiple of identity
@@ -16,11 +16,13 @@
 """
 Module for creating and defining Quil programs.
 """
+import hashlib
 import itertools
 import types
 from typing import Iterable
 import warnings
-from collections import OrderedDict, defaultdict
+from collections import Counter, OrderedDict, defaultdict
+from collections.abc import Sequence
 from math import pi
 
 import numpy as np
@@ -28,7 +30,7 @@ from rpcq.core_messages import NativeQuilMetadata
 from six import string_types
 from typing import List, Dict
 
-from pyquil._parser.PyQuilListener import run_parser
+from pyquil._parser.fast_parser import run_fast_parser
 from pyquil.noise import _check_kraus_ops, _create_kraus_pragmas, pauli_kraus_map
 from pyquil.parameters import format_parameter
 from pyquil.quilatom import (LabelPlaceholder, QubitPlaceholder, unpack_qubit, Addr,
@@ -36,7 +38,7 @@ from pyquil.quilatom import (LabelPlaceholder, QubitPlaceholder, unpack_qubit, A
 from pyquil.gates import MEASURE, QUANTUM_GATES, H, RESET
 from pyquil.quilbase import (DefGate, Gate, Measurement, Pragma, AbstractInstruction, Qubit,
                              Jump, Label, JumpConditional, JumpTarget, JumpUnless, JumpWhen,
-                             Declare)
+                             Declare, _has_slot_params)
 
 
 class Program(object):
@@ -50,8 +52,24 @@ class Program(object):
         # Performance optimization: as stated above _instructions may contain placeholder
         # labels so the program must first be have its labels instantiated.
         # _synthesized_instructions is simply a cache on the result of the _synthesize()
-        # method.  It is marked as None whenever new instructions are added.
+        # method. Once built, it is kept up to date as instructions are added or popped (see
+        # _synthesize_instruction) so that interleaving appends with reads of `instructions` is
+        # linear rather than quadratic. It is marked as None whenever it must be rebuilt.
+        # `instructions` hands out views of its first _shared_length entries, so those entries
+        # are copied to a new list before any of them is changed, but appending is always free.
         self._synthesized_instructions = None
+        self._shared_length = 0
+
+        # Cache on the result of out(), which is requested repeatedly for the same program (by
+        # __eq__, and for every compiler and QVM request). It is cleared whenever the program
+        # is modified.
+        self._cached_out = None
+
+        # Bookkeeping for fingerprint(): the fingerprint of each prefix of the program, which is
+        # extended as instructions are added, and a cache on the overall result.
+        self._fingerprint_prefixes = []
+        self._slot_prefix = None
+        self._cached_fingerprint = None
 
         self.inst(*instructions)
 
@@ -76,6 +94,8 @@ class Program(object):
         new_prog = Program()
         new_prog._defined_gates = self._defined_gates.copy()
         new_prog._instructions = self._instructions.copy()
+        new_prog._cached_out = self._cached_out
+        new_prog._cached_fingerprint = self._cached_fingerprint
         if self.native_quil_metadata is not None:
             new_prog.native_quil_metadata = self.native_quil_metadata.copy()
         new_prog.num_shots = self.num_shots
@@ -92,10 +112,32 @@ class Program(object):
     def instructions(self):
         """
         Fill in any placeholders and return a list of quil AbstractInstructions.
+
+        The result is a read-only sequence which behaves like a list and is not affected by later
+        changes to the program.
+        """
+        instructions = self._synthesized()
+        self._shared_length = max(self._shared_length, len(instructions))
+        return InstructionsView(instructions, len(instructions))
+
+    def _synthesized(self):
+        """
+        Return the cached synthesized instructions, for reading only. Unlike `instructions` this
+        does not hand out a view of the list, so it is never copied because of this call.
         """
         if self._synthesized_instructions is None:
             self._synthesize()
+        return self._synthesized_instructions
 
+    def _own_synthesized(self, index):
+        """
+        Return the cached synthesized instructions for changing the entry at ``index`` (or, with
+        ``index`` equal to their length, for appending), first copying them if a view handed out
+        by `instructions` contains that entry.
+        """
+        if index < self._shared_length:
+            self._synthesized_instructions = list(self._synthesized_instructions)
+            self._shared_length = 0
         return self._synthesized_instructions
 
     def inst(self, *instructions):
@@ -122,7 +164,7 @@ class Program(object):
         :return: self for method chaining
         """
         for instruction in instructions:
-            if isinstance(instruction, list):
+            if isinstance(instruction, (list, InstructionsView)):
                 self.inst(*instruction)
             elif isinstance(instruction, types.GeneratorType):
                 self.inst(*instruction)
@@ -148,15 +190,14 @@ class Program(object):
                             rest = [possible_params] + list(rest)
                         self.gate(op, params, rest)
             elif isinstance(instruction, string_types):
-                self.inst(run_parser(instruction.strip()))
+                self.inst(run_fast_parser(instruction.strip()))
             elif isinstance(instruction, Program):
                 if id(self) == id(instruction):
                     raise ValueError("Nesting a program inside itself is not supported")
 
                 for defgate in instruction._defined_gates:
                     self.inst(defgate)
-                for instr in instruction._instructions:
-                    self.inst(instr)
+                self._extend(instruction._instructions)
 
             # Implementation note: these two base cases are the only ones which modify the program
             elif isinstance(instruction, DefGate):
@@ -166,14 +207,38 @@ class Program(object):
                                   .format(instruction.name))
 
                 self._defined_gates.append(instruction)
+                self._cached_out = None
+                self._cached_fingerprint = None
             elif isinstance(instruction, AbstractInstruction):
                 self._instructions.append(instruction)
-                self._synthesized_instructions = None
+                self._cached_out = None
+                self._cached_fingerprint = None
+                if self._synthesized_instructions is not None:
+                    self._synthesize_instruction(instruction)
             else:
                 raise TypeError("Invalid instruction: {}".format(instruction))
 
         return self
 
+    def _extend(self, instructions):
+        """
+        Append a list of instructions, skipping the type dispatch done by :py:meth:`inst`.
+
+        This is the fast path for bulk appends of instructions that are already known to be valid,
+        e.g. those of another Program. It must not be passed anything but AbstractInstructions,
+        and in particular no DefGates.
+
+        :param list instructions: The instructions to append.
+        :return: self for method chaining
+        """
+        self._instructions.extend(instructions)
+        self._cached_out = None
+        self._cached_fingerprint = None
+        if self._synthesized_instructions is not None:
+            for instr in instructions:
+                self._synthesize_instruction(instr)
+        return self
+
     def gate(self, name, params, qubits):
         """
         Add a gate to the program.
@@ -459,7 +524,7 @@ class Program(object):
         """
         return '\n'.join(itertools.chain(
             (dg.out() for dg in self._defined_gates),
-            (instr.out(allow_placeholders=allow_placeholders) for instr in self.instructions),
+            (instr.out(allow_placeholders=allow_placeholders) for instr in self._synthesized()),
             [''],
         ))
 
@@ -467,11 +532,60 @@ class Program(object):
         """
         Serializes the Quil program to a string suitable for submitting to the QVM or QPU.
         """
-        return '\n'.join(itertools.chain(
+        if self._cached_out is not None:
+            return self._cached_out
+        out = '\n'.join(itertools.chain(
             (dg.out() for dg in self._defined_gates),
-            (instr.out() for instr in self.instructions),
+            (instr.out() for instr in self._synthesized()),
             [''],
         ))
+        if not any(isinstance(instr, Gate) and _has_slot_params(instr.params)
+                   for instr in self._instructions):
+            self._cached_out = out
+        return out
+
+    def fingerprint(self):
+        """
+        Compute a hash of the contents of this program. Programs which serialize to the same
+        Quil have the same fingerprint, and unlike ``hash()`` it is stable across processes,
+        so it can be used as a key for caching e.g. compilation or execution results.
+
+        The fingerprint is computed incrementally from a digest of each instruction, so
+        fingerprinting a program again after appending to it only hashes the new instructions.
+
+        :return: A hex string.
+        :rtype: str
+        """
+        if self._cached_fingerprint is not None:
+            return self._cached_fingerprint
+
+        instructions = self._synthesized()
+        # The implicit declaration of ro at the top of the program depends on all of its
+        # instructions, so it is left out of the prefixes and prepended below.
+        offset = 0 if self._implicit_ro is None else 1
+
+        prefixes = self._fingerprint_prefixes
+        if self._slot_prefix is not None:
+            # Slot values may have changed since the prefixes were computed
+            del prefixes[self._slot_prefix:]
+            self._slot_prefix = None
+        fp = prefixes[-1] if prefixes else 0
+        for instr in itertools.islice(instructions, offset + len(prefixes), None):
+            if (self._slot_prefix is None and isinstance(instr, Gate)
+                    and _has_slot_params(instr.params)):
+                self._slot_prefix = len(prefixes)
+            fp = (fp * _FINGERPRINT_BASE + _instruction_digest(instr)) % _FINGERPRINT_MODULUS
+            prefixes.append(fp)
+
+        head = 0
+        for instr in itertools.chain(self._defined_gates, instructions[:offset]):
+            head = (head * _FINGERPRINT_BASE + _instruction_digest(instr)) % _FINGERPRINT_MODULUS
+        fp = (head * pow(_FINGERPRINT_BASE, len(prefixes), _FINGERPRINT_MODULUS) + fp) \
+            % _FINGERPRINT_MODULUS
+        fp = "{:032x}".format(fp)
+        if self._slot_prefix is None:
+            self._cached_fingerprint = fp
+        return fp
 
     def get_qubits(self, indices=True):
         """
@@ -493,7 +607,7 @@ class Program(object):
         :rtype: set
         """
         qubits = set()
-        for instr in self.instructions:
+        for instr in self._synthesized():
             if isinstance(instr, (Gate, Measurement)):
                 qubits |= instr.get_qubits(indices=indices)
         return qubits
@@ -517,7 +631,17 @@ class Program(object):
         :rtype: tuple
         """
         res = self._instructions.pop()
-        self._synthesized_instructions = None
+        self._cached_out = None
+        self._cached_fingerprint = None
+        del self._fingerprint_prefixes[len(self._instructions):]
+        if self._synthesized_instructions is not None:
+            if _has_label_placeholder(res):
+                # Label numbering depends on the order of first appearance, so start over
+                self._synthesized_instructions = None
+            else:
+                self._own_synthesized(len(self._synthesized_instructions) - 1).pop()
+                if self._track_ro(res, -1):
+                    self._update_implicit_ro()
         return res
 
     def dagger(self, inv_dict=None, suffix="-INV"):
@@ -579,10 +703,76 @@ class Program(object):
 
         :return: This object with the ``_synthesized_instructions`` member set.
         """
-        self._synthesized_instructions = instantiate_labels(self._instructions)
-        self._synthesized_instructions = implicitly_declare_ro(self._synthesized_instructions)
+        # This is equivalent to calling instantiate_labels and then implicitly_declare_ro, but
+        # leaves behind the bookkeeping needed to synthesize further instructions incrementally.
+        self._label_mapping = dict()
+        self._label_i = 1
+        self._declare_count = 0
+        self._foreign_measure_count = 0
+        self._ro_offsets = Counter()
+        self._implicit_ro = None
+        self._synthesized_instructions = []
+        self._shared_length = 0
+        self._fingerprint_prefixes = []
+        self._slot_prefix = None
+        for instr in self._instructions:
+            self._synthesize_instruction(instr)
         return self
 
+    def _synthesize_instruction(self, instr):
+        """
+        Append a single instruction to ``_synthesized_instructions``, instantiating its labels
+        and updating the implicit ``ro`` declaration.
+        """
+        instr, self._label_i = _instantiate_instruction_labels(instr, self._label_mapping,
+                                                               self._label_i)
+        self._own_synthesized(len(self._synthesized_instructions)).append(instr)
+        if self._track_ro(instr, 1):
+            self._update_implicit_ro()
+
+    def _track_ro(self, instr, count):
+        """
+        Count (or, with ``count=-1``, uncount) the declarations and measurements which determine
+        whether ``ro`` is implicitly declared. See :py:func:`implicitly_declare_ro`.
+
+        :return: True if the instruction was relevant.
+        """
+        if isinstance(instr, Declare):
+            self._declare_count += count
+        elif isinstance(instr, Measurement) and instr.classical_reg is not None:
+            if instr.classical_reg.name == 'ro':
+                self._ro_offsets[instr.classical_reg.offset] += count
+                if self._ro_offsets[instr.classical_reg.offset] == 0:
+                    del self._ro_offsets[instr.classical_reg.offset]
+            else:
+                self._foreign_measure_count += count
+        else:
+            return False
+        return True
+
+    def _update_implicit_ro(self):
+        """
+        Add, resize or remove the implicit ``ro`` declaration at the top of
+        ``_synthesized_instructions``.
+        """
+        if self._declare_count or self._foreign_measure_count or not self._ro_offsets:
+            if self._implicit_ro is not None:
+                self._synthesized_instructions = self._synthesized_instructions[1:]
+                self._shared_length = 0
+                self._implicit_ro = None
+            return
+
+        ro_size = max(self._ro_offsets) + 1
+        if self._implicit_ro is None:
+            warnings.warn("Please DECLARE all memory. I'm adding a declaration for the `ro` register, "
+                          "but I won't do this for you in the future.")
+            self._implicit_ro = Declare(name='ro', memory_type='BIT', memory_size=ro_size)
+            self._synthesized_instructions = [self._implicit_ro] + self._synthesized_instructions
+            self._shared_length = 0
+        elif self._implicit_ro.memory_size != ro_size:
+            self._implicit_ro = Declare(name='ro', memory_type='BIT', memory_size=ro_size)
+            self._own_synthesized(0)[0] = self._implicit_ro
+
     def __add__(self, other):
         """
         Concatenate two programs together, returning a new one.
@@ -613,7 +803,7 @@ class Program(object):
         :param index: The action at the specified index.
         :return:
         """
-        return self.instructions[index]
+        return self._synthesized()[index]
 
     def __iter__(self):
         """
@@ -624,7 +814,11 @@ class Program(object):
         return self.instructions.__iter__()
 
     def __eq__(self, other):
-        return isinstance(other, self.__class__) and self.out() == other.out()
+        if not isinstance(other, self.__class__):
+            return False
+        if self.fingerprint() != other.fingerprint():
+            return False
+        return self.out() == other.out()
 
     def __ne__(self, other):
         return not self.__eq__(other)
@@ -641,11 +835,81 @@ class Program(object):
         """
         return '\n'.join(itertools.chain(
             (str(dg) for dg in self._defined_gates),
-            (str(instr) for instr in self.instructions),
+            (str(instr) for instr in self._synthesized()),
             [''],
         ))
 
 
+class InstructionsView(Sequence):
+    """
+    A read-only view of the first ``length`` instructions of a list, as returned by
+    :py:attr:`Program.instructions`. It supports the read-only operations of a list, and compares
+    equal to lists with the same instructions.
+
+    Instructions appended to the program later are not part of the view, and the program copies
+    its list before changing any instruction that a view contains.
+    """
+    __slots__ = ('_instructions', '_length')
+
+    def __init__(self, instructions, length):
+        self._instructions = instructions
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._instructions[:self._length][index]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("instruction index out of range")
+        return self._instructions[index]
+
+    def __iter__(self):
+        return itertools.islice(self._instructions, self._length)
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, InstructionsView)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    def __radd__(self, other):
+        return list(other) + list(self)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def copy(self):
+        """
+        :return: The instructions as a new list.
+        """
+        return list(self)
+
+
+# Program fingerprints are a polynomial hash of the instruction digests below, which allows
+# extending them instruction by instruction.
+_FINGERPRINT_MODULUS = 2 ** 127 - 1
+_FINGERPRINT_BASE = 0x5a8c6b3d9e2f41a7c3b5d8e1f0a29647
+
+
+def _instruction_digest(instr):
+    """
+    A digest of an instruction's Quil which, unlike ``hash(instr)``, is stable across processes.
+    """
+    return int.from_bytes(hashlib.sha256(instr.out().encode()).digest()[:16], 'big')
+
+
 def _what_type_of_qubit_does_it_use(program):
     """Helper function to peruse through a program's qubits.
 
@@ -774,6 +1038,17 @@ def address_qubits(program, qubit_mapping=None):
     return Program(result)
 
 
+def _has_label_placeholder(instr):
+    """
+    Whether the instruction refers to a :py:class:`LabelPlaceholder`.
+    """
+    if isinstance(instr, (Jump, JumpConditional)):
+        return isinstance(instr.target, LabelPlaceholder)
+    if isinstance(instr, JumpTarget):
+        return isinstance(instr.label, LabelPlaceholder)
+    return False
+
+
 def _get_label(placeholder, label_mapping, label_i):
     """Helper function to either get the appropriate label for a given placeholder or generate
     a new label and update the mapping.
@@ -800,22 +1075,33 @@ def instantiate_labels(instructions):
     result = []
     label_mapping = dict()
     for instr in instructions:
-        if isinstance(instr, Jump) and isinstance(instr.target, LabelPlaceholder):
-            new_target, label_mapping, label_i = _get_label(instr.target, label_mapping, label_i)
-            result.append(Jump(new_target))
-        elif isinstance(instr, JumpConditional) and isinstance(instr.target, LabelPlaceholder):
-            new_target, label_mapping, label_i = _get_label(instr.target, label_mapping, label_i)
-            cls = instr.__class__  # Make the correct subclass
-            result.append(cls(new_target, instr.condition))
-        elif isinstance(instr, JumpTarget) and isinstance(instr.label, LabelPlaceholder):
-            new_label, label_mapping, label_i = _get_label(instr.label, label_mapping, label_i)
-            result.append(JumpTarget(new_label))
-        else:
-            result.append(instr)
+        instr, label_i = _instantiate_instruction_labels(instr, label_mapping, label_i)
+        result.append(instr)
 
     return result
 
 
+def _instantiate_instruction_labels(instr, label_mapping, label_i):
+    """Helper function to assign a label to any label placeholder in a single instruction,
+    updating ``label_mapping`` in place.
+
+    See :py:func:`instantiate_labels` for usage.
+
+    :return: tuple of (the instruction with its labels instantiated, the next label index)
+    """
+    if isinstance(instr, Jump) and isinstance(instr.target, LabelPlaceholder):
+        new_target, label_mapping, label_i = _get_label(instr.target, label_mapping, label_i)
+        return Jump(new_target), label_i
+    elif isinstance(instr, JumpConditional) and isinstance(instr.target, LabelPlaceholder):
+        new_target, label_mapping, label_i = _get_label(instr.target, label_mapping, label_i)
+        cls = instr.__class__  # Make the correct subclass
+        return cls(new_target, instr.condition), label_i
+    elif isinstance(instr, JumpTarget) and isinstance(instr.label, LabelPlaceholder):
+        new_label, label_mapping, label_i = _get_label(instr.label, label_mapping, label_i)
+        return JumpTarget(new_label), label_i
+    return instr, label_i
+
+
 def implicitly_declare_ro(instructions: List[AbstractInstruction]):
     """
     Implicitly declare a register named ``ro`` for backwards compatibility with Quil 1.
@@ -912,7 +1198,8 @@ def merge_programs(prog_list):
     :return: a single pyQuil program
     :rtype: Program
     """
-    definitions = [gate for prog in prog_list for gate in Program(prog).defined_gates]
+    programs = [prog if isinstance(prog, Program) else Program(prog) for prog in prog_list]
+    definitions = [gate for prog in programs for gate in prog.defined_gates]
     seen = {}
     # Collect definitions in reverse order and reapply definitions in reverse
     # collected order to ensure that the last occurrence of a definition is applied last.
@@ -928,7 +1215,10 @@ def merge_programs(prog_list):
             seen[name] = [definition]
     new_definitions = [gate for key in seen.keys() for gate in reversed(seen[key])]
 
-    p = sum([Program(prog).instructions for prog in prog_list], Program())  # Combine programs without gate definitions
+    # Combine programs without gate definitions
+    p = Program()
+    for prog in programs:
+        p._extend(prog.instructions)
 
     for definition in new_definitions:
         p.defgate(definition.name, definition.matrix, definition.parameters)
@@ -968,16 +1258,16 @@ def percolate_declares(program: Program) -> Program:
     :param program: Perhaps jumbled program.
     :return: Program with DECLAREs all at the top and otherwise the same sorted contents.
     """
-    declare_program = Program()
-    instrs_program = Program()
+    declares = []
+    instrs = []
 
     for instr in program:
         if isinstance(instr, Declare):
-            declare_program += instr
+            declares.append(instr)
         else:
-            instrs_program += instr
+            instrs.append(instr)
 
-    p = declare_program + instrs_program
+    p = Program()._extend(declares)._extend(instrs)
     p._defined_gates = program._defined_gates
 
     return p
@@ -26,6 +26,8 @@ class QuilAtom(object):
     Abstract class for atomic elements of Quil.
     """
 
+    __slots__ = ()
+
     def out(self):
         raise NotImplementedError()
 
@@ -46,13 +48,25 @@ class Qubit(QuilAtom):
     """
     Representation of a qubit.
 
+    Qubits with small indices are interned: ``Qubit(0) is Qubit(0)``. Like other atoms, they must
+    be treated as immutable.
+
     :param int index: Index of the qubit.
     """
 
-    def __init__(self, index):
+    __slots__ = ('index',)
+
+    def __new__(cls, index):
+        if type(index) is int and 0 <= index < len(_INTERNED_QUBITS):
+            return _INTERNED_QUBITS[index]
         if not (isinstance(index, integer_types) and index >= 0):
             raise TypeError("Addr index must be a non-negative int")
-        self.index = index
+        qubit = super(Qubit, cls).__new__(cls)
+        qubit.index = index
+        return qubit
+
+    def __getnewargs__(self):
+        return (self.index,)
 
     def out(self):
         return str(self.index)
@@ -70,7 +84,15 @@ class Qubit(QuilAtom):
         return isinstance(other, Qubit) and other.index == self.index
 
 
+# Shared Qubit instances for small indices, so that programs don't hold millions of equal Qubits.
+# The table must exist (empty) while it is being filled, since Qubit() looks indices up in it.
+_INTERNED_QUBITS = []
+_INTERNED_QUBITS[:] = [Qubit(i) for i in range(256)]
+
+
 class QubitPlaceholder(QuilAtom):
+    __slots__ = ()
+
     def out(self):
         raise RuntimeError("Qubit {} has not been assigned an index".format(self))
 
@@ -155,6 +177,8 @@ class Label(QuilAtom):
     :param string label_name: The label name.
     """
 
+    __slots__ = ('name',)
+
     def __init__(self, label_name):
         self.name = label_name
 
@@ -175,6 +199,8 @@ class Label(QuilAtom):
 
 
 class LabelPlaceholder(QuilAtom):
+    __slots__ = ('prefix',)
+
     def __init__(self, prefix="L"):
         self.prefix = prefix
 
@@ -249,6 +275,9 @@ class Expression(object):
 
     This class overrides all the Python operators that are supported by Quil.
     """
+
+    __slots__ = ()
+
     def __str__(self):
         return _expression_to_string(self)
 
@@ -574,6 +603,8 @@ class MemoryReference(QuilAtom, Expression):
         the declared variable is of length >1 or 1, resp.
     """
 
+    __slots__ = ('name', 'offset', 'declared_size')
+
     def __init__(self, name, offset=0, declared_size=None):
         if not isinstance(offset, integer_types) or offset < 0:
             raise TypeError("MemoryReference offset must be a non-negative int")
@@ -603,6 +634,9 @@ class MemoryReference(QuilAtom, Expression):
     def __hash__(self):
         return hash((self.name, self.offset))
 
+    def _substitute(self, d):
+        return d.get(self, self)
+
     def __getitem__(self, offset):
         if self.offset != 0:
             raise ValueError("Please only index off of the base MemoryReference (offset = 0)")
@@ -620,6 +654,8 @@ class Addr(MemoryReference):
     :param int value: The classical address.
     """
 
+    __slots__ = ()
+
     def __init__(self, value):
         warn("Addr objects have been deprecated. Defaulting to memory region \"ro\". Use MemoryReference instead.")
         if not isinstance(value, integer_types) or value < 0:
@@ -23,6 +23,7 @@ from warnings import warn
 from pyquil.parameters import Expression, _contained_parameters, format_parameter
 from pyquil.quilatom import (Qubit, MemoryReference, Label, unpack_qubit, QubitPlaceholder,
                              LabelPlaceholder)
+from pyquil.slot import Slot
 
 
 class AbstractInstruction(object):
@@ -30,6 +31,8 @@ class AbstractInstruction(object):
     Abstract class for representing single instructions.
     """
 
+    __slots__ = ()
+
     def out(self):
         pass
 
@@ -84,11 +87,21 @@ def _format_params(params):
     return "(" + ",".join(format_parameter(param) for param in params) + ")"
 
 
+def _has_slot_params(params):
+    """
+    Slots (see :py:mod:`pyquil.parametric`) are placeholders whose value can change after the
+    gate was created, so the serialization of a gate with Slot parameters cannot be cached.
+    """
+    return any(isinstance(param, Slot) for param in params)
+
+
 class Gate(AbstractInstruction):
     """
     This is the pyQuil object for a quantum gate instruction.
     """
 
+    __slots__ = ('_name', '_params', '_qubits', '_cached_out')
+
     def __init__(self, name, params, qubits):
         if not isinstance(name, string_types):
             raise TypeError("Gate name must be a string")
@@ -105,19 +118,56 @@ class Gate(AbstractInstruction):
             if not isinstance(qubit, (Qubit, QubitPlaceholder)):
                 raise TypeError("Gate arguments must all be Qubits")
 
-        self.name = name
-        self.params = params
-        self.qubits = qubits
+        self._name = name
+        self._params = params
+        self._qubits = qubits
+        # Formatting parameters is by far the most expensive part of serializing a program, so
+        # the result of out() is cached. Gates are treated as immutable, but reassigning any of
+        # the attributes below clears the cache to be safe. Gates with Slot parameters are never
+        # cached.
+        self._cached_out = None
+
+    @property
+    def name(self):
+        return self._name
+
+    @name.setter
+    def name(self, name):
+        self._name = name
+        self._cached_out = None
+
+    @property
+    def params(self):
+        return self._params
+
+    @params.setter
+    def params(self, params):
+        self._params = params
+        self._cached_out = None
+
+    @property
+    def qubits(self):
+        return self._qubits
+
+    @qubits.setter
+    def qubits(self, qubits):
+        self._qubits = qubits
+        self._cached_out = None
 
     def get_qubits(self, indices=True):
-        return {_extract_qubit_index(q, indices) for q in self.qubits}
+        return {_extract_qubit_index(q, indices) for q in self._qubits}
 
     def out(self):
-        if self.params:
-            return "{}{} {}".format(self.name, _format_params(self.params),
-                                    _format_qubits_out(self.qubits))
+        if self._cached_out is not None:
+            return self._cached_out
+        if self._params:
+            out = "{}{} {}".format(self._name, _format_params(self._params),
+                                   _format_qubits_out(self._qubits))
+            if not _has_slot_params(self._params):
+                self._cached_out = out
         else:
-            return "{} {}".format(self.name, _format_qubits_out(self.qubits))
+            out = self._cached_out = "{} {}".format(self._name, _format_qubits_out(self._qubits))
+        return out
 
     def __repr__(self):
         return "<Gate " + str(self) + ">"
@@ -135,6 +185,8 @@ class Measurement(AbstractInstruction):
     This is the pyQuil object for a Quil measurement instruction.
     """
 
+    __slots__ = ('qubit', 'classical_reg')
+
     def __init__(self, qubit, classical_reg=None):
         if not isinstance(qubit, (Qubit, QubitPlaceholder)):
             raise TypeError("qubit should be a Qubit")
@@ -165,6 +217,8 @@ class ResetQubit(AbstractInstruction):
     This is the pyQuil object for a Quil targeted reset instruction.
     """
 
+    __slots__ = ('qubit',)
+
     def __init__(self, qubit):
         if not isinstance(qubit, (Qubit, QubitPlaceholder)):
             raise TypeError("qubit should be a Qubit")
@@ -189,6 +243,8 @@ class DefGate(AbstractInstruction):
     :param list parameters: list of parameters that are used in this gate
     """
 
+    __slots__ = ('name', 'matrix', 'parameters')
+
     def __init__(self, name, matrix, parameters=None):
         if not isinstance(name, string_types):
             raise TypeError("Gate name must be a string")
@@ -288,6 +344,8 @@ class JumpTarget(AbstractInstruction):
     Representation of a target that can be jumped to.
     """
 
+    __slots__ = ('label',)
+
     def __init__(self, label):
         if not isinstance(label, (Label, LabelPlaceholder)):
             raise TypeError("label must be a Label")
@@ -305,6 +363,8 @@ class JumpConditional(AbstractInstruction):
     Abstract representation of an conditional jump instruction.
     """
 
+    __slots__ = ('target', 'condition')
+
     def __init__(self, target, condition):
         if not isinstance(target, (Label, LabelPlaceholder)):
             raise TypeError("target should be a Label")
@@ -321,6 +381,8 @@ class JumpWhen(JumpConditional):
     """
     The JUMP-WHEN instruction.
     """
+
+    __slots__ = ()
     op = "JUMP-WHEN"
 
 
@@ -328,6 +390,8 @@ class JumpUnless(JumpConditional):
     """
     The JUMP-UNLESS instruction.
     """
+
+    __slots__ = ()
     op = "JUMP-UNLESS"
 
 
@@ -336,6 +400,8 @@ class SimpleInstruction(AbstractInstruction):
     Abstract class for simple instructions with no arguments.
     """
 
+    __slots__ = ()
+
     def out(self):
         return self.op
 
@@ -344,6 +410,8 @@ class Halt(SimpleInstruction):
     """
     The HALT instruction.
     """
+
+    __slots__ = ()
     op = "HALT"
 
 
@@ -351,6 +419,8 @@ class Wait(SimpleInstruction):
     """
     The WAIT instruction.
     """
+
+    __slots__ = ()
     op = "WAIT"
 
 
@@ -358,6 +428,8 @@ class Reset(SimpleInstruction):
     """
     The RESET instruction.
     """
+
+    __slots__ = ()
     op = "RESET"
 
 
@@ -365,6 +437,8 @@ class Nop(SimpleInstruction):
     """
     The NOP instruction.
     """
+
+    __slots__ = ()
     op = "NOP"
 
 
@@ -373,6 +447,8 @@ class UnaryClassicalInstruction(AbstractInstruction):
     The abstract class for unary classical instructions.
     """
 
+    __slots__ = ('target',)
+
     def __init__(self, target):
         if not isinstance(target, MemoryReference):
             raise TypeError("target operand should be an MemoryReference")
@@ -386,6 +462,8 @@ class ClassicalNeg(UnaryClassicalInstruction):
     """
     The NEG instruction.
     """
+
+    __slots__ = ()
     op = "NEG"
 
 
@@ -393,6 +471,8 @@ class ClassicalNot(UnaryClassicalInstruction):
     """
     The NOT instruction.
     """
+
+    __slots__ = ()
     op = "NOT"
 
 
@@ -401,6 +481,8 @@ class LogicalBinaryOp(AbstractInstruction):
     The abstract class for binary logical classical instructions.
     """
 
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         if not isinstance(left, MemoryReference):
             raise TypeError("left operand should be an MemoryReference")
@@ -424,6 +506,7 @@ class ClassicalAnd(LogicalBinaryOp):
         AND %target %source
     """
 
+    __slots__ = ()
     op = "AND"
 
 
@@ -431,6 +514,8 @@ class ClassicalInclusiveOr(LogicalBinaryOp):
     """
     The IOR instruction.
     """
+
+    __slots__ = ()
     op = "IOR"
 
 
@@ -438,6 +523,8 @@ class ClassicalExclusiveOr(LogicalBinaryOp):
     """
     The XOR instruction.
     """
+
+    __slots__ = ()
     op = "XOR"
 
 
@@ -446,6 +533,8 @@ class ClassicalOr(ClassicalInclusiveOr):
     Deprecated class.
     """
 
+    __slots__ = ()
+
     def __init__(self, left, right):
         warn("ClassicalOr has been deprecated. Replacing with ClassicalInclusiveOr. " +
              "Use ClassicalInclusiveOr instead. " +
@@ -458,6 +547,8 @@ class ArithmeticBinaryOp(AbstractInstruction):
     The abstract class for binary arithmetic classical instructions.
     """
 
+    __slots__ = ('left', 'right')
+
     def __init__(self, left, right):
         if not isinstance(left, MemoryReference):
             raise TypeError("left operand should be an MemoryReference")
@@ -474,6 +565,8 @@ class ClassicalAdd(ArithmeticBinaryOp):
     """
     The ADD instruction.
     """
+
+    __slots__ = ()
     op = "ADD"
 
 
@@ -481,6 +574,8 @@ class ClassicalSub(ArithmeticBinaryOp):
     """
     The SUB instruction.
     """
+
+    __slots__ = ()
     op = "SUB"
 
 
@@ -488,6 +583,8 @@ class ClassicalMul(ArithmeticBinaryOp):
     """
     The MUL instruction.
     """
+
+    __slots__ = ()
     op = "MUL"
 
 
@@ -495,6 +592,8 @@ class ClassicalDiv(ArithmeticBinaryOp):
     """
     The DIV instruction.
     """
+
+    __slots__ = ()
     op = "DIV"
 
 
@@ -506,6 +605,8 @@ class ClassicalMove(AbstractInstruction):
              In pyQuil 1.9, the order of operands was MOVE <source> <target>.
              These have reversed.
     """
+
+    __slots__ = ('left', 'right')
     op = "MOVE"
 
     def __init__(self, left, right):
@@ -528,6 +629,8 @@ class ClassicalFalse(ClassicalMove):
     Deprecated class.
     """
 
+    __slots__ = ()
+
     def __init__(self, target):
         super().__init__(target, 0)
         warn("ClassicalFalse is deprecated in favor of ClassicalMove.")
@@ -538,6 +641,8 @@ class ClassicalTrue(ClassicalMove):
     Deprecated class.
     """
 
+    __slots__ = ()
+
     def __init__(self, target):
         super().__init__(target, 1)
         warn("ClassicalTrue is deprecated in favor of ClassicalMove.")
@@ -548,6 +653,8 @@ class ClassicalExchange(AbstractInstruction):
     The EXCHANGE instruction.
     """
 
+    __slots__ = ('left', 'right')
+
     op = "EXCHANGE"
 
     def __init__(self, left, right):
@@ -567,6 +674,8 @@ class ClassicalConvert(AbstractInstruction):
     The CONVERT instruction.
     """
 
+    __slots__ = ('left', 'right')
+
     op = "CONVERT"
 
     def __init__(self, left, right):
@@ -586,6 +695,8 @@ class ClassicalLoad(AbstractInstruction):
     The LOAD instruction.
     """
 
+    __slots__ = ('target', 'left', 'right')
+
     op = "LOAD"
 
     def __init__(self, target, left, right):
@@ -606,6 +717,8 @@ class ClassicalStore(AbstractInstruction):
     The STORE instruction.
     """
 
+    __slots__ = ('target', 'left', 'right')
+
     op = "STORE"
 
     def __init__(self, target, left, right):
@@ -626,6 +739,8 @@ class ClassicalComparison(AbstractInstruction):
     Abstract class for ternary comparison instructions.
     """
 
+    __slots__ = ('target', 'left', 'right')
+
     def __init__(self, target, left, right):
         if not isinstance(target, MemoryReference):
             raise TypeError("target operand should be an MemoryReference")
@@ -644,6 +759,7 @@ class ClassicalEqual(ClassicalComparison):
     The EQ comparison instruction.
     """
 
+    __slots__ = ()
     op = "EQ"
 
 
@@ -652,6 +768,7 @@ class ClassicalLessThan(ClassicalComparison):
     The LT comparison instruction.
     """
 
+    __slots__ = ()
     op = "LT"
 
 
@@ -660,6 +777,7 @@ class ClassicalLessEqual(ClassicalComparison):
     The LE comparison instruction.
     """
 
+    __slots__ = ()
     op = "LE"
 
 
@@ -668,6 +786,7 @@ class ClassicalGreaterThan(ClassicalComparison):
     The GT comparison instruction.
     """
 
+    __slots__ = ()
     op = "GT"
 
 
@@ -676,6 +795,7 @@ class ClassicalGreaterEqual(ClassicalComparison):
     The GE comparison instruction.
     """
 
+    __slots__ = ()
     op = "GE"
 
 
@@ -684,6 +804,8 @@ class Jump(AbstractInstruction):
     Representation of an unconditional jump instruction (JUMP).
     """
 
+    __slots__ = ('target',)
+
     def __init__(self, target):
         if not isinstance(target, (Label, LabelPlaceholder)):
             raise TypeError("target should be a Label")
@@ -703,6 +825,8 @@ class Pragma(AbstractInstruction):
 
     """
 
+    __slots__ = ('command', 'args', 'freeform_string')
+
     def __init__(self, command, args=(), freeform_string=""):
         if not isinstance(command, string_types):
             raise TypeError("Pragma's require an identifier.")
@@ -743,6 +867,8 @@ class Declare(AbstractInstruction):
 
     """
 
+    __slots__ = ('name', 'memory_type', 'memory_size', 'shared_region', 'offsets')
+
     def __init__(self, name, memory_type, memory_size=1, shared_region=None, offsets=None):
         self.name = name
         self.memory_type = memory_type
@@ -780,6 +906,8 @@ class RawInstr(AbstractInstruction):
     A raw instruction represented as a string.
     """
 
+    __slots__ = ('instr',)
+
     def __init__(self, instr_str):
         if not isinstance(instr_str, string_types):
             raise TypeError("Raw instructions require a string.")
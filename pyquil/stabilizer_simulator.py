@@ -0,0 +1,347 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+"""
+A simulator for Clifford circuits which keeps track of the stabilizers of the state instead of
+its amplitudes, following Aaronson and Gottesman, "Improved simulation of stabilizer circuits",
+Phys. Rev. A 70, 052328 (2004). Gates take ``O(n)`` and measurements ``O(n**2)`` time, so
+circuits on thousands of qubits can be simulated.
+"""
+import numpy as np
+
+from pyquil.api._pyqvm import AbstractQuantumSimulator
+from pyquil.paulis import PauliSum, PauliTerm
+
+CLIFFORD_GATES = {'I', 'X', 'Y', 'Z', 'H', 'S', 'CNOT', 'CZ', 'SWAP',
+                  'PHASE', 'RX', 'RY', 'RZ'}
+"""
+The gates understood by :py:class:`StabilizerSimulator`. ``PHASE``, ``RX``, ``RY`` and ``RZ`` are
+only Clifford gates (and accepted) when their angle is a multiple of pi/2.
+"""
+
+
+class StabilizerSimulator(AbstractQuantumSimulator):
+    """
+    A stabilizer simulator for circuits of the gates in :py:data:`CLIFFORD_GATES`.
+
+    The state is stored as a tableau of ``2 * n_qubits`` Pauli operators: rows ``0 .. n - 1``
+    are the destabilizers and rows ``n .. 2n - 1`` the stabilizers. Row ``i`` is the Pauli
+    operator with an ``X`` on qubit ``j`` if ``x[i, j]``, a ``Z`` if ``z[i, j]``, a ``Y`` if both,
+    and the sign ``(-1)**r[i]``.
+
+    :param n_qubits: The number of qubits to simulate.
+    :param rs: A ``np.random.RandomState`` used for measurements and sampling. Defaults to a
+        fresh, randomly seeded one.
+    """
+
+    def __init__(self, n_qubits, rs=None):
+        self.n_qubits = n_qubits
+        self.rs = rs if rs is not None else np.random.RandomState()
+        self.x = self.z = self.r = None
+        self.reset()
+
+    def reset(self):
+        """
+        Reset the state to the all-zeros state, which is stabilized by ``Z`` on every qubit.
+        """
+        n = self.n_qubits
+        self.x = np.zeros((2 * n, n), dtype=bool)
+        self.z = np.zeros((2 * n, n), dtype=bool)
+        self.x[np.arange(n), np.arange(n)] = True
+        self.z[np.arange(n, 2 * n), np.arange(n)] = True
+        # A column of signs per row. Sampling adds more columns, see sample_bitstrings
+        self.r = np.zeros((2 * n, 1), dtype=bool)
+        return self
+
+    def copy(self):
+        """
+        :return: An independent copy of this simulator sharing the random state.
+        :rtype: StabilizerSimulator
+        """
+        new = StabilizerSimulator.__new__(StabilizerSimulator)
+        new.n_qubits = self.n_qubits
+        new.rs = self.rs
+        new.x, new.z, new.r = self.x.copy(), self.z.copy(), self.r.copy()
+        return new
+
+    @property
+    def stabilizers(self):
+        """
+        :return: The stabilizer generators of the current state.
+        :rtype: List[PauliTerm]
+        """
+        return [self._row_to_pauli(i) for i in range(self.n_qubits, 2 * self.n_qubits)]
+
+    def _row_to_pauli(self, i):
+        term = PauliTerm("I", 0, -1.0 if self.r[i, 0] else 1.0)
+        for qubit in np.flatnonzero(self.x[i] | self.z[i]).tolist():
+            op = {(True, False): "X", (True, True): "Y", (False, True): "Z"}[
+                (bool(self.x[i, qubit]), bool(self.z[i, qubit]))]
+            term *= PauliTerm(op, qubit)
+        return term
+
+    def do_gate(self, gate):
+        """
+        Apply a Clifford gate to the state.
+
+        :param Gate gate: A gate whose name is in :py:data:`CLIFFORD_GATES`, with numeric
+            parameters.
+        """
+        qubits = [q.index for q in gate.qubits]
+        if gate.name in ('PHASE', 'RX', 'RY', 'RZ'):
+            quarter_turns = _quarter_turns(gate)
+            a, = qubits
+            if gate.name == 'RX':
+                self._h(a)
+            elif gate.name == 'RY':
+                for _ in range(3):  # S^dagger
+                    self._s(a)
+                self._h(a)
+            for _ in range(quarter_turns):
+                self._s(a)
+            if gate.name == 'RX':
+                self._h(a)
+            elif gate.name == 'RY':
+                self._h(a)
+                self._s(a)
+        elif gate.name in _GATE_METHODS:
+            _GATE_METHODS[gate.name](self, *qubits)
+        else:
+            raise ValueError("{} is not a Clifford gate supported by the stabilizer simulator"
+                             .format(gate.name))
+        return self
+
+    def do_gate_matrix(self, matrix, qubits):
+        raise ValueError("The stabilizer simulator only supports the gates in CLIFFORD_GATES, "
+                         "not arbitrary matrices")
+
+    def _i(self, a):
+        pass
+
+    def _x(self, a):
+        self.r[:, 0] ^= self.z[:, a]
+
+    def _y(self, a):
+        self.r[:, 0] ^= self.x[:, a] ^ self.z[:, a]
+
+    def _z(self, a):
+        self.r[:, 0] ^= self.x[:, a]
+
+    def _h(self, a):
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, a]
+        self.x[:, a], self.z[:, a] = self.z[:, a].copy(), self.x[:, a].copy()
+
+    def _s(self, a):
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, a]
+        self.z[:, a] ^= self.x[:, a]
+
+    def _cnot(self, a, b):
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, b] & ~(self.x[:, b] ^ self.z[:, a])
+        self.x[:, b] ^= self.x[:, a]
+        self.z[:, a] ^= self.z[:, b]
+
+    def _cz(self, a, b):
+        self._h(b)
+        self._cnot(a, b)
+        self._h(b)
+
+    def _swap(self, a, b):
+        for tableau in (self.x, self.z):
+            tableau[:, [a, b]] = tableau[:, [b, a]]
+
+    def _rowsum(self, targets, source):
+        """
+        Multiply the rows ``targets`` by row ``source``, keeping track of the signs.
+        """
+        x1, z1 = self.x[source], self.z[source]
+        exponent = _phase_exponent(*(np.packbits(part, axis=-1) for part in
+                                     (x1, z1, self.x[targets], self.z[targets])))
+        # The rows commute, so the power of i picked up is even and the sign flips if it is 2
+        self.r[targets] ^= self.r[source]
+        self.r[targets, 0] ^= exponent % 4 == 2
+        self.x[targets] ^= x1
+        self.z[targets] ^= z1
+
+    def _product(self, rows):
+        """
+        The product of commuting tableau rows.
+
+        :return: The x, z and sign parts of the product.
+        """
+        if len(rows) == 0:
+            return (np.zeros(self.n_qubits, dtype=bool), np.zeros(self.n_qubits, dtype=bool),
+                    np.zeros(self.r.shape[1], dtype=bool))
+        x, z, exponent = _pauli_products(self.x[rows], self.z[rows])
+        sign = np.bitwise_xor.reduce(self.r[rows].view(np.uint8), axis=0).astype(bool)
+        # The rows commute, so the power of i picked up is even
+        sign[0] ^= exponent % 4 == 2
+        return x, z, sign
+
+    def _measure(self, a, random_sign):
+        """
+        Measure qubit ``a``, choosing ``random_sign`` as the sign of the new stabilizer if the
+        outcome is random.
+
+        :return: The sign column(s) of the outcome.
+        """
+        n = self.n_qubits
+        anticommuting = np.flatnonzero(self.x[n:, a])
+        if len(anticommuting):
+            p = n + anticommuting[0]
+            others = np.flatnonzero(self.x[:, a])
+            self._rowsum(others[others != p], p)
+            self.x[p - n], self.z[p - n], self.r[p - n] = self.x[p], self.z[p], self.r[p]
+            self.x[p] = False
+            self.z[p] = False
+            self.z[p, a] = True
+            self.r[p] = random_sign
+            return self.r[p].copy()
+
+        # The outcome is determined by the stabilizers: +-Z_a is the product of the stabilizers
+        # whose destabilizers anticommute with it
+        _, _, sign = self._product(n + np.flatnonzero(self.x[:n, a]))
+        return sign
+
+    def do_measurement(self, qubit):
+        """
+        Measure a qubit in the computational basis, collapsing the state.
+
+        :param int qubit: The qubit to measure.
+        :return: The measurement outcome, 0 or 1.
+        :rtype: int
+        """
+        random_sign = np.zeros(self.r.shape[1], dtype=bool)
+        random_sign[0] = self.rs.randint(2)
+        return int(self._measure(qubit, random_sign)[0])
+
+    def sample_bitstrings(self, n_samples, qubits=None):
+        """
+        Sample measurement outcomes without collapsing the state.
+
+        The outcomes of measuring a stabilizer state are an affine function (over GF(2)) of the
+        random outcomes. This measures the qubits once on a copy of the tableau, tracking each
+        sign as such a function, and then evaluates it for ``n_samples`` random inputs.
+
+        :param int n_samples: The number of samples.
+        :param qubits: The qubits to sample, in the order of the returned columns. Defaults to
+            all qubits in order.
+        :return: An int array of shape ``(n_samples, len(qubits))``.
+        """
+        if qubits is None:
+            qubits = list(range(self.n_qubits))
+        k = len(qubits)
+        symbolic = self.copy()
+        symbolic.r = np.hstack([self.r, np.zeros((len(self.r), k), dtype=bool)])
+        outcomes = np.zeros((k, 1 + k), dtype=bool)
+        for j, qubit in enumerate(qubits):
+            random_sign = np.zeros(1 + k, dtype=bool)
+            random_sign[1 + j] = True
+            outcomes[j] = symbolic._measure(qubit, random_sign)
+
+        random_bits = self.rs.randint(2, size=(n_samples, k)).astype(float)
+        samples = random_bits.dot(outcomes[:, 1:].T.astype(float)) + outcomes[:, 0]
+        return (samples.astype(int) % 2).reshape(n_samples, k)
+
+    def expectation(self, operator):
+        """
+        Compute the expectation value of a Pauli operator in the current state. Every Pauli
+        operator either is (up to sign) in the stabilizer group, with expectation value +-1, or
+        has expectation value 0.
+
+        :param operator: A PauliTerm or PauliSum on qubits ``< n_qubits``.
+        :return: The expectation value, including coefficients.
+        :rtype: float
+        """
+        if isinstance(operator, PauliTerm):
+            operator = PauliSum([operator])
+        n = self.n_qubits
+        result = 0.0
+        for term in operator:
+            x = np.zeros(n, dtype=bool)
+            z = np.zeros(n, dtype=bool)
+            for qubit, op in term:
+                x[qubit] = op in ('X', 'Y')
+                z[qubit] = op in ('Z', 'Y')
+            anticommutes = ((self.x & z) ^ (self.z & x)).sum(axis=1) % 2 == 1
+            if anticommutes[n:].any():
+                continue
+            # The term is the product of the stabilizers whose destabilizers it anticommutes with
+            _, _, sign = self._product(n + np.flatnonzero(anticommutes[:n]))
+            result += term.coefficient * (-1 if sign[0] else 1)
+        return float(np.real(result))
+
+
+_GATE_METHODS = {
+    'I': StabilizerSimulator._i,
+    'X': StabilizerSimulator._x,
+    'Y': StabilizerSimulator._y,
+    'Z': StabilizerSimulator._z,
+    'H': StabilizerSimulator._h,
+    'S': StabilizerSimulator._s,
+    'CNOT': StabilizerSimulator._cnot,
+    'CZ': StabilizerSimulator._cz,
+    'SWAP': StabilizerSimulator._swap,
+}
+
+
+_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)])
+
+
+def _phase_exponent(x1, z1, x2, z2):
+    """
+    The power of i picked up by multiplying the Pauli rows ``(x1, z1)`` and ``(x2, z2)``, the
+    sum over qubits of the function g of Aaronson and Gottesman. The rows are bit packed (see
+    ``np.packbits``) along the last axis, which is summed over.
+    """
+    x_only1, y1, z_only1 = x1 & ~z1, x1 & z1, z1 & ~x1
+    x_only2, y2, z_only2 = x2 & ~z2, x2 & z2, z2 & ~x2
+    # XY = iZ, YZ = iX and ZX = iY, while the reverse orders pick up -i
+    plus = (x_only1 & y2) | (y1 & z_only2) | (z_only1 & x_only2)
+    minus = (y1 & x_only2) | (z_only1 & y2) | (x_only1 & z_only2)
+    return _POPCOUNT[plus].sum(axis=-1) - _POPCOUNT[minus].sum(axis=-1)
+
+
+def _pauli_products(x, z):
+    """
+    Multiply Pauli operators, without signs, in order.
+
+    :param x: A bool array of shape ``(..., m, n)`` of the X parts of ``m`` Paulis on ``n``
+        qubits.
+    :param z: The Z parts, like ``x``.
+    :return: The X and Z parts of the products, of shape ``(..., n)``, and the powers of i picked
+        up by multiplying, of shape ``(...)``.
+    """
+    n = x.shape[-1]
+    x, z = np.packbits(x, axis=-1), np.packbits(z, axis=-1)
+    x_products = np.bitwise_xor.accumulate(x, axis=-2)
+    z_products = np.bitwise_xor.accumulate(z, axis=-2)
+    # Multiply the product of the first k Paulis by the (k + 1)st
+    exponent = _phase_exponent(x_products[..., :-1, :], z_products[..., :-1, :],
+                               x[..., 1:, :], z[..., 1:, :]).sum(axis=-1)
+    x_product, z_product = (np.unpackbits(part[..., -1, :], axis=-1)[..., :n].astype(bool)
+                            for part in (x_products, z_products))
+    return x_product, z_product, exponent
+
+
+def _quarter_turns(gate):
+    """
+    :return: The angle of a rotation gate as a number of quarter turns, between 0 and 3.
+    """
+    angle, = gate.params
+    turns = angle / (np.pi / 2)
+    quarter_turns = round(turns)
+    if abs(turns - quarter_turns) > 1e-8:
+        raise ValueError("{} is not a Clifford gate".format(gate))
+    return int(quarter_turns) % 4
@@ -19,6 +19,7 @@ import json
 import os
 import signal
 import time
+from concurrent.futures import ThreadPoolExecutor
 from math import pi
 from multiprocessing import Process
 from unittest.mock import patch
@@ -34,14 +35,17 @@ from rpcq.core_messages import (BinaryExecutableRequest, BinaryExecutableRespons
 from rpcq.json_rpc.server import Server
 
 from pyquil.api import (QVMConnection, QPUCompiler, BenchmarkConnection,
-                        get_qc, LocalQVMCompiler, QVMCompiler, LocalBenchmarkConnection)
+                        get_qc, LocalQVMCompiler, QVMCompiler, LocalBenchmarkConnection,
+                        PyBenchmarker, PyQVM, PyWavefunctionSimulator, QuantumComputer)
 from pyquil.api._base_connection import validate_noise_probabilities, validate_qubit_list, \
-    prepare_register_list
+    prepare_register_list, get_http_adapter, get_session, set_http_pool_size
+from pyquil.api._error_reporting import _record_call, global_error_context
 from pyquil.api._config import PyquilConfig
 from pyquil.device import ISA, NxDevice
-from pyquil.gates import CNOT, H, MEASURE, PHASE, Z, RZ, RX, CZ
-from pyquil.paulis import PauliTerm
-from pyquil.quil import Program
+from pyquil.gates import CNOT, H, MEASURE, PHASE, Z, RZ, RX, CZ, I, S, SWAP, X, Y, T
+from pyquil.paulis import PauliTerm, sX, sZ
+from pyquil.quil import Program, address_qubits
+from pyquil.quilatom import QubitPlaceholder
 from pyquil.quilbase import Pragma, Declare
 
 EMPTY_PROGRAM = Program()
@@ -273,6 +277,42 @@ def test_prepare_register_list():
         prepare_register_list({'ro': [-1, 1]})
 
 
+def test_sessions_share_connection_pool():
+    first, second = get_session(), get_session()
+    assert first is not second
+    assert first.get_adapter('http://127.0.0.1:5000') is get_http_adapter()
+    assert second.get_adapter('http://127.0.0.1:6000') is get_http_adapter()
+
+    old_adapter = get_http_adapter()
+    try:
+        set_http_pool_size(32)
+        assert get_http_adapter()._pool_maxsize == 32
+        assert get_session().get_adapter('http://127.0.0.1:5000') is get_http_adapter()
+        assert first.get_adapter('http://127.0.0.1:5000') is old_adapter
+    finally:
+        set_http_pool_size(old_adapter._pool_maxsize)
+
+    with pytest.raises(ValueError):
+        set_http_pool_size(0)
+
+
+def test_record_call_from_threads():
+    @_record_call
+    def record_me(i):
+        return i
+
+    def record_many(start):
+        for i in range(start, start + 200):
+            record_me(i)
+        # Reports snapshot the call log while other threads are writing to it
+        global_error_context.generate_report(RuntimeError(), [])
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record_many, range(0, 1600, 200)))
+    recorded = {key.args[0] for key in global_error_context.log if key.name == 'record_me'}
+    assert recorded == {repr(i) for i in range(1600)}
+
+
 def test_config_parsing():
     with patch.dict('os.environ', {"FOREST_CONFIG": os.path.join(os.path.dirname(__file__),
                                                                  "data/forest_config.test"),
@@ -383,6 +423,16 @@ def test_native_quil_to_binary(server, mock_compiler):
     assert response.program == COMPILED_BYTES_ARRAY
 
 
+def test_run_batch_with_qvm_compiler(server, m_endpoints):
+    device = NxDevice(nx.Graph([(0, 1)]))
+    compiler = QVMCompiler(endpoint=m_endpoints[0], device=device)
+    qc = QuantumComputer(name='testy!', qam=PyQVM(n_qubits=2), device=device, compiler=compiler)
+    results = qc.run_batch([BELL_STATE] * 4, lookahead=3)
+    assert len(results) == 4
+    for bitstrings in results:
+        np.testing.assert_array_equal(bitstrings, [[0, 0]])
+
+
 def test_rb_sequence(server, mock_rb_cxn):
     response = mock_rb_cxn.generate_rb_sequence(2, [PHASE(np.pi / 2, 0), H(0)])
     assert [prog.out() for prog in response] == [prog.out() for prog in RB_REPLY]
@@ -411,3 +461,67 @@ def test_local_conjugate_request(benchmarker):
         response = cxn.apply_clifford_to_pauli(Program("H 0"), PauliTerm("X", 0, 1.0))
         assert isinstance(response, PauliTerm)
         assert str(response) == "(1+0j)*Z0"
+
+
+def test_py_conjugate_request():
+    response = PyBenchmarker().apply_clifford_to_pauli(Program("H 0"), PauliTerm("X", 0, 1.0))
+    assert isinstance(response, PauliTerm)
+    assert str(response) == "(1+0j)*Z0"
+
+    with pytest.raises(ValueError):
+        PyBenchmarker().apply_clifford_to_pauli(Program(T(0)), PauliTerm("X", 0))
+
+
+def test_py_conjugate_matches_wavefunction():
+    # C P C^dagger = Q if and only if C P |b> = Q C |b> for every basis state |b>
+    rs = np.random.RandomState(7)
+    gates = [lambda a, b: H(a), lambda a, b: S(a), lambda a, b: RX(pi / 2, a), CNOT, CZ, SWAP]
+    paulis = [PauliTerm.from_list(list(zip(ops, [0, 1, 2]))) * coefficient
+              for ops, coefficient in zip(["XIZ", "YYI", "IZY", "XXX", "ZIY"], [1, -1, 2, 1j, 1])]
+    for _ in range(10):
+        clifford = Program([gates[g](*[int(q) for q in rs.choice(3, 2, replace=False)])
+                            for g in rs.randint(len(gates), size=10)])
+        conjugated = PyBenchmarker().apply_clifford_to_paulis(clifford, paulis)
+        assert conjugated[0] == PyBenchmarker().apply_clifford_to_pauli(clifford, paulis[0])
+        for pauli, image in zip(paulis, conjugated):
+            pauli_gates = [{"X": X, "Y": Y, "Z": Z}[op](q) for q, op in pauli]
+            image_gates = [{"X": X, "Y": Y, "Z": Z}[op](q) for q, op in image]
+            for b in range(8):
+                prep = Program(I(2)) + [X(q) for q in range(3) if (b >> q) & 1]
+                wf = PyWavefunctionSimulator().wavefunction
+                np.testing.assert_allclose(
+                    pauli.coefficient * wf(prep + pauli_gates + clifford).amplitudes,
+                    image.coefficient * wf(prep + clifford + image_gates).amplitudes,
+                    atol=1e-12)
+
+
+def test_py_rb_sequence(tmpdir):
+    benchmarker = PyBenchmarker(cache_dir=str(tmpdir))
+    response = benchmarker.generate_rb_sequence(10, [PHASE(np.pi / 2, 0), H(0)], seed=52)
+    assert len(response) == 10
+    assert [prog.out() for prog in response] == \
+        [prog.out() for prog in benchmarker.generate_rb_sequence(
+            10, [PHASE(np.pi / 2, 0), H(0)], seed=52)]
+    # The sequence composes to the identity
+    assert benchmarker.apply_clifford_to_paulis(sum(response, Program()), [sX(0), sZ(0)]) == \
+        [sX(0), sZ(0)]
+
+    with pytest.raises(ValueError):
+        benchmarker.generate_rb_sequence(2, [H(0)])
+    with pytest.raises(ValueError):
+        benchmarker.generate_rb_sequence(2, [H(0), H(1), H(2), CNOT(0, 1), CNOT(1, 2)])
+
+
+def test_py_rb_sequence_two_qubits(tmpdir):
+    a, b = QubitPlaceholder(), QubitPlaceholder()
+    gateset = [RX(pi / 2, a), RZ(pi / 2, a), RX(pi / 2, b), RZ(pi / 2, b), CZ(a, b)]
+    response = PyBenchmarker(cache_dir=str(tmpdir)).generate_rb_sequence(20, gateset, seed=1)
+    sequence = address_qubits(sum(response, Program()), {a: 0, b: 1})
+    paulis = [sX(0), sZ(0), sX(1), sZ(1)]
+    assert PyBenchmarker().apply_clifford_to_paulis(sequence, paulis) == paulis
+
+    # The group is stored on disk
+    assert len(tmpdir.listdir()) == 1
+    PyBenchmarker._clifford_groups.clear()
+    reloaded = PyBenchmarker(cache_dir=str(tmpdir)).generate_rb_sequence(20, gateset, seed=1)
+    assert address_qubits(sum(reloaded, Program()), {a: 0, b: 1}) == sequence
@@ -0,0 +1,120 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+
+import networkx as nx
+import numpy as np
+import pytest
+
+from pyquil import Program
+from pyquil.api import AsyncForestConnection, QVM, QuantumComputer
+from pyquil.api._qac import AbstractCompiler
+from pyquil.device import NxDevice
+from pyquil.gates import CNOT, H, MEASURE
+
+LATENCY = 0.01
+N_REQUESTS = 20
+
+BELL_STATE_MEASURE = Program(H(0), CNOT(0, 1), MEASURE(0, 0), MEASURE(1, 1))
+
+
+class StubForestHandler(BaseHTTPRequestHandler):
+    """
+    Answers QVM ``multishot`` and quilc requests with all-zero bitstrings and the uncompiled
+    program, after a delay that stands in for the time the servers take.
+    """
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(LATENCY)
+        if self.path == '/qvm':
+            body = {name: [[0] * len(addresses) for _ in range(payload['trials'])]
+                    for name, addresses in payload['addresses'].items()}
+        elif self.path == '/quilc':
+            body = {'compiled-quil': payload['uncompiled-quil'], 'metadata': {}}
+        else:
+            self.send_error(404)
+            return
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubForestServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+@pytest.fixture
+def stub_endpoint():
+    server = StubForestServer(('127.0.0.1', 0), StubForestHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield 'http://127.0.0.1:{}'.format(server.server_address[1])
+    server.shutdown()
+    server.server_close()
+
+
+class DummyCompiler(AbstractCompiler):
+    def quil_to_native_quil(self, program: Program):
+        return program
+
+    def native_quil_to_executable(self, nq_program: Program):
+        return nq_program
+
+
+def _run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+def test_async_connection(stub_endpoint):
+    connection = AsyncForestConnection(sync_endpoint=stub_endpoint)
+    ram = _run(connection._qvm_run(BELL_STATE_MEASURE, {'ro': [0, 1]}, 3, None, None, None))
+    np.testing.assert_array_equal(ram['ro'], np.zeros((3, 2)))
+
+    device = NxDevice(nx.complete_graph(2))
+    response = _run(connection._quilc_compile(BELL_STATE_MEASURE, device.get_isa(),
+                                              device.get_specs()))
+    assert response['compiled-quil'] == BELL_STATE_MEASURE.out()
+    connection.close()
+
+
+def test_async_qvm(stub_endpoint):
+    connection = AsyncForestConnection(sync_endpoint=stub_endpoint)
+    qvm = QVM(connection=connection)
+    program = BELL_STATE_MEASURE.copy().wrap_in_numshots_loop(5)
+    bitstrings = _run(qvm.load(program).run_async()).wait() \
+        .read_from_memory_region(region_name='ro')
+    assert bitstrings.shape == (5, 2)
+    connection.close()
+
+
+def test_async_gather(stub_endpoint):
+    programs = [BELL_STATE_MEASURE.copy().wrap_in_numshots_loop(i + 1)
+                for i in range(N_REQUESTS)]
+    connection = AsyncForestConnection(sync_endpoint=stub_endpoint)
+    qc = QuantumComputer(name='testy!', qam=QVM(connection=connection),
+                         device=NxDevice(nx.complete_graph(2)), compiler=DummyCompiler())
+    results = _run(asyncio.gather(*[qc.run_async(program) for program in programs]))
+    connection.close()
+
+    # The results come back in the order of the programs, each with its own number of trials
+    assert len(results) == N_REQUESTS
+    assert [bitstrings.shape for bitstrings in results] == [(i + 1, 2)
+                                                           for i in range(N_REQUESTS)]
+
+
+def test_compile_async():
+    compiler = DummyCompiler()
+    qc = QuantumComputer(name='testy!', qam=None, device=NxDevice(nx.complete_graph(2)),
+                         compiler=compiler)
+    executable = _run(qc.compile_async(BELL_STATE_MEASURE))
+    assert executable == BELL_STATE_MEASURE
@@ -0,0 +1,123 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+
+import numpy as np
+import pytest
+
+from pyquil.columnar import ColumnarProgram, _format_real_params
+from pyquil.gates import H, X, S, T, RX, RZ, CNOT, CPHASE, ISWAP, PSWAP, CCNOT, MEASURE
+from pyquil.parameters import format_parameter
+from pyquil.quil import Program
+from pyquil.quilatom import QubitPlaceholder, MemoryReference
+
+
+def _example_program():
+    p = Program(H(0), RX(np.pi / 2, 1), CNOT(0, 1), RZ(0.3, 2), S(1), T(0), ISWAP(0, 2),
+                CPHASE(-3 * np.pi / 4, 1, 2), PSWAP(0.0, 0, 1), CCNOT(0, 1, 2), RX(-np.pi, 0))
+    p.defgate("FOO", np.array([[0, 1], [1, 0]]))
+    p.inst(("FOO", 2))
+    return p
+
+
+def test_round_trip():
+    p = _example_program()
+    c = ColumnarProgram.from_program(p)
+    assert len(c) == len(p)
+    assert c.gate_names == ("H", "RX", "CNOT", "RZ", "S", "T", "ISWAP", "CPHASE", "PSWAP",
+                            "CCNOT", "FOO")
+    assert c.params.shape == (len(p), 1)
+    assert c.qubits.shape == (len(p), 3)
+    assert list(c) == p.instructions
+    assert c[3] == RZ(0.3, 2)
+    assert c[-1] == p[-1]
+    assert c.to_program() == p
+    assert c.out() == p.out()
+    assert str(c) == p.out()
+
+
+def test_empty():
+    c = ColumnarProgram.from_program(Program())
+    assert len(c) == 0
+    assert list(c) == []
+    assert c.out() == Program().out()
+    assert c.dagger().out() == ""
+
+
+def test_slices_are_views():
+    c = ColumnarProgram.from_program(_example_program())
+    s = c[2:5]
+    assert list(s) == list(c)[2:5]
+    assert np.shares_memory(s.qubits, c.qubits)
+
+
+def test_from_arrays():
+    c = ColumnarProgram(["RX", "CZ"], [0, 1, 0],
+                        [[0.5], [np.nan], [np.pi]],
+                        [[0, -1], [0, 1], [1, -1]])
+    assert c.to_program() == Program("RX(0.5) 0\nCZ 0 1\nRX(pi) 1")
+    assert c.get_qubits() == {0, 1}
+
+    with pytest.raises(ValueError):
+        ColumnarProgram(["RX"], [0, 1], [[0.5], [0.5]], [[0], [1]])
+    with pytest.raises(ValueError):
+        ColumnarProgram(["X"], [0, 0], None, [[0]])
+    with pytest.raises(TypeError):
+        ColumnarProgram(["X"], [0.0], None, [[0]])
+
+
+def test_default_qubits():
+    c = ColumnarProgram(["X"], np.zeros(0, dtype=int))
+    assert len(c) == 0
+    assert c.to_program() == Program()
+    with pytest.raises(ValueError):
+        ColumnarProgram(["X"], [0])
+
+
+def test_not_protoquil():
+    with pytest.raises(ValueError):
+        ColumnarProgram.from_program(Program(X(0), MEASURE(0, ("ro", 0))))
+    with pytest.raises(TypeError):
+        ColumnarProgram.from_program(Program(RX(MemoryReference("theta"), 0)))
+    with pytest.raises(TypeError):
+        ColumnarProgram.from_program(Program(X(QubitPlaceholder())))
+
+
+def test_get_qubits():
+    p = _example_program()
+    assert ColumnarProgram.from_program(p).get_qubits() == p.get_qubits()
+
+
+def test_dagger():
+    p = _example_program()
+    c = ColumnarProgram.from_program(p)
+    assert c.dagger().out() == p.dagger().out()
+    assert c.dagger(inv_dict={"FOO": "FOO"}).out() == p.dagger(inv_dict={"FOO": "FOO"}).out()
+
+    p = Program(S(0), T(1), CNOT(0, 1))
+    assert ColumnarProgram.from_program(p).dagger().out() == p.dagger().out()
+
+
+def test_remap_qubits():
+    c = ColumnarProgram.from_program(Program(X(0), CNOT(1, 2), CCNOT(2, 0, 3)))
+    assert c.remap_qubits({0: 10, 2: 0}).out() == "X 10\nCNOT 1 0\nCCNOT 0 10 3\n"
+    with pytest.raises(TypeError):
+        c.remap_qubits({0: -1})
+
+
+def test_format_real_params():
+    values = np.array([0.0, -0.0, 1.0, np.pi, -np.pi, np.pi / 2, 3 * np.pi / 4, -2 * np.pi,
+                       np.pi / 3, 2 * np.pi / 7, np.pi / 9, 0.1, 1e20, -1e-300, 1.0])
+    assert _format_real_params(values).tolist() == [format_parameter(v) for v in values.tolist()]
@@ -0,0 +1,207 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+
+from functools import reduce
+
+import numpy as np
+import pytest
+
+from pyquil.packed_paulis import PackedPauliSum, popcount, product_phases
+from pyquil.gate_matrices import I, X, Y, Z
+from pyquil.paulis import PauliSum, PauliTerm, check_commutation, sI, sX, sY, sZ, ID
+from pyquil.quilatom import QubitPlaceholder
+
+
+def _random_sum(rng, n_terms, qubits):
+    terms = []
+    for _ in range(n_terms):
+        term = PauliTerm("I", 0, complex(rng.normal(), rng.normal()))
+        for q in qubits:
+            op = rng.choice(["I", "X", "Y", "Z"])
+            if op != "I":
+                term *= PauliTerm(op, q)
+        terms.append(term)
+    return PauliSum(terms)
+
+
+def _assert_equal(packed, pauli_sum):
+    assert isinstance(packed, PackedPauliSum)
+    assert packed.to_pauli_sum() == pauli_sum.simplify()
+
+
+def test_popcount():
+    words = np.array([[0, 1], [2 ** 64 - 1, 2 ** 63]], dtype=np.uint64)
+    np.testing.assert_array_equal(popcount(words), [1, 65])
+
+
+def test_product_phases():
+    # X * Y = iZ, Y * X = -iZ, Z * Z = I
+    x = np.array([1, 1, 0], dtype=np.uint64)
+    z = np.array([0, 1, 1], dtype=np.uint64)
+    phases = product_phases(x[:, np.newaxis, np.newaxis], z[:, np.newaxis, np.newaxis],
+                            x[np.newaxis, :, np.newaxis], z[np.newaxis, :, np.newaxis])
+    np.testing.assert_array_equal(phases, [[1, 1j, -1j], [-1j, 1, 1j], [1j, -1j, 1]])
+
+
+def test_round_trip():
+    pauli_sum = 0.5 * sX(0) * sY(3) + 2j * sZ(1) - sI(0) + sZ(3) * sX(1)
+    packed = pauli_sum.packed()
+    assert packed.qubits == (0, 3, 1)
+    assert len(packed) == 4
+    assert packed.to_pauli_sum() == pauli_sum
+    assert PackedPauliSum.from_pauli_sum(sY(2)).to_pauli_sum() == PauliSum([sY(2)])
+    assert len(list(packed)) == 4
+
+
+def test_qubits():
+    packed = (sX(0) + sZ(5)).packed(qubits=[5, 2, 0])
+    assert packed.qubits == (5, 2, 0)
+    assert packed.with_qubits([0, 5]).to_pauli_sum() == sX(0) + sZ(5)
+    with pytest.raises(ValueError):
+        packed.with_qubits([0, 2])
+    with pytest.raises(ValueError):
+        (sX(0) + sZ(5)).packed(qubits=[0])
+
+
+@pytest.mark.parametrize('n_qubits', [3, 70])
+def test_arithmetic(n_qubits):
+    rng = np.random.RandomState(42)
+    a = _random_sum(rng, 12, range(n_qubits))
+    b = _random_sum(rng, 9, range(n_qubits // 2, n_qubits + 2))
+    packed_a, packed_b = a.packed(), b.packed()
+
+    _assert_equal(packed_a * packed_b, a * b)
+    _assert_equal(packed_a + packed_b, a + b)
+    _assert_equal(packed_a - packed_b, a - b)
+    _assert_equal(-packed_a, -1 * a)
+    _assert_equal(packed_a * 1.5j, a * 1.5j)
+    _assert_equal(2 * packed_a + 3, 2 * a + 3)
+    _assert_equal(packed_a * b[0], a * b[0])
+    _assert_equal(packed_a * b, a * b)
+    _assert_equal(packed_a + b[0], a + b[0])
+    _assert_equal(packed_a + b, a + b)
+    _assert_equal(packed_a - b, a - b)
+    _assert_equal(3 - packed_a, 3 - a)
+
+
+def test_simplify():
+    packed = PauliSum([sX(0), sZ(1), 2 * sX(0), -1 * sZ(1), sY(0)]).packed()
+    simplified = packed.simplify()
+    assert simplified.to_pauli_sum() == PauliSum([3 * sX(0), sY(0)])
+    assert len(packed) == 5
+
+    assert len(PauliSum([sX(0), -1 * sX(0)]).packed().simplify()) == 0
+    assert len(PauliSum([]).packed() * sX(0)) == 0
+
+
+def test_commutes_with():
+    rng = np.random.RandomState(7)
+    a = _random_sum(rng, 10, range(4))
+    b = _random_sum(rng, 8, range(2, 67))
+    expected = [[check_commutation([s], t) for t in b] for s in a]
+    np.testing.assert_array_equal(a.packed().commutes_with(b), expected)
+
+
+def test_conflict_matrix():
+    packed = PauliSum([sX(0) * sX(1), sY(0) * sY(1), sY(0) * sZ(2), sI(0)]).packed()
+    np.testing.assert_array_equal(packed.conflict_matrix(),
+                                  [[False, False, True, False], [False, False, False, False],
+                                   [True, False, False, False], [False, False, False, False]])
+    np.testing.assert_array_equal(packed.conflict_matrix(qubitwise=True),
+                                  [[False, True, True, False], [True, False, False, False],
+                                   [True, False, False, False], [False, False, False, False]])
+
+
+def test_placeholders():
+    q0, q1 = QubitPlaceholder.register(2)
+    pauli_sum = sX(q0) * sZ(q1) + sY(q1)
+    packed = pauli_sum.packed()
+    assert packed.qubits == (q0, q1)
+    _assert_equal(packed * packed, pauli_sum * pauli_sum)
+
+
+def test_bad_arguments():
+    with pytest.raises(ValueError):
+        PackedPauliSum([0, 1], np.zeros((2, 2)), np.zeros((2, 2)), np.zeros(2))
+    with pytest.raises(ValueError):
+        PackedPauliSum([0, 0], np.zeros((2, 1)), np.zeros((2, 1)), np.zeros(2))
+    with pytest.raises(TypeError):
+        PauliSum([sX(0)]).packed() * "X"
+
+
+def _dense(pauli_sum, n_qubits):
+    matrices = {"I": I, "X": X, "Y": Y, "Z": Z}
+    return sum(term.coefficient * reduce(np.kron, [matrices[term[q]]
+                                                   for q in reversed(range(n_qubits))])
+               for term in pauli_sum)
+
+
+@pytest.mark.parametrize('n_qubits', [1, 4])
+def test_to_sparse(n_qubits):
+    pytest.importorskip("scipy")
+    rng = np.random.RandomState(n_qubits)
+    pauli_sum = _random_sum(rng, 20, rng.permutation(n_qubits).tolist())
+    matrix = pauli_sum.to_sparse(n_qubits)
+    assert matrix.format == 'csr'
+    np.testing.assert_allclose(matrix.toarray(), _dense(pauli_sum, n_qubits))
+
+    term = pauli_sum[0]
+    np.testing.assert_allclose(term.to_sparse(n_qubits + 1).toarray(),
+                               _dense(PauliSum([term]), n_qubits + 1))
+    np.testing.assert_allclose((2 * ID()).to_sparse().toarray(), [[2]])
+    # Terms which cancel out on some basis states leave no explicit zeros
+    assert (sX(0) + sX(0) * sZ(1)).to_sparse().nnz == 2
+
+
+def test_to_sparse_bad_qubits():
+    pytest.importorskip("scipy")
+    with pytest.raises(ValueError):
+        sX(3).to_sparse(2)
+    with pytest.raises(ValueError):
+        sX(QubitPlaceholder()).to_sparse()
+
+
+def test_to_linear_operator():
+    pytest.importorskip("scipy")
+    rng = np.random.RandomState(0)
+    pauli_sum = _random_sum(rng, 20, range(5))
+    operator = pauli_sum.to_linear_operator()
+    matrix = _dense(pauli_sum, 5)
+    vector = rng.normal(size=32) + 1j * rng.normal(size=32)
+    np.testing.assert_allclose(operator.matvec(vector), matrix.dot(vector))
+    np.testing.assert_allclose(operator.rmatvec(vector), matrix.conj().T.dot(vector))
+    vectors = rng.normal(size=(32, 3))
+    np.testing.assert_allclose(operator.matmat(vectors), matrix.dot(vectors))
+
+
+@pytest.mark.parametrize('n_qubits', [3, 12])
+def test_expectations(n_qubits):
+    pytest.importorskip("scipy")
+    rng = np.random.RandomState(n_qubits)
+    pauli_sum = _random_sum(rng, 30, range(n_qubits)) + sZ(0) - 2.5
+    amplitudes = rng.normal(size=2 ** n_qubits) + 1j * rng.normal(size=2 ** n_qubits)
+    amplitudes /= np.linalg.norm(amplitudes)
+    expected = [np.vdot(amplitudes, PauliSum([term]).to_sparse(n_qubits).dot(amplitudes))
+                for term in pauli_sum]
+    np.testing.assert_allclose(pauli_sum.packed().expectations(amplitudes), expected, atol=1e-12)
+    with pytest.raises(ValueError):
+        PackedPauliSum.from_pauli_sum(sX(n_qubits)).expectations(amplitudes)
+
+
+def test_expectations_empty():
+    packed = (sX(0) - sX(0)).packed().simplify()
+    assert len(packed) == 0
+    assert packed.expectations([1, 0]).shape == (0,)
@@ -13,12 +13,15 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
+import io
+
 import numpy as np
 import pytest
 
 from pyquil.gates import *
 from pyquil.parameters import Parameter, quil_sin, quil_cos
-from pyquil.parser import parse
+from pyquil.parser import (parse, parse_program, iter_parse, PARSER_BACKENDS, ParseCache,
+                           parse_cache)
 from pyquil.quilatom import Addr
 from pyquil.quilatom import MemoryReference
 from pyquil.quilbase import Declare, Reset, ResetQubit
@@ -198,9 +201,64 @@ def test_pragma():
     parse_equals('PRAGMA NO-NOISE', Pragma('NO-NOISE'))
 
 
-def test_invalid():
+@pytest.mark.parametrize('backend', sorted(PARSER_BACKENDS))
+@pytest.mark.parametrize('quil', [
+    "H X",
+    "H 0 X 1",
+    "RX(1, 0",
+    "MEASURE ro[0]",
+    "    H 0",
+    "H\t0",
+    "DEFGATE A:",
+    "DEFGATE A:\n        1, 0\n        0, 1",
+    "H 0\n    \nX 0",
+    "H 0\n    # comment\nX 0",
+    "DEFGATE A:\n    1, 0\n    # comment\n    0, 1",
+    "DEFGATE A:\n    1, 0\n# comment\n    0, 1",
+    "DEFGATE A:\n    1, 0\n  \n    0, 1",
+    "MOVE ro[0] -1",
+    "PRAGMA RESET",
+    "JUMP @",
+])
+def test_invalid(quil, backend):
     with pytest.raises(RuntimeError):
-        parse("H X")
+        parse(quil, backend=backend)
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        parse("H 0", backend="yacc")
+
+
+CONFORMANCE_PROGRAMS = [
+    "H 0\nCNOT 0 1 # a comment\n\n\nRX(-pi/2) 3\nMEASURE 0 ro[1]\nMEASURE 1",
+    "RZ(0.25*pi) 2\r\nCZ 2 3\rXY(theta[1]) 0 1\nRX(-beta) 0",
+    "RX(2^-3^2) 0\nRX(-2^2) 0\nRX(-(1+2)*3/4) 0\nRX(1.5e-3 - 2E+2i) 0\nRX(3 i) 0",
+    "RX(sin(0.5) + cos(pi) - sqrt(4) * exp(1)) 0\nRX(cis(0)) 0",
+    "DEFGATE A(%t, %u):\n    cos(%t/2), i*sin(%u)\n\n    -%t^2, cis(%t)*%u\nA(1.5, 2) 0",
+    "DEFGATE SQRT-X:\n    0.5+0.5i, 0.5-0.5i\n    0.5-0.5i, 0.5+0.5i\nSQRT-X 0\nDEFGATE B:\n    0, 1\n    1, 0",
+    "DEFCIRCUIT bell(%a) a b:\n    RX(%a + 1) a\n    CNOT a b\n    MEASURE 0 ro\nH 0",
+    "DEFCIRCUIT bell a b:\n    H a\n    CNOT a b",
+    'PRAGMA foo 0 bar "x # y"\nPRAGMA INITIAL_REWIRING "PARTIAL"\nPRAGMA ADD-KRAUS X 0 "(0.0 1.0 1.0 0.0)"',
+    "LABEL @START\nJUMP-WHEN @END [3]\nJUMP-UNLESS @START flag\nJUMP @END\nLABEL @END\nHALT",
+    "DECLARE ro BIT[2]\nDECLARE theta REAL\nDECLARE mem OCTET[32] SHARING mem2 OFFSET 16 REAL OFFSET 32 REAL",
+    "RESET\nRESET 5\nWAIT\nNOP\nINCLUDE \"other.quil\"",
+    "NEG ro[0]\nNOT ro[1]\nAND ro[0] 1\nIOR ro[0] ro[1]\nXOR ro[0] 0",
+    "ADD mem[0] 1.2\nSUB mem[0] mem[1]\nMUL mem[0] 2\nDIV mem[0] pi\nMOVE mem[2] 4\nMOVE mem[2] mem[1]",
+    "EXCHANGE ro[0] ro[1]\nCONVERT ro[1] ro[2]\nLOAD ro[8] mem mem[4]\nSTORE mem ro[2] ro[0]",
+    "EQ comp[1] ro[3] ro[2]\nLT comp[1] ro[3] 1\nLE comp[1] ro[3] 2.5\nGT comp ro ro[2]\nGE comp[1] ro[3] ro[2]",
+    "\nH 0\n  # indented comment\n\n",
+    "DEFGATE A:\n    1, 0\n    0, 1\n# comment\n   \nA 0",
+    "",
+]
+
+
+@pytest.mark.parametrize('quil', CONFORMANCE_PROGRAMS)
+def test_backends_agree(quil):
+    expected = parse(quil, backend='antlr')
+    actual = parse(quil, backend='fast')
+    assert expected == actual
+    assert [instr.out() for instr in expected] == [instr.out() for instr in actual]
 
 
 def test_empty_program():
@@ -226,3 +284,76 @@ RESET
 RESET 5
     """.strip()
     parse_equals(reset_qubit, ResetQubit(Qubit(5)))
+
+
+def test_parse_cache():
+    cache = ParseCache(maxsize=2)
+    assert cache.get('a') is None
+    cache.put('a', [H(0)])
+    cache.put('b', [X(0)])
+    assert cache.get('a') == [H(0)]
+    cache.put('c', [Y(0)])
+    # 'b' is the least recently used entry
+    assert cache.get('b') is None
+    assert cache.get('c') == [Y(0)]
+    assert cache.cache_info() == (2, 2, 2, 2)
+
+    cache.maxsize = 1
+    assert len(cache) == 1
+    cache.clear()
+    assert cache.cache_info() == (0, 0, 1, 0)
+
+    cache.maxsize = 0
+    cache.put('a', [H(0)])
+    assert len(cache) == 0
+
+    with pytest.raises(ValueError):
+        cache.maxsize = -1
+
+
+def test_parse_uses_cache():
+    parse_cache.clear()
+    quil = "DECLARE ro BIT[2]\nH 0\nCNOT 0 1\nMEASURE 0 ro[0]"
+    first = parse(quil)
+    second = parse(quil)
+    assert first == second
+    assert parse_cache.cache_info().hits == 1
+    assert parse_cache.cache_info().misses == 1
+
+    # Callers get their own copy of the list of instructions
+    second.append(H(1))
+    assert parse(quil) == first
+    assert parse_program(quil).out() == quil + "\n"
+
+    parse(quil, backend='antlr')
+    assert parse_cache.cache_info().misses == 2
+
+
+def test_iter_parse():
+    quil = """# A program with definitions
+DEFGATE SQRT-X:
+    0.5+0.5i, 0.5-0.5i
+
+    0.5-0.5i, 0.5+0.5i
+SQRT-X 0
+DEFCIRCUIT bell a b:
+    H a
+    CNOT a b
+DECLARE ro BIT[2]
+MEASURE 0 ro[0]
+DEFGATE B:
+    0, 1
+    1, 0
+"""
+    instructions = iter_parse(io.StringIO(quil))
+    assert next(instructions) == parse("DEFGATE SQRT-X:\n    0.5+0.5i, 0.5-0.5i\n    0.5-0.5i, 0.5+0.5i")[0]
+    assert list(instructions) == parse(quil)[1:]
+
+
+def test_iter_parse_is_lazy():
+    lines = iter(["H 0", "X 1", "H X"])
+    instructions = iter_parse(lines)
+    assert next(instructions) == H(0)
+    assert next(lines) == "X 1"
+    with pytest.raises(RuntimeError, match="line 2"):
+        next(instructions)
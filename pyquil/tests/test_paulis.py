@@ -18,7 +18,7 @@
 import math
 import warnings
 from functools import reduce
-from itertools import product
+from itertools import combinations, product
 from operator import mul
 
 import numpy as np
@@ -28,7 +28,7 @@ from six.moves import range
 from pyquil.gates import RX, RZ, CNOT, H, X, PHASE
 from pyquil.paulis import PauliTerm, PauliSum, exponential_map, exponentiate_commuting_pauli_sum, \
     ID, UnequalLengthWarning, exponentiate, trotterize, is_zero, check_commutation, commuting_sets, \
-    term_with_coeff, sI, sX, sY, sZ, ZERO, is_identity
+    term_with_coeff, sI, sX, sY, sZ, ZERO, is_identity, simplify_pauli_sum, commuting_groups
 from pyquil.quil import Program
 
 
@@ -505,6 +505,47 @@ def test_commuting_sets():
     commuting_sets(pauli_sum)
 
 
+@pytest.mark.parametrize('strategy', ['largest_first', 'dsatur'])
+def test_commuting_groups(strategy):
+    term1 = PauliTerm("X", 0) * PauliTerm("X", 1)
+    term2 = PauliTerm("Y", 0) * PauliTerm("Y", 1)
+    term3 = PauliTerm("Y", 0) * PauliTerm("Z", 2)
+    term4 = PauliTerm("X", 1) * PauliTerm("Z", 2)
+    pauli_sum = PauliSum([term1, term2, term3, term4, 2 * ID()])
+
+    groups = commuting_groups(pauli_sum, strategy=strategy)
+    assert len(groups) == 2
+    assert [term1, term4, 2 * ID()] in groups
+    assert [term2, term3] in groups
+
+    groups = commuting_groups(pauli_sum, qubitwise=False, strategy=strategy)
+    assert len(groups) == 2
+    for group in groups:
+        for t1, t2 in combinations(group, 2):
+            assert check_commutation([t1], t2)
+    assert commuting_groups([]) == []
+    with pytest.raises(ValueError):
+        commuting_groups(pauli_sum, strategy='random')
+
+
+def test_commuting_groups_many_terms():
+    rs = np.random.RandomState(1234)
+    terms = [PauliTerm.from_list(list(zip(rs.choice(["X", "Y", "Z"], size=3),
+                                          rs.choice(70, size=3, replace=False).tolist())))
+             for _ in range(200)]
+    for qubitwise in True, False:
+        groups = commuting_groups(terms, qubitwise=qubitwise)
+        assert sorted(t.id(sort_ops=False) for group in groups for t in group) == \
+            sorted(t.id(sort_ops=False) for t in terms)
+        for group in groups:
+            for t1, t2 in combinations(group, 2):
+                if qubitwise:
+                    assert all(t1[q] == t2[q] for q in set(t1.get_qubits()) & set(t2.get_qubits()))
+                else:
+                    assert check_commutation([t1], t2)
+    assert len(groups) < len(commuting_sets(PauliSum(terms)))
+
+
 def test_paulisum_iteration():
     term_list = [sX(2), sZ(4)]
     pauli_sum = sum(term_list)
@@ -637,6 +678,29 @@ def test_simplify_warning():
     assert str(e[0].message).startswith('The term Z1Z0 will be combined with Z0Z1')
 
 
+def test_simplify_many_terms():
+    terms = [PauliTerm.from_list([("X", i % 7), ("Z", 7 + i % 3)], 0.5) for i in range(210)]
+    terms += [PauliTerm.from_list([("Z", 7 + i % 3), ("X", i % 7)], -0.5) for i in range(105)]
+    terms.append(sY(20))
+    with pytest.warns(UserWarning) as e:
+        tsum = simplify_pauli_sum(PauliSum(terms))
+
+    # Each of the 21 reordered terms is warned about once
+    assert len(e) == 21
+    assert len(tsum) == 22
+    assert tsum.terms[0] == 2.5 * sX(0) * sZ(7)
+    assert tsum.terms[0].get_qubits() == [0, 7]
+    assert tsum.terms[-1] is terms[-1]
+    assert simplify_pauli_sum(PauliSum([sX(0), 1e-9 * sZ(1), -1 * sX(0)])) == PauliSum([])
+
+
+def test_simplify_after_changing_ops():
+    term = sZ(0)
+    assert len(simplify_pauli_sum(PauliSum([sX(0), term]))) == 2
+    term._ops[0] = "X"
+    assert simplify_pauli_sum(PauliSum([sX(0), term])) == PauliSum([2 * sX(0)])
+
+
 def test_pauli_string():
     p = PauliTerm("X", 1) * PauliTerm("Z", 5)
     assert p.pauli_string([1, 5]) == "XZ"
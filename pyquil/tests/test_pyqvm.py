@@ -0,0 +1,308 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+
+import numpy as np
+import pytest
+
+from pyquil import Program, get_qc
+from pyquil.api import PyQVM, PyWavefunctionSimulator
+from pyquil.gate_matrices import QUANTUM_GATES as GATE_MATRICES, X as X_MATRIX
+from pyquil.gates import *
+from pyquil.gates import QUANTUM_GATES
+from pyquil.noise import _create_kraus_pragmas, _parse_pragma_matrix, pauli_kraus_map
+from pyquil.numpy_simulator import DensityMatrixSimulator, NumpyWavefunctionSimulator
+from pyquil.paulis import sX, sY, sZ
+from pyquil.parameters import Parameter, quil_cos, quil_sin
+from pyquil.quilatom import Qubit
+from pyquil.quilbase import Gate
+
+
+def _unitary(program, n_qubits):
+    """
+    Build the matrix of a program column by column, in Wavefunction ordering.
+    """
+    columns = []
+    for i in range(2 ** n_qubits):
+        prep = Program([X(q) for q in range(n_qubits) if (i >> q) & 1])
+        columns.append(PyWavefunctionSimulator().wavefunction(prep + program).amplitudes)
+    return np.array(columns).T
+
+
+def test_gate_matrices_cover_standard_gates():
+    assert set(GATE_MATRICES) == set(QUANTUM_GATES)
+
+
+@pytest.mark.parametrize('name', sorted(QUANTUM_GATES))
+def test_gate_matrices_are_unitary(name):
+    matrix = GATE_MATRICES[name]
+    if callable(matrix):
+        matrix = matrix(0.3)
+    np.testing.assert_allclose(matrix.dot(matrix.T.conj()), np.eye(len(matrix)), atol=1e-12)
+
+
+def test_qubit_ordering():
+    # The first argument of a gate is its most significant qubit
+    wf = PyWavefunctionSimulator().wavefunction(Program(X(0), CNOT(0, 1)))
+    np.testing.assert_allclose(wf.amplitudes, [0, 0, 0, 1])
+    wf = PyWavefunctionSimulator().wavefunction(Program(X(2), CNOT(2, 0)))
+    np.testing.assert_allclose(wf.amplitudes, [0, 0, 0, 0, 0, 1, 0, 0])
+
+    # CNOT 1 0 on qubits 0 and 1 is the CNOT matrix with the qubit order reversed
+    swap = GATE_MATRICES['SWAP']
+    np.testing.assert_allclose(_unitary(Program(CNOT(1, 0)), 2),
+                               GATE_MATRICES['CNOT'])
+    np.testing.assert_allclose(_unitary(Program(CNOT(0, 1)), 2),
+                               swap.dot(GATE_MATRICES['CNOT']).dot(swap))
+
+
+def test_defgate_matches_standard_gate():
+    program = Program().defgate("MY-ISWAP", GATE_MATRICES['ISWAP'])
+    program.inst(("MY-ISWAP", 2, 0))
+    np.testing.assert_allclose(_unitary(program, 3), _unitary(Program(ISWAP(2, 0)), 3))
+
+
+def test_parametric_defgate():
+    theta = Parameter('theta')
+    rx = np.array([[quil_cos(theta / 2), -1j * quil_sin(theta / 2)],
+                   [-1j * quil_sin(theta / 2), quil_cos(theta / 2)]])
+    program = Program().defgate("MY-RX", rx, [theta])
+    program.inst(Gate("MY-RX", [0.7], [Qubit(1)]))
+    np.testing.assert_allclose(_unitary(program, 2), _unitary(Program(RX(0.7, 1)), 2))
+
+
+def test_wavefunction():
+    bell = Program(H(0), CNOT(0, 1))
+    wf = PyWavefunctionSimulator().wavefunction(bell)
+    np.testing.assert_allclose(wf.amplitudes, np.array([1, 0, 0, 1]) / np.sqrt(2))
+    assert wf.pretty_print() == "(0.71+0j)|00> + (0.71+0j)|11>"
+
+    # Unused qubits below the largest one are included, as with the QVM
+    assert len(PyWavefunctionSimulator().wavefunction(Program(H(3))).amplitudes) == 16
+
+
+def test_expectation():
+    bell = Program(H(0), CNOT(0, 1))
+    wfnsim = PyWavefunctionSimulator()
+    expects = wfnsim.expectation(bell, [sZ(0) * sZ(1), sZ(0), sZ(1), sX(0) * sX(1),
+                                        sY(0) * sY(1), 0.5 * sZ(3)])
+    np.testing.assert_allclose(expects, [1, 0, 0, 1, -1, 0.5], atol=1e-12)
+    assert np.isclose(wfnsim.expectation(bell, sZ(0) * sZ(1) + 2 * sX(0) * sX(1)), 3)
+
+
+def test_run_and_measure():
+    bitstrings = PyWavefunctionSimulator(random_seed=52).run_and_measure(
+        Program(H(0), CNOT(0, 1), X(2)), trials=1000)
+    assert bitstrings.shape == (1000, 3)
+    assert np.all(bitstrings[:, 0] == bitstrings[:, 1])
+    assert np.all(bitstrings[:, 2] == 1)
+    assert 400 < np.sum(bitstrings[:, 0]) < 600
+
+    bitstrings = PyWavefunctionSimulator().run_and_measure(Program(X(0)), qubits=[4, 0],
+                                                           trials=3)
+    np.testing.assert_array_equal(bitstrings, [[0, 1]] * 3)
+
+
+def test_measure_collapses():
+    simulator = NumpyWavefunctionSimulator(2, rs=np.random.RandomState(1))
+    simulator.do_gate(H(0)).do_gate(CNOT(0, 1))
+    outcome = simulator.do_measurement(0)
+    expected = np.zeros(4)
+    expected[3 * outcome] = 1
+    np.testing.assert_allclose(simulator.amplitudes, expected)
+
+
+def test_pyqvm_run():
+    program = Program(H(0), CNOT(0, 1))
+    ro = program.declare('ro', 'BIT', 3)
+    program.inst(MEASURE(0, ro[0]), MEASURE(1, ro[1]), MEASURE(0, ro[2]))
+    program.wrap_in_numshots_loop(100)
+
+    qvm = PyQVM(random_seed=1)
+    bitstrings = qvm.load(program).run().wait().read_from_memory_region(region_name='ro')
+    assert bitstrings.shape == (100, 3)
+    assert np.all(bitstrings[:, 0] == bitstrings[:, 1])
+    assert np.all(bitstrings[:, 0] == bitstrings[:, 2])
+    assert 0 < np.sum(bitstrings[:, 0]) < 100
+
+    # Runs with the same seed give the same results
+    np.testing.assert_array_equal(
+        bitstrings, qvm.load(program).run().wait().read_from_memory_region(region_name='ro'))
+
+
+def test_pyqvm_uses_only_program_qubits():
+    program = Program(X(30))
+    ro = program.declare('ro', 'BIT', 1)
+    program.inst(MEASURE(30, ro[0]))
+    qvm = PyQVM(n_qubits=2)
+    np.testing.assert_array_equal(
+        qvm.load(program).run().wait().read_from_memory_region(region_name='ro'), [[1]])
+    assert qvm.wf_simulator.n_qubits == 1
+
+    with pytest.raises(ValueError):
+        PyQVM(n_qubits=2).load(Program(H(0), H(1), H(2))).run()
+
+
+@pytest.mark.parametrize('simulator_type', [NumpyWavefunctionSimulator, DensityMatrixSimulator])
+def test_pyqvm_no_qubits(simulator_type):
+    program = Program("DECLARE ro BIT").wrap_in_numshots_loop(5)
+    qvm = PyQVM(quantum_simulator_type=simulator_type)
+    np.testing.assert_array_equal(
+        qvm.load(program).run().wait().read_from_memory_region(region_name='ro'), [[0]] * 5)
+    assert simulator_type(0).sample_bitstrings(3).shape == (3, 0)
+
+
+def test_pyqvm_mid_circuit_measurement_and_reset():
+    program = Program()
+    ro = program.declare('ro', 'BIT', 3)
+    program.inst(H(0), MEASURE(0, ro[0]), CNOT(0, 1), MEASURE(1, ro[1]),
+                 RESET(0), MEASURE(0, ro[2]))
+    program.wrap_in_numshots_loop(50)
+    bitstrings = PyQVM(random_seed=3).load(program).run().wait() \
+        .read_from_memory_region(region_name='ro')
+    assert np.all(bitstrings[:, 0] == bitstrings[:, 1])
+    assert np.all(bitstrings[:, 2] == 0)
+    assert 0 < np.sum(bitstrings[:, 0]) < 50
+
+
+def test_pyqvm_reset_unused_qubit():
+    program = Program()
+    ro = program.declare('ro', 'BIT', 1)
+    program.inst(X(0), RESET(1), MEASURE(0, ro[0]))
+    qvm = PyQVM()
+    np.testing.assert_array_equal(
+        qvm.load(program).run().wait().read_from_memory_region(region_name='ro'), [[1]])
+    assert qvm.wf_simulator.n_qubits == 1
+
+    qvm.execute(Program(X(0), RESET(3)))
+    assert qvm.wf_simulator.n_qubits == 1
+
+
+def test_pyqvm_parametric_program():
+    program = Program()
+    theta = program.declare('theta', 'REAL')
+    ro = program.declare('ro', 'BIT', 1)
+    program.inst(RX(theta, 0), RZ(2 * theta + 0.1, 0), MEASURE(0, ro[0]))
+
+    qvm = PyQVM()
+    for value, expected in [(0.0, 0), (np.pi, 1)]:
+        bitstrings = qvm.load(program).write_memory(region_name='theta', value=value) \
+            .run().wait().read_from_memory_region(region_name='ro')
+        np.testing.assert_array_equal(bitstrings, [[expected]])
+
+
+def test_pyqvm_unsupported_instruction():
+    program = Program()
+    ro = program.declare('ro', 'BIT', 1)
+    program.inst(X(0), MOVE(ro[0], 1))
+    with pytest.raises(ValueError):
+        PyQVM().load(program).run()
+
+
+def test_get_qc_numpy_backend():
+    qc = get_qc('9q-generic-qvm', backend='numpy')
+    assert isinstance(qc.qam, PyQVM)
+
+    program = Program(X(0), CNOT(0, 4))
+    ro = program.declare('ro', 'BIT', 2)
+    program.inst(MEASURE(0, ro[0]), MEASURE(4, ro[1]))
+    program.wrap_in_numshots_loop(10)
+    np.testing.assert_array_equal(qc.run(program), [[1, 1]] * 10)
+
+    with pytest.raises(ValueError):
+        get_qc('9q-generic-qvm', backend='quest')
+    with pytest.raises(ValueError):
+        get_qc('Aspen-1', as_qvm=False, backend='numpy')
+
+
+def test_parse_pragma_matrix():
+    kraus_ops = [np.array([[0.5 + 0.25j, -1j], [1e-5, np.pi / 2]])]
+    pragma, = _create_kraus_pragmas('X', (0,), kraus_ops)
+    np.testing.assert_allclose(_parse_pragma_matrix(pragma.freeform_string), kraus_ops[0])
+
+
+def test_density_matrix_matches_wavefunction():
+    program = Program(H(0), CNOT(0, 1), RX(0.3, 2), CPHASE(0.4, 2, 0), ISWAP(1, 2))
+    wf = PyWavefunctionSimulator().wavefunction(program)
+    qvm = PyQVM(quantum_simulator_type=DensityMatrixSimulator).execute(program)
+    np.testing.assert_allclose(qvm.wf_simulator.density_matrix,
+                               np.outer(wf.amplitudes, wf.amplitudes.conj()), atol=1e-12)
+    np.testing.assert_allclose(qvm.wf_simulator.probabilities(), wf.probabilities(), atol=1e-12)
+    pauli_sum = sX(0) * sX(1) + 0.5 * sZ(2) + sY(1)
+    assert np.isclose(qvm.wf_simulator.expectation(pauli_sum),
+                      PyWavefunctionSimulator().expectation(program, pauli_sum))
+
+
+def test_density_matrix_measurement():
+    simulator = DensityMatrixSimulator(2, rs=np.random.RandomState(1))
+    simulator.do_gate(H(0)).do_gate(CNOT(0, 1))
+    outcome = simulator.do_measurement(1)
+    expected = np.zeros(4)
+    expected[3 * outcome] = 1
+    np.testing.assert_allclose(simulator.probabilities(), expected)
+    assert np.isclose(np.trace(simulator.density_matrix), 1)
+
+
+def test_add_kraus():
+    # A bit flip with probability 0.2 instead of the identity
+    program = Program(I(0))
+    program.define_noisy_gate("I", [0], pauli_kraus_map([0.8, 0.2, 0, 0]))
+    qvm = PyQVM(quantum_simulator_type=DensityMatrixSimulator).execute(program)
+    np.testing.assert_allclose(qvm.wf_simulator.probabilities(), [0.8, 0.2])
+
+    # NO-NOISE applies the ideal gate
+    program = Program().define_noisy_gate("I", [0], pauli_kraus_map([0.8, 0.2, 0, 0]))
+    program.no_noise().inst(I(0))
+    qvm = PyQVM(quantum_simulator_type=DensityMatrixSimulator).execute(program)
+    np.testing.assert_allclose(qvm.wf_simulator.probabilities(), [1, 0])
+
+    # Kraus operators put the first qubit in the least significant bit
+    program = Program(CZ(0, 1)).define_noisy_gate("CZ", [0, 1], [np.kron(X_MATRIX, np.eye(2))])
+    qvm = PyQVM(quantum_simulator_type=DensityMatrixSimulator).execute(program)
+    np.testing.assert_allclose(qvm.wf_simulator.probabilities(), [0, 0, 1, 0])
+
+    with pytest.raises(NotImplementedError):
+        PyQVM().execute(program)
+
+
+def test_readout_povm():
+    program = Program(X(1))
+    ro = program.declare('ro', 'BIT', 2)
+    program.define_noisy_readout(0, p00=0.9, p11=0.8)
+    program.define_noisy_readout(1, p00=0.9, p11=0.8)
+    program.inst(MEASURE(0, ro[0]), MEASURE(1, ro[1]))
+    program.wrap_in_numshots_loop(10000)
+    bitstrings = PyQVM(random_seed=5).load(program).run().wait() \
+        .read_from_memory_region(region_name='ro')
+    np.testing.assert_allclose(bitstrings.mean(axis=0), [0.1, 0.8], atol=0.02)
+
+    # The same, one shot at a time
+    program.inst(RESET(0))
+    bitstrings = PyQVM(random_seed=5).load(program).run().wait() \
+        .read_from_memory_region(region_name='ro')
+    np.testing.assert_allclose(bitstrings.mean(axis=0), [0.1, 0.8], atol=0.02)
+
+
+def test_noisy_get_qc_numpy_backend():
+    qc = get_qc('9q-generic-noisy-qvm', backend='numpy')
+    assert qc.qam.noise_model is not None
+    program = Program(X(0), X(1), CZ(0, 1))
+    ro = program.declare('ro', 'BIT', 2)
+    program.inst(MEASURE(0, ro[0]), MEASURE(1, ro[1]))
+    program.wrap_in_numshots_loop(1000)
+    bitstrings = qc.run(program)
+    assert bitstrings.shape == (1000, 2)
+    # Readout errors (p11 = 0.911) dominate the decoherence of a few gates
+    assert np.all((0.85 < bitstrings.mean(axis=0)) & (bitstrings.mean(axis=0) < 0.95))
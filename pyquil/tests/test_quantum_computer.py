@@ -1,16 +1,19 @@
 import itertools
+import time
 
 import networkx as nx
 import numpy as np
 import pytest
 
 from pyquil import Program, get_qc, list_quantum_computers
-from pyquil.api import QVM, QuantumComputer
+from pyquil.api import CachingCompiler, CompileCache, PyQVM, QVM, QuantumComputer
+from pyquil.api import _quantum_computer
 from pyquil.api._qac import AbstractCompiler
 from pyquil.api._quantum_computer import _get_flipped_protoquil_program, _parse_name
 from pyquil.device import NxDevice, gates_in_isa
 from pyquil.gates import *
 from pyquil.noise import decoherence_noise_with_asymmetric_ro
+from pyquil.quilatom import MemoryReference
 
 
 class DummyCompiler(AbstractCompiler):
@@ -125,6 +128,166 @@ def test_readout_symmetrization(forest):
     assert diff_s < 0.05
 
 
+class CountingCompiler(DummyCompiler):
+    def __init__(self):
+        self.n_calls = 0
+
+    def native_quil_to_executable(self, nq_program: Program):
+        self.n_calls += 1
+        return nq_program
+
+
+def _parametric_program():
+    program = Program()
+    theta = program.declare('theta', 'REAL', 2)
+    ro = program.declare('ro', 'BIT', 2)
+    program.inst(RX(theta[0], 0), RX(theta[1], 1), MEASURE(0, ro[0]), MEASURE(1, ro[1]))
+    return program.wrap_in_numshots_loop(10)
+
+
+def test_compile_parametric_caches():
+    compiler = CountingCompiler()
+    qc = QuantumComputer(name='testy!', qam=PyQVM(n_qubits=2),
+                         device=NxDevice(nx.complete_graph(2)), compiler=compiler)
+    executable = qc.compile_parametric(_parametric_program())
+    assert executable.parameters == [('theta', 0), ('theta', 1)]
+    assert executable.integer == [False, False]
+    assert qc.compile_parametric(_parametric_program()) is executable
+    assert compiler.n_calls == 1
+
+    single = qc.compile_parametric(_parametric_program(), parameters=[MemoryReference('theta', 1)])
+    assert single.parameters == [('theta', 1)]
+    assert compiler.n_calls == 2
+
+    with pytest.raises(ValueError):
+        qc.compile_parametric(_parametric_program(), parameters=['phi'])
+
+
+def test_compile_parametric_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(_quantum_computer, 'PARAMETRIC_CACHE_SIZE', 2)
+    compiler = CountingCompiler()
+    qc = QuantumComputer(name='testy!', qam=PyQVM(n_qubits=2),
+                         device=NxDevice(nx.complete_graph(2)), compiler=compiler)
+    programs = [_parametric_program().wrap_in_numshots_loop(i + 1) for i in range(3)]
+    for program in programs:
+        qc.compile_parametric(program)
+    assert qc._parametric_executables.cache_info().currsize == 2
+    qc.compile_parametric(programs[2])
+    assert compiler.n_calls == 3
+    qc.compile_parametric(programs[0])
+    assert compiler.n_calls == 4
+
+
+def test_run_parametric():
+    compiler = CountingCompiler()
+    qc = QuantumComputer(name='testy!', qam=PyQVM(n_qubits=2),
+                         device=NxDevice(nx.complete_graph(2)), compiler=compiler)
+    values = np.array([[0.0, 0.0], [np.pi, 0.0], [0.0, np.pi], [np.pi, np.pi]])
+    bitstrings = qc.run_parametric(_parametric_program(), values)
+    assert bitstrings.shape == (4, 10, 2)
+    np.testing.assert_array_equal(bitstrings[:, 0, :], [[0, 0], [1, 0], [0, 1], [1, 1]])
+    assert compiler.n_calls == 1
+
+    with pytest.raises(ValueError):
+        qc.run_parametric(_parametric_program(), values[:, :1])
+
+
+class SerialCompiler(CountingCompiler):
+    """
+    A compiler which, like the rpcq clients, must not be called from several threads at once.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.max_active = 0
+
+    def quil_to_native_quil(self, program: Program):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        time.sleep(0.001)
+        self.active -= 1
+        return program
+
+
+def test_run_batch():
+    compiler = SerialCompiler()
+    qc = QuantumComputer(name='testy!', qam=PyQVM(n_qubits=2),
+                         device=NxDevice(nx.complete_graph(2)), compiler=compiler)
+    programs = []
+    for i in range(10):
+        program = Program(X(0) if i % 2 else I(0), MEASURE(0, 0))
+        programs.append(program.wrap_in_numshots_loop(i + 1))
+    results = qc.run_batch(programs, lookahead=3)
+    assert compiler.n_calls == 10
+    assert compiler.max_active == 1
+    for i, bitstrings in enumerate(results):
+        np.testing.assert_array_equal(bitstrings, [[i % 2]] * (i + 1))
+
+    with pytest.raises(ValueError):
+        qc.run_batch(programs, lookahead=0)
+
+
+def test_caching_compiler():
+    compiler = CachingCompiler(CountingCompiler())
+    qc = QuantumComputer(name='testy!', qam=PyQVM(n_qubits=2),
+                         device=NxDevice(nx.complete_graph(2)), compiler=compiler)
+    first = qc.compile(_parametric_program())
+    second = qc.compile(_parametric_program())
+    assert first == second and first is not second
+    assert compiler.compiler.n_calls == 1
+    assert compiler.cache.cache_info().hits == 2
+    assert compiler.cache.hit_rate == 0.5
+
+    # The number of shots is part of the key
+    qc.compile(_parametric_program().wrap_in_numshots_loop(20))
+    assert compiler.compiler.n_calls == 2
+
+    compiler.invalidate(_parametric_program())
+    qc.compile(_parametric_program())
+    assert compiler.compiler.n_calls == 3
+
+
+def test_compile_cache_on_disk(tmpdir):
+    program = Program(X(0), MEASURE(0, 0))
+    compiler = CachingCompiler(CountingCompiler(), cache=CompileCache(cache_dir=str(tmpdir)))
+    compiler.native_quil_to_executable(program)
+    assert len(tmpdir.listdir()) == 1
+
+    other = CachingCompiler(CountingCompiler(), cache=CompileCache(cache_dir=str(tmpdir)))
+    assert other.native_quil_to_executable(program) == program
+    assert other.compiler.n_calls == 0
+    assert other.cache.cache_info().disk_hits == 1
+
+    other.cache.clear()
+    assert len(tmpdir.listdir()) == 0
+
+
+def test_compile_cache_maxsize(tmpdir):
+    cache = CompileCache(maxsize=2, cache_dir=str(tmpdir))
+    for key in 'abc':
+        cache.put(key, Program(X(0)))
+    assert len(cache) == 2
+    cache.maxsize = 1
+    assert cache.cache_info().currsize == 1
+
+    cache.clear()
+    cache.maxsize = 0
+    cache.put('a', Program(X(0)))
+    assert len(cache) == 0
+    assert len(tmpdir.listdir()) == 0
+    cache.maxsize = 1
+    cache.put('a', Program(X(0)))
+    cache.maxsize = 0
+    assert cache.get('a') is None
+    assert cache.cache_info().misses == 1
+
+    with pytest.raises(ValueError):
+        cache.maxsize = -1
+    with pytest.raises(ValueError):
+        CompileCache(maxsize=1.5)
+
+
 def test_list_qc():
     qc_names = list_quantum_computers()
     # TODO: update with deployed qpus
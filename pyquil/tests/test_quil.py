@@ -14,6 +14,7 @@
 #    See the License for the specific language governing permissions and
 #    limitations under the License.
 ##############################################################################
+import pickle
 import re
 from math import pi
 
@@ -27,9 +28,9 @@ from pyquil.gates import I, X, Y, Z, H, T, S, RX, RY, RZ, CNOT, CCNOT, PHASE, CP
 from pyquil.parameters import Parameter, quil_sin, quil_cos
 from pyquil.paulis import exponential_map, sZ
 from pyquil.quil import Program, merge_programs, merge_with_pauli_noise, address_qubits, \
-    get_classical_addresses_from_program, Pragma
-from pyquil.quilatom import QubitPlaceholder, Addr, MemoryReference
-from pyquil.quilbase import DefGate, Gate, Qubit, JumpWhen, Declare
+    get_classical_addresses_from_program, Pragma, percolate_declares
+from pyquil.quilatom import QubitPlaceholder, Addr, MemoryReference, Label
+from pyquil.quilbase import DefGate, Gate, Qubit, JumpWhen, Declare, Measurement
 from pyquil.tests.utils import parse_equals
 
 
@@ -648,6 +649,36 @@ test 0
 """
 
 
+def test_merge_many_programs():
+    programs = [Program(RX(0.1 * i, i % 3), CNOT(i % 3, (i + 1) % 3)) for i in range(200)]
+    programs.append(Program().measure_all())
+    expected = Program()
+    for prog in programs:
+        expected += prog
+    assert merge_programs(programs).out() == expected.out()
+    assert merge_programs([H(0), [X(1), Y(2)]]).out() == "H 0\nX 1\nY 2\n"
+
+
+def test_percolate_declares():
+    p = Program(H(0))
+    p.defgate("test", np.eye(2))
+    ro = p.declare('ro', 'BIT', 1)
+    p.inst(MEASURE(0, ro), X(0))
+    theta = p.declare('theta', 'REAL')
+    p.inst(RX(theta, 0))
+    assert percolate_declares(p).out() == """DEFGATE test:
+    1.0, 0
+    0, 1.0
+
+DECLARE ro BIT[1]
+DECLARE theta REAL[1]
+H 0
+MEASURE 0 ro
+X 0
+RX(theta) 0
+"""
+
+
 def test_merge_with_pauli_noise():
     p = Program(X(0)).inst(Z(0))
     probs = [0., 1., 0., 0.]
@@ -1000,3 +1031,195 @@ def test_measure_all_noncontig():
         'MEASURE 10 ro[10]',
         '',
     ])
+
+
+def test_incremental_synthesis():
+    p = Program(H(0))
+
+    def check():
+        # A copy synthesizes its instructions from scratch
+        assert p.instructions == p.copy().instructions
+        assert p.out() == p.copy().out()
+
+    check()
+    p.inst(MEASURE(0, 3))
+    check()
+    assert p[0] == Declare('ro', 'BIT', 4)
+    p.inst(MEASURE(1, 5))
+    check()
+    assert p[0] == Declare('ro', 'BIT', 6)
+    p.pop()
+    check()
+    assert p[0] == Declare('ro', 'BIT', 4)
+    p.if_then(("ro", 3), Program(X(0)), Program(Y(0)))
+    p.while_do(3, Program(Z(0)))
+    check()
+    p.pop()
+    check()
+    p.inst(MEASURE(0, MemoryReference("other", 0)))
+    check()
+    assert p[0] == H(0)
+    p.pop()
+    check()
+    p.inst(Declare('ro', 'BIT', 8))
+    check()
+    assert p[0] == H(0)
+    while len(p) > 0:
+        p.pop()
+        check()
+
+
+def test_incremental_synthesis_is_incremental(monkeypatch):
+    p = Program(H(0))
+    assert len(p.instructions) == 1
+
+    def fail():
+        raise AssertionError("Program was synthesized from scratch")
+
+    monkeypatch.setattr(p, '_synthesize', fail)
+    for i in range(100):
+        p.inst(RX(0.1, i), MEASURE(i, MemoryReference("ro", i)))
+        assert p[-1] == MEASURE(i, MemoryReference("ro", i))
+    while len(p) > 1:
+        assert isinstance(p.instructions[-1], (Gate, Measurement))
+        p.pop()
+    assert p.instructions == [H(0)]
+
+
+def test_iteration_while_appending():
+    p = Program(H(0), H(1))
+    for instr in p:
+        p.inst(instr)
+    assert len(p) == 4
+    for instr in p.instructions:
+        p.inst(instr)
+    assert len(p) == 8
+
+
+def test_held_instructions_are_unchanged():
+    p = Program(H(0))
+    held = p.instructions
+    p.inst(X(0))
+    assert held == [H(0)]
+    assert p.instructions == [H(0), X(0)]
+    held = p.instructions
+    p.pop()
+    assert held == [H(0), X(0)]
+    p.inst(MEASURE(0, 2))
+    held = p.instructions
+    p.inst(MEASURE(0, 4))
+    assert held == [Declare('ro', 'BIT', 3), H(0), MEASURE(0, 2)]
+    assert p.instructions[0] == Declare('ro', 'BIT', 5)
+
+
+def test_reading_instructions_does_not_copy_them():
+    p = Program(H(0))
+    cached = p._synthesized()
+    for i in range(10):
+        p.inst(X(i))
+        assert len(p.instructions) == i + 2
+        assert p.instructions[-1] == X(i)
+    # Appending after a read extends the cached list rather than copying it
+    assert p._synthesized() is cached
+    held = p.instructions
+    assert held[1:3] == [X(0), X(1)]
+    assert list(reversed(held))[0] == X(9)
+    assert Program(held) == p
+
+
+def test_out_is_cached():
+    p = Program(H(0), RX(pi / 2, 1))
+    assert p.out() is p.out()
+    assert p.copy().out() is p.out()
+
+    p.inst(CNOT(0, 1))
+    assert p.out() == "H 0\nRX(pi/2) 1\nCNOT 0 1\n"
+    p.defgate("FOO", np.eye(2))
+    assert p.out().startswith("DEFGATE FOO:\n")
+    p.declare("ro", "BIT", 2)
+    assert p.out().endswith("DECLARE ro BIT[2]\n")
+    p.pop()
+    assert p.out().endswith("CNOT 0 1\n")
+    p.inst(Program(X(0)))
+    assert p.out().endswith("X 0\n")
+    p.measure(0, ("ro", 1))
+    assert p.out().endswith("X 0\nMEASURE 0 ro[1]\n")
+    assert p.out() == p.copy().out()
+
+
+def test_gate_out_is_cached():
+    gate = RX(pi / 2, 0)
+    assert gate.out() is gate.out()
+    gate.params = [pi]
+    assert gate.out() == "RX(pi) 0"
+    gate.qubits = [Qubit(1)]
+    assert gate.out() == "RX(pi) 1"
+    gate.name = "RY"
+    assert gate.out() == "RY(pi) 1"
+    assert gate == RY(pi, 1)
+
+
+def test_fingerprint():
+    p = Program(H(0), RX(pi / 2, 1))
+    assert p.fingerprint() == Program("H 0\nRX(pi/2) 1").fingerprint()
+    assert p.fingerprint() != Program(RX(pi / 2, 1), H(0)).fingerprint()
+    assert p.fingerprint() != Program(H(0)).fingerprint()
+
+    # Built incrementally, but agrees with fingerprinting from scratch
+    for instr in [CNOT(0, 1), MEASURE(0, ("ro", 2)), Declare("theta", "REAL"), X(1)]:
+        p.inst(instr)
+        assert p.fingerprint() == Program(p.out()).fingerprint()
+    while len(p) > 0:
+        p.pop()
+        assert p.fingerprint() == p.copy().fingerprint()
+    assert p.fingerprint() == Program().fingerprint()
+
+    p.if_then(("ro", 0), Program(X(0)))
+    p.defgate("FOO", np.eye(2))
+    assert p.fingerprint() == Program(p.out()).fingerprint()
+
+    # An implicit declaration of ro is equivalent to an explicit one
+    implicit = Program(MEASURE(0, ("ro", 1)))
+    explicit = Program(Declare("ro", "BIT", 2), MEASURE(0, ("ro", 1)))
+    assert implicit.fingerprint() == explicit.fingerprint()
+    assert implicit == explicit
+
+
+def test_fingerprint_is_stable():
+    # Fingerprints are used as persistent cache keys, so they must not change between processes
+    p = Program(Declare("ro", "BIT", 1), H(0), CNOT(0, 1), MEASURE(1, ("ro", 0)))
+    assert p.fingerprint() == "14260a598d02fb06529e384c4b522f7d"
+
+
+def test_fingerprint_with_slots():
+    from pyquil.parametric import ParametricProgram
+    pp = ParametricProgram(lambda theta: Program(H(0), RX(theta, 0)))
+    assert pp(1.0).fingerprint() == Program(H(0), RX(1.0, 0)).fingerprint()
+    assert pp(2.0).fingerprint() == Program(H(0), RX(2.0, 0)).fingerprint()
+    assert pp(2.0) != Program(H(0), RX(1.0, 0))
+
+
+def test_qubits_are_interned():
+    assert Qubit(3) is Qubit(3)
+    assert X(3).qubits[0] is CNOT(2, 3).qubits[1]
+    big = Qubit(10 ** 6)
+    assert big == Qubit(10 ** 6)
+    assert big.out() == "1000000"
+    with pytest.raises(TypeError):
+        Qubit(-1)
+    with pytest.raises(TypeError):
+        Qubit("0")
+    assert pickle.loads(pickle.dumps(Qubit(3))) is Qubit(3)
+    assert pickle.loads(pickle.dumps(big)) == big
+
+
+def test_instructions_have_slots():
+    p = Program(Declare("ro", "BIT", 1), Pragma("PRESERVE_BLOCK"), RX(MemoryReference("theta"), 0),
+                MEASURE(0, ("ro", 0)), JumpWhen(Label("end"), MemoryReference("ro")))
+    for instr in p.instructions:
+        assert not hasattr(instr, '__dict__')
+        with pytest.raises(AttributeError):
+            instr.foo = 1
+    for atom in [Qubit(0), MemoryReference("ro"), Label("end")]:
+        assert not hasattr(atom, '__dict__')
+    assert pickle.loads(pickle.dumps(p)) == p
@@ -30,3 +30,27 @@ def test_roundtrip_pyquilexecutableresponse():
     p2 = _extract_program_from_pyquil_executable_response(pqer)
     for i1, i2 in zip(p, p2):
         assert i1 == i2
+
+
+class RecordingConnection(ForestConnection):
+    def __init__(self):
+        super().__init__()
+        self.requests = []
+
+    def _qvm_run(self, quil_program, classical_addresses, trials, measurement_noise, gate_noise,
+                 random_seed):
+        self.requests.append((quil_program.out(), trials))
+        return {'ro': np.zeros((trials, 1), dtype=int)}
+
+
+def test_load_changed_program():
+    connection = RecordingConnection()
+    qvm = QVM(connection=connection)
+    p = Program(X(0), MEASURE(0, 0))
+    qvm.load(p).run().wait()
+    qvm.load(p).run().wait()
+    p += Program(H(0))
+    p.wrap_in_numshots_loop(7)
+    qvm.load(p).run().wait()
+    assert connection.requests[0] == connection.requests[1]
+    assert connection.requests[2] == (p.out(), 7)
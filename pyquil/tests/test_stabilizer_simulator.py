@@ -0,0 +1,123 @@
+##############################################################################
+# Copyright 2018 Rigetti Computing
+#
+#    Licensed under the Apache License, Version 2.0 (the "License");
+#    you may not use this file except in compliance with the License.
+#    You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS,
+#    WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#    See the License for the specific language governing permissions and
+#    limitations under the License.
+##############################################################################
+
+import itertools
+
+import numpy as np
+import pytest
+
+from pyquil import Program
+from pyquil.api import PyQVM, PyWavefunctionSimulator
+from pyquil.gates import *
+from pyquil.paulis import PauliTerm, sX, sY, sZ
+from pyquil.stabilizer_simulator import StabilizerSimulator
+
+
+def _random_clifford_program(n_qubits, depth, rs):
+    one_qubit = [I, X, Y, Z, H, S]
+    two_qubit = [CNOT, CZ, SWAP]
+    rotations = [RX, RY, RZ, PHASE]
+    program = Program()
+    for _ in range(depth):
+        a, b = [int(q) for q in rs.choice(n_qubits, 2, replace=False)]
+        kind = rs.randint(3)
+        if kind == 0:
+            program += one_qubit[rs.randint(len(one_qubit))](a)
+        elif kind == 1:
+            program += two_qubit[rs.randint(len(two_qubit))](a, b)
+        else:
+            program += rotations[rs.randint(len(rotations))](rs.randint(-4, 5) * np.pi / 2, a)
+    return program
+
+
+def test_stabilizers():
+    simulator = StabilizerSimulator(2).do_gate(H(0)).do_gate(CNOT(0, 1))
+    assert simulator.stabilizers == [sX(0) * sX(1), sZ(0) * sZ(1)]
+    simulator.do_gate(Y(0))
+    assert simulator.stabilizers == [-1 * sX(0) * sX(1), -1 * sZ(0) * sZ(1)]
+
+
+def test_expectation_matches_wavefunction():
+    rs = np.random.RandomState(1)
+    n_qubits = 3
+    paulis = [PauliTerm.from_list(list(zip(ops, range(n_qubits))))
+              for ops in itertools.product('IXYZ', repeat=n_qubits)]
+    for _ in range(20):
+        program = _random_clifford_program(n_qubits, 20, rs) + I(n_qubits - 1)
+        simulator = PyQVM(quantum_simulator_type=StabilizerSimulator).execute(program) \
+            .wf_simulator
+        np.testing.assert_allclose([simulator.expectation(p) for p in paulis],
+                                   PyWavefunctionSimulator().expectation(program, paulis),
+                                   atol=1e-12)
+
+
+def test_sampling_matches_wavefunction():
+    rs = np.random.RandomState(2)
+    n_qubits = 3
+    for _ in range(10):
+        program = _random_clifford_program(n_qubits, 20, rs) + I(n_qubits - 1)
+        probabilities = PyWavefunctionSimulator().wavefunction(program).probabilities()
+        simulator = PyQVM(quantum_simulator_type=StabilizerSimulator, random_seed=3) \
+            .execute(program).wf_simulator
+        samples = simulator.sample_bitstrings(5000)
+        counts = np.bincount(samples.dot(2 ** np.arange(n_qubits)), minlength=2 ** n_qubits)
+        np.testing.assert_allclose(counts / 5000, probabilities, atol=0.03)
+
+
+def test_measurement_collapses():
+    simulator = StabilizerSimulator(3, rs=np.random.RandomState(4))
+    simulator.do_gate(H(0)).do_gate(CNOT(0, 1)).do_gate(CNOT(1, 2))
+    outcome = simulator.do_measurement(1)
+    assert simulator.do_measurement(0) == outcome
+    assert simulator.do_measurement(2) == outcome
+    assert simulator.expectation(sZ(0)) == (-1) ** outcome
+
+
+def test_pyqvm_run():
+    n_qubits = 1000
+    program = Program(H(0))
+    program += [CNOT(q, q + 1) for q in range(n_qubits - 1)]
+    ro = program.declare('ro', 'BIT', n_qubits)
+    program += [MEASURE(q, ro[q]) for q in range(n_qubits)]
+    program.wrap_in_numshots_loop(100)
+
+    qvm = PyQVM(quantum_simulator_type=StabilizerSimulator, random_seed=5)
+    bitstrings = qvm.load(program).run().wait().read_from_memory_region(region_name='ro')
+    assert bitstrings.shape == (100, n_qubits)
+    assert np.all(bitstrings == bitstrings[:, :1])
+    assert 0 < np.sum(bitstrings[:, 0]) < 100
+
+
+def test_pyqvm_mid_circuit_measurement():
+    program = Program()
+    ro = program.declare('ro', 'BIT', 3)
+    program.inst(H(0), MEASURE(0, ro[0]), CNOT(0, 1), MEASURE(1, ro[1]),
+                 RESET(0), MEASURE(0, ro[2]))
+    program.wrap_in_numshots_loop(50)
+    bitstrings = PyQVM(quantum_simulator_type=StabilizerSimulator, random_seed=6) \
+        .load(program).run().wait().read_from_memory_region(region_name='ro')
+    assert np.all(bitstrings[:, 0] == bitstrings[:, 1])
+    assert np.all(bitstrings[:, 2] == 0)
+    assert 0 < np.sum(bitstrings[:, 0]) < 50
+
+
+def test_non_clifford_gates():
+    with pytest.raises(ValueError):
+        StabilizerSimulator(1).do_gate(T(0))
+    with pytest.raises(ValueError):
+        StabilizerSimulator(1).do_gate(RX(0.3, 0))
+    with pytest.raises(ValueError):
+        PyQVM(quantum_simulator_type=StabilizerSimulator).execute(Program(CCNOT(0, 1, 2)))
@@ -1,7 +1,9 @@
 import pytest
 import numpy as np
 import itertools
+import struct
 
+from pyquil.paulis import PauliTerm, PauliSum, sI, sX, sY, sZ
 from pyquil.wavefunction import get_bitstring_from_index, Wavefunction, _round_to_next_multiple, _octet_bits
 
 
@@ -77,3 +79,64 @@ def test_sample(wvf):
     bitstrings = wvf.sample_bitstrings(n_samples=100)
     assert bitstrings.shape == (100, 2)
     assert [0, 0] in bitstrings
+
+
+def test_from_bit_packed_string(wvf):
+    packed = b''.join(struct.pack('>dd', amp.real, amp.imag) for amp in wvf.amplitudes)
+    unpacked = Wavefunction.from_bit_packed_string(packed)
+    np.testing.assert_array_equal(unpacked.amplitudes, wvf.amplitudes)
+    assert unpacked.amplitudes.dtype == np.cfloat
+    unpacked.amplitudes[0] = 1.0
+
+    view = Wavefunction.from_bit_packed_string(packed, byteswap=False)
+    np.testing.assert_array_equal(view.amplitudes, wvf.amplitudes)
+    assert view.amplitudes.dtype.byteorder == '>'
+    assert view.pretty_print() == wvf.pretty_print()
+
+    with pytest.raises(ValueError):
+        Wavefunction.from_bit_packed_string(packed[:-1])
+
+
+def test_expectation(wvf):
+    # amplitudes are ordered |q1 q0>
+    a = wvf.amplitudes
+    assert np.isclose(wvf.expectation(sZ(0)), abs(a[0]) ** 2 - abs(a[1]) ** 2 + abs(a[2]) ** 2 -
+                      abs(a[3]) ** 2)
+    assert np.isclose(wvf.expectation(sX(0)), 2 * (a[0].conjugate() * a[1] +
+                                                   a[2].conjugate() * a[3]).real)
+    assert np.isclose(wvf.expectation(sY(0)), 2 * (a[0].conjugate() * a[1] * -1j +
+                                                   a[2].conjugate() * a[3] * -1j).real)
+    assert np.isclose(wvf.expectation(2 * sI(0) - sZ(0) * sZ(1)),
+                      2 - np.dot(np.abs(a) ** 2, [1, -1, -1, 1]))
+
+    values = wvf.expectation([sZ(0), 0.5 * sX(1), sX(0) * sY(1)])
+    assert values.shape == (3,)
+    assert np.isclose(values[0], wvf.expectation(sZ(0)))
+    with pytest.raises(ValueError):
+        wvf.expectation(sZ(2))
+    assert wvf.expectation([]).shape == (0,)
+    assert wvf.expectation(PauliSum([])) == 0.0
+
+
+def test_expectation_many_terms():
+    rs = np.random.RandomState(42)
+    n_qubits = 6
+    amplitudes = rs.normal(size=2 ** n_qubits) + 1j * rs.normal(size=2 ** n_qubits)
+    wf = Wavefunction(amplitudes / np.linalg.norm(amplitudes))
+    terms = [PauliTerm.from_list(list(zip(rs.choice(["I", "X", "Y", "Z"], size=n_qubits),
+                                          range(n_qubits))), rs.normal())
+             for _ in range(200)]
+
+    # Apply each term to the state qubit by qubit
+    matrices = {"I": np.eye(2), "X": np.array([[0, 1], [1, 0]]),
+                "Y": np.array([[0, -1j], [1j, 0]]), "Z": np.diag([1, -1])}
+    expected = []
+    for term in terms:
+        state = wf.amplitudes.reshape((2,) * n_qubits)
+        for qubit, op in term:
+            state = np.moveaxis(np.tensordot(matrices[op], state, axes=(1, n_qubits - 1 - qubit)),
+                                0, n_qubits - 1 - qubit)
+        expected.append((term.coefficient * np.vdot(wf.amplitudes, state.reshape(-1))).real)
+
+    np.testing.assert_allclose(wf.expectation(terms), expected, atol=1e-12)
+    assert np.isclose(wf.expectation(PauliSum(terms)), np.sum(expected))
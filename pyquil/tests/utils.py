@@ -1,7 +1,8 @@
-from pyquil.parser import parse
+from pyquil.parser import parse, PARSER_BACKENDS
 
 
 def parse_equals(quil_string, *instructions):
     expected = list(instructions)
-    actual = parse(quil_string)
-    assert expected == actual
+    for backend in PARSER_BACKENDS:
+        actual = parse(quil_string, backend=backend)
+        assert expected == actual
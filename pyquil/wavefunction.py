@@ -16,7 +16,6 @@
 """
 Module containing the Wavefunction object and methods for working with wavefunctions.
 """
-import struct
 import warnings
 import itertools
 
@@ -25,6 +24,8 @@ from six import integer_types
 
 OCTETS_PER_DOUBLE_FLOAT = 8
 OCTETS_PER_COMPLEX_DOUBLE = 2 * OCTETS_PER_DOUBLE_FLOAT
+# The QVM sends amplitudes as pairs of big-endian doubles
+BIG_ENDIAN_COMPLEX_DOUBLE = np.dtype('>c16')
 
 
 class Wavefunction(object):
@@ -73,23 +74,22 @@ class Wavefunction(object):
         return Wavefunction(amplitude_vector)
 
     @staticmethod
-    def from_bit_packed_string(coef_string):
+    def from_bit_packed_string(coef_string, byteswap=True):
         """
         From a bit packed string, unpacks to get the wavefunction
-        :param bytes coef_string:
-        :return:
-        """
-        num_octets = len(coef_string)
-
-        # Parse the wavefunction
-        wf = np.zeros(num_octets // OCTETS_PER_COMPLEX_DOUBLE, dtype=np.cfloat)
-        for i, p in enumerate(range(0, num_octets, OCTETS_PER_COMPLEX_DOUBLE)):
-            re_be = coef_string[p: p + OCTETS_PER_DOUBLE_FLOAT]
-            im_be = coef_string[p + OCTETS_PER_DOUBLE_FLOAT: p + OCTETS_PER_COMPLEX_DOUBLE]
-            re = struct.unpack('>d', re_be)[0]
-            im = struct.unpack('>d', im_be)[0]
-            wf[i] = complex(re, im)
 
+        :param bytes coef_string: The amplitudes as big-endian pairs of doubles, as sent by the QVM.
+        :param bool byteswap: Whether to convert the amplitudes to native byte order. If False, the
+            amplitudes are a big-endian view on ``coef_string`` which avoids copying them, but is
+            read-only if ``coef_string`` is and is slower to compute with on little-endian machines.
+        :return: A Wavefunction
+        """
+        if len(coef_string) % OCTETS_PER_COMPLEX_DOUBLE != 0:
+            raise ValueError("The length of the bit packed string must be a multiple of {}"
+                             .format(OCTETS_PER_COMPLEX_DOUBLE))
+        wf = np.frombuffer(coef_string, dtype=BIG_ENDIAN_COMPLEX_DOUBLE)
+        if byteswap:
+            wf = wf.astype(np.cfloat)
         return Wavefunction(wf)
 
     def __len__(self):
@@ -189,6 +189,31 @@ class Wavefunction(object):
         plt.xticks(range(len(prob_dict)), prob_dict.keys())
         plt.show()
 
+    def expectation(self, pauli_terms):
+        """
+        Compute the expectation value of Pauli operators in this state, locally.
+
+        If ``pauli_terms`` is a ``PauliSum`` or ``PauliTerm`` then the returned value is a single
+        ``float``, otherwise the returned value is an array of values, one for each ``PauliTerm``
+        in the list, as for :py:meth:`~pyquil.api.WavefunctionSimulator.expectation`. Only the
+        real parts of the expectation values are returned.
+
+        The terms are evaluated in batches of terms which flip the same qubits, so that the cost is
+        about one pass over the amplitudes for each batch. See
+        :py:meth:`~pyquil.packed_paulis.PackedPauliSum.expectations`.
+
+        :param pauli_terms: A PauliSum, PauliTerm or list of PauliTerms on qubits which are less
+            than the number of qubits of this wavefunction.
+        :return: Either a float or array floats depending on ``pauli_terms``.
+        """
+        from pyquil.packed_paulis import PackedPauliSum
+        from pyquil.paulis import PauliSum, PauliTerm
+
+        values = PackedPauliSum.from_pauli_sum(pauli_terms).expectations(self.amplitudes)
+        if isinstance(pauli_terms, (PauliSum, PauliTerm)):
+            return float(np.sum(values).real)
+        return values.real
+
     def sample_bitstrings(self, n_samples):
         """
         Sample bitstrings from the distribution defined by the wavefunction.